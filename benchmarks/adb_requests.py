@@ -0,0 +1,75 @@
+"""Compares cost of device requests sent by AdbClient with cost of starting a process per request
+
+Requests are served by a stand-in adb server. Shell commands and file transfers over pooled
+connections are timed against transfers opening a new connection each time, and against starting
+a trivial process, which is the least a request made by running adb program costs.
+
+Usage example (from the repository root):
+    python -m benchmarks.adb_requests --requests 200
+"""
+
+import argparse
+import os
+import subprocess
+import time
+
+from benchmarks.fake_adb_server import FakeAdbServer
+from src.device.adb_client import AdbClient
+
+
+def time_requests(request, count):
+    """Measures mean time of a request
+
+    :param request: function making one request
+    :param count: number of requests
+    :return: mean time in milliseconds
+    :rtype: Float
+    """
+    start = time.perf_counter()
+    for _ in range(count):
+        request()
+    return (time.perf_counter() - start) * 1000 / count
+
+
+def pull_unpooled(port, device, path):
+    """Transfers file by a client of its own, so connection isn't reused
+
+    :param port: port of adb server
+    :param device: device's serial number
+    :param path: path to file on device
+    :return: None
+    """
+    client = AdbClient(port=port)
+    client.read_file(device, path)
+    client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200, help='number of requests of each kind')
+    parser.add_argument('--file-size', type=int, default=64 * 1024, help='size of transferred file in bytes')
+    args = parser.parse_args()
+
+    path = '/data/local/testing/pid_list.csv'
+    server = FakeAdbServer(files={path: os.urandom(args.file_size)})
+    server.start()
+    device = server.devices[0]
+    client = AdbClient(port=server.port)
+    try:
+        results = [
+            ('process start', time_requests(lambda: subprocess.run(['true'], check=True), args.requests)),
+            ('shell', time_requests(lambda: client.shell(device, 'true'), args.requests)),
+            ('pull, pooled', time_requests(lambda: client.read_file(device, path), args.requests)),
+            ('pull, new connection', time_requests(lambda: pull_unpooled(server.port, device, path), args.requests)),
+        ]
+    finally:
+        client.close()
+        server.stop()
+
+    print(f'{"request":>22} {"time, ms":>9}')
+    for name, mean_time in results:
+        print(f'{name:>22} {mean_time:>9.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+"""Contains FakeAdbServer class - stand-in for adb server speaking its host protocol
+
+Server answers host:devices and host:track-devices, switches connections to its devices with
+host:transport:<serial>, runs shell: and exec: commands and serves files by sync RECV, so AdbClient and everything built on it
+can be run without a device. Pagemap tool commands are answered with synthetic page records,
+scanning of every process takes given time, other commands are answered with given outputs,
+connections are served in parallel threads.
+
+Usage example:
+    server = FakeAdbServer(files={'/data/local/testing/pid_list.csv': b'1,init\n'}, commands={'echo 1': b'1\n'},
+                           scan_time=0.05)
+    server.start()
+    os.environ['ANDROID_ADB_SERVER_PORT'] = str(server.port)
+    server.set_devices(['emulator-5554', 'emulator-5556'])  # reported to tracking clients
+    server.stop()
+"""
+
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+import numpy as np
+
+from src.device.page_snapshot import DELTA_RECORD_DTYPE, FRAME_HEADER_DTYPE, PAGE_RECORD_DTYPE, PRESENT_SHIFT
+
+SYNC_HEADER = struct.Struct('<4sI')
+SYNC_DATA_MAX = 64 * 1024
+
+
+class FakeAdbHandler(socketserver.BaseRequestHandler):
+    """Serves one connection of adb client"""
+    def setup(self):
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def handle(self):
+        device = None
+        while True:
+            request = self.read_request()
+            if request is None:
+                return
+            if request == 'host:devices':
+                self.request.sendall(b'OKAY' + self.encode_devices(self.server.devices))
+                return
+            if request == 'host:track-devices':
+                self.request.sendall(b'OKAY')
+                self.track_devices()
+                return
+            if request.startswith('host:transport:'):
+                device = request[len('host:transport:'):]
+                if device not in self.server.devices:
+                    self.fail(f"device '{device}' not found")
+                    return
+                self.request.sendall(b'OKAY')
+            elif device is None:
+                self.fail('no device selected')
+                return
+            elif request.startswith(('shell:', 'exec:')):
+                self.request.sendall(b'OKAY')
+                self.request.sendall(self.server.run(request.split(':', 1)[1]))
+                return
+            elif request == 'sync:':
+                self.request.sendall(b'OKAY')
+                self.serve_sync()
+                return
+            else:
+                self.fail(f'unknown request {request}')
+                return
+
+    def read_exactly(self, size):
+        data = b''
+        while len(data) < size:
+            chunk = self.request.recv(size - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+    def read_request(self):
+        length = self.read_exactly(4)
+        return None if length is None else self.read_exactly(int(length, 16)).decode('UTF-8')
+
+    @staticmethod
+    def encode_devices(devices):
+        text = ''.join(f'{serial}\tdevice\n' for serial in devices).encode('UTF-8')
+        return f'{len(text):04x}'.encode('ascii') + text
+
+    def track_devices(self):
+        version = None
+        while not self.server.is_stopped:
+            with self.server.devices_changed:
+                if version == self.server.devices_version:
+                    self.server.devices_changed.wait(0.1)
+                    continue
+                version, devices = self.server.devices_version, list(self.server.devices)
+            try:
+                self.request.sendall(self.encode_devices(devices))
+            except OSError:
+                return  # client closed connection
+
+    def fail(self, message):
+        self.request.sendall(b'FAIL' + f'{len(message):04x}'.encode('ascii') + message.encode('UTF-8'))
+
+    def serve_sync(self):
+        while True:
+            header = self.read_exactly(SYNC_HEADER.size)
+            if header is None:
+                return
+            request, length = SYNC_HEADER.unpack(header)
+            path = self.read_exactly(length).decode('UTF-8')
+            if request == b'QUIT':
+                return
+            data = self.server.files.get(path)
+            if request != b'RECV' or data is None:
+                message = f'{path}: No such file or directory'.encode('UTF-8')
+                self.request.sendall(SYNC_HEADER.pack(b'FAIL', len(message)) + message)
+                continue
+            for start in range(0, len(data), SYNC_DATA_MAX):
+                chunk = data[start:start + SYNC_DATA_MAX]
+                self.request.sendall(SYNC_HEADER.pack(b'DATA', len(chunk)) + chunk)
+            self.request.sendall(SYNC_HEADER.pack(b'DONE', 0))
+
+
+class FakeAdbServer(socketserver.ThreadingTCPServer):
+    """Stand-in for adb server listening on a free local port
+
+    :ivar devices: serial numbers of devices
+    :ivar files: dict with path on device as key, and contents of file as value
+    :ivar commands: dict with command for device's shell as key, and its output as value
+    :ivar scan_time: time in seconds pagemap tool spends on each process
+    :ivar pages: number of pages reported for each process
+    :ivar requests: number of served connections
+    :ivar devices_version: number of changes of devices
+    :ivar devices_changed: condition notified when devices change
+    """
+    daemon_threads = True
+
+    def __init__(self, devices=('emulator-5554',), files=None, commands=None, scan_time=0.0, pages=1000):
+        super().__init__(('127.0.0.1', 0), FakeAdbHandler)
+        self.devices = list(devices)
+        self.files = dict(files or {})
+        self.commands = dict(commands or {})
+        self.scan_time = scan_time
+        self.pages = pages
+        self.requests = 0
+        self.devices_version = 0
+        self.devices_changed = threading.Condition()
+        self.__thread = None
+        self.__stopped = False
+
+    @property
+    def port(self):
+        """Port server listens on
+
+        :getter: returns port number
+        :type: Int
+        """
+        return self.server_address[1]
+
+    def start(self):
+        """Starts serving in background thread
+
+        :return: None
+        """
+        self.__thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.__thread.start()
+
+    @property
+    def is_stopped(self):
+        """Whether server has been stopped
+
+        :getter: returns True if server was stopped, False if not
+        :type: Bool
+        """
+        return self.__stopped
+
+    def set_devices(self, devices):
+        """Replaces devices, as if some were connected or disconnected
+
+        :param devices: serial numbers of devices
+        :return: None
+        """
+        with self.devices_changed:
+            self.devices = list(devices)
+            self.devices_version += 1
+            self.devices_changed.notify_all()
+
+    def stop(self):
+        """Stops serving and closes listening socket
+
+        :return: None
+        """
+        self.__stopped = True
+        self.shutdown()
+        self.server_close()
+
+    def process_request(self, request, client_address):
+        self.requests += 1
+        super().process_request(request, client_address)
+
+    def run(self, command):
+        """Runs shell command, pagemap tool is emulated, other commands output what is given for them or nothing
+
+        :param command: command for device's shell
+        :return: output of command
+        :rtype: bytes
+        """
+        if command in self.commands:
+            return self.commands[command]
+        args = command.split()
+        if not args or not args[0].endswith('/pagemap') or '-b' not in args:
+            return b''
+        # records are prefixed with virtual page numbers if they are requested, incremental scans report all pages
+        record_dtype = DELTA_RECORD_DTYPE if {'-v', '-i', '-I'} & set(args) else PAGE_RECORD_DTYPE
+        output = []
+        run_start = time.monotonic_ns()
+        for pid in args[args.index('-b') + 2:]:
+            if not pid.isdigit():
+                break
+            scan_start = time.monotonic_ns() - run_start
+            time.sleep(self.scan_time)
+            records = np.zeros(self.pages, dtype=record_dtype)
+            if 'vpn' in record_dtype.names:
+                records['vpn'] = np.arange(self.pages)
+            records['offset'] = np.arange(self.pages)
+            records['flags'] = 1 << PRESENT_SHIFT
+            header = (int(pid), 0, self.pages, scan_start, time.monotonic_ns() - run_start)
+            output += [np.array([header], dtype=FRAME_HEADER_DTYPE).tobytes(), records.tobytes()]
+        return b''.join(output)
@@ -0,0 +1,74 @@
+"""Measures responsiveness of page table of a process with millions of pages
+
+Synthetic snapshot of a single process is shown in TableDialog. Opening the dialog, scrolling
+to random positions (each followed by painting of the table), sorting by every column and
+filtering by flags are timed.
+
+Usage example (from the repository root):
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.pagemap_table --pages 2000000
+"""
+
+import argparse
+import random
+import time
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication
+
+from benchmarks.render_pagemap import generate_page_data
+from src.qt_dialogs.table_dialog import TableDialog
+
+
+def time_action(app, action):
+    """Measures time of an action including processing of events it caused
+
+    :param app: application instance
+    :param action: function to be timed
+    :return: time in milliseconds
+    :rtype: Float
+    """
+    start = time.perf_counter()
+    action()
+    app.processEvents()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=2000000, help='number of pages of the process')
+    parser.add_argument('--scrolls', type=int, default=50, help='number of scrolls')
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    snapshot = next(iter(generate_page_data(1, args.pages).values()))
+    results = []
+
+    dialog = None
+
+    def open_dialog():
+        nonlocal dialog
+        dialog = TableDialog(1, snapshot)
+        dialog.show()
+    results.append(('open', time_action(app, open_dialog)))
+
+    view = dialog._ui.pidTableView
+    rng = random.Random(0)
+
+    def scroll():
+        view.verticalScrollBar().setValue(rng.randint(0, view.verticalScrollBar().maximum()))
+        view.viewport().grab()
+    results.append(('scroll', sum(time_action(app, scroll) for _ in range(args.scrolls)) / args.scrolls))
+
+    for column, name in enumerate(dialog.pagemap_model.HEADER):
+        results.append((f'sort by {name.lower()}', time_action(app, lambda: view.sortByColumn(column, Qt.DescendingOrder))))
+    results.append(('filter present', time_action(app, lambda: dialog._ui.statusComboBox.setCurrentIndex(1))))
+    results.append(('filter dirty', time_action(app, lambda: dialog._ui.dirtyComboBox.setCurrentIndex(1))))
+    results.append(('scroll filtered', time_action(app, scroll)))
+
+    print(f'{"action":>16} {"time, ms":>9}')
+    for name, action_time in results:
+        print(f'{name:>16} {action_time:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Compares refreshing list of processes in full with applying changes of the list
+
+Synthetic list of processes is refreshed a number of times, few processes start and finish between
+refreshes. Full refresh parses the whole list written as csv file and passes it to selection dialog,
+which compares it with its rows, diff refresh applies output of pid list tool in diff mode to ProcessList
+and passes changes to the dialog. Both ways end with the same rows in the table.
+
+Usage example (from the repository root):
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.pid_list_refresh --processes 800 --churn 5
+"""
+
+import argparse
+import io
+import random
+import time
+
+import pandas as pd
+from PyQt5.QtWidgets import QApplication
+
+from src.device.process_list import ProcessList
+from src.qt_dialogs.select_dialog import SelectDialog
+
+
+def generate_refreshes(processes, churn, refreshes, seed=0):
+    """Generates lists of processes, some processes are replaced by new ones in every next list
+
+    :param processes: number of processes in each list
+    :param churn: number of processes replaced between lists
+    :param refreshes: number of lists
+    :param seed: seed of random generator
+    :return: list of dicts with (pid, start time) as key, and process name as value
+    :rtype: List
+    """
+    rng = random.Random(seed)
+    current = {(pid, 100): f'process_{pid}' for pid in range(1, processes + 1)}
+    next_pid = processes + 1
+    lists = [dict(current)]
+    for refresh in range(1, refreshes):
+        for key in rng.sample(sorted(current), churn):
+            del current[key]
+            current[(next_pid, 100 + refresh)] = f'process_{next_pid}'
+            next_pid += 1
+        lists.append(dict(current))
+    return lists
+
+
+def diff_output(previous, current):
+    """Makes output of pid list tool in diff mode
+
+    :param previous: processes listed by the previous run, None if there was no run
+    :param current: processes running now
+    :return: output of pid list tool
+    :rtype: bytes
+    """
+    lines = ['='] if previous is None else []
+    previous = previous or {}
+    lines += [f'-{pid},{start}' for pid, start in previous.keys() - current.keys()]
+    lines += [f'+{pid},{start},{current[(pid, start)]}' for pid, start in sorted(current.keys() - previous.keys())]
+    return ''.join(line + '\n' for line in lines).encode('UTF-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--processes', type=int, default=800, help='number of running processes')
+    parser.add_argument('--churn', type=int, default=5, help='number of processes replaced between refreshes')
+    parser.add_argument('--refreshes', type=int, default=20, help='number of refreshes')
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    lists = generate_refreshes(args.processes, args.churn, args.refreshes)
+    csv_files = [''.join(f'{pid},{name}\n' for (pid, _), name in sorted(processes.items())).encode('UTF-8')
+                 for processes in lists]
+    outputs = [diff_output(previous, current) for previous, current in zip([None] + lists, lists)]
+
+    full_dialog = SelectDialog(data_list=[])
+    start = time.perf_counter()
+    for csv_file in csv_files:
+        full_dialog.update(pd.read_csv(io.BytesIO(csv_file), sep=',', header=None).values.tolist())
+        app.processEvents()
+    full_time = (time.perf_counter() - start) * 1000 / len(lists)
+
+    processes = ProcessList()
+    diff_dialog = SelectDialog(data_list=[])
+    start = time.perf_counter()
+    for output in outputs:
+        diff = processes.apply(output)
+        diff_dialog.apply_diff(diff.added, diff.removed, diff.renamed)
+        app.processEvents()
+    diff_time = (time.perf_counter() - start) * 1000 / len(lists)
+
+    assert diff_dialog.data_list == full_dialog.data_list == processes.rows, 'refreshed lists differ'
+    print(f'{"refresh":>8} {"time, ms":>9}')
+    print(f'{"full":>8} {full_time:>9.3f}')
+    print(f'{"diff":>8} {diff_time:>9.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Measures building, expanding and updating tree of processes of a cgroup
+
+Synthetic cgroup processes form a tree, some of their parents are outside of the group. Tree is
+built and expanded in a view, then updated a number of times with few processes started and finished,
+each update is followed by expanding the tree again, as TreeDialog does.
+
+Usage example (from the repository root):
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.pid_tree --processes 800 --churn 3
+"""
+
+import argparse
+import random
+import time
+
+from PyQt5.QtWidgets import QApplication, QTreeView
+
+from src.qt_models.pid_tree_model import PidTreeModel
+
+
+def generate_processes(processes, rng, first_pid=2):
+    """Generates processes, each one is a child of an earlier one or of a process outside of the group
+
+    :param processes: number of processes
+    :param rng: random generator
+    :param first_pid: pid of the first generated process
+    :return: list of [pid, ppid, name_of_pid]
+    :rtype: List
+    """
+    data = []
+    for pid in range(first_pid, first_pid + processes):
+        ppid = rng.choice(data)[0] if data and rng.random() < 0.9 else 1
+        data.append([pid, ppid, f'process_{pid}'])
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--processes', type=int, default=800, help='number of processes in cgroup')
+    parser.add_argument('--churn', type=int, default=3, help='number of processes replaced between updates')
+    parser.add_argument('--updates', type=int, default=20, help='number of updates')
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    rng = random.Random(0)
+    data = generate_processes(args.processes, rng)
+    model = PidTreeModel()
+    view = QTreeView()
+    view.setModel(model)
+    view.show()
+
+    start = time.perf_counter()
+    model.setData(data)
+    view.expandAll()
+    app.processEvents()
+    build_time = (time.perf_counter() - start) * 1000
+
+    next_pid = data[-1][0] + 1
+    update_time = 0
+    for _ in range(args.updates):
+        for row in rng.sample(range(len(data)), args.churn):
+            data[row] = generate_processes(1, rng, next_pid)[0]
+            next_pid += 1
+        start = time.perf_counter()
+        model.setData(data)
+        view.expandAll()
+        app.processEvents()
+        update_time += (time.perf_counter() - start) * 1000
+
+    print(f'{"action":>8} {"time, ms":>9}')
+    print(f'{"build":>8} {build_time:>9.2f}')
+    print(f'{"update":>8} {update_time / args.updates:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Compares vectorized page data reader with the per-record reading loop it replaced
+
+Synthetic page data files are generated in a temporary directory in the same format
+pagemap tool writes them, then both readers parse every file and best time is reported.
+
+Usage example (from the repository root):
+    python -m benchmarks.read_page_data --pages 10000 300000
+"""
+
+import argparse
+import os
+import struct
+import tempfile
+import timeit
+
+import numpy as np
+
+from src.device.interaction import get_bit, load_page_records
+from src.device.page_snapshot import PAGE_RECORD_DTYPE, ANON_SHIFT, DIRTY_SHIFT, PRESENT_SHIFT, PageSnapshot
+
+
+def legacy_read_page_data(file):
+    """Reads page data file record by record, as interaction.read_page_data used to do
+
+    :param file: path to binary page data file
+    :return: list of tuples (<Swap offset or page address>, <present>, <dirty>, <anon>)
+    :rtype: List
+    """
+    offset_size = 8
+    flags_size = 4
+    data = []
+    with open(file, 'rb') as f:
+        offset = f.read(offset_size)
+        flags = f.read(flags_size)
+        while offset and flags:
+            offset = struct.unpack('Q', offset)[0]
+            flags = struct.unpack('I', flags)[0]
+            data.append((offset,
+                         get_bit(flags, shift=PRESENT_SHIFT),
+                         get_bit(flags, shift=DIRTY_SHIFT),
+                         get_bit(flags, shift=ANON_SHIFT)))
+            offset = f.read(offset_size)
+            flags = f.read(flags_size)
+    return data
+
+
+def generate_page_data(file, pages, seed=0):
+    """Writes synthetic page data file with random offsets and flags
+
+    :param file: path to file to be created
+    :param pages: number of page records
+    :param seed: random generator seed
+    :return: None
+    """
+    rng = np.random.default_rng(seed)
+    records = np.empty(pages, dtype=PAGE_RECORD_DTYPE)
+    records['offset'] = rng.integers(0, 2 ** 19, size=pages, dtype=np.uint64)
+    records['flags'] = (rng.integers(0, 2, size=pages, dtype=np.uint32) << PRESENT_SHIFT) | \
+                       (rng.integers(0, 2, size=pages, dtype=np.uint32) << DIRTY_SHIFT) | \
+                       (rng.integers(0, 2, size=pages, dtype=np.uint32) << ANON_SHIFT)
+    records.tofile(file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[1000, 10000, 100000, 300000],
+                        help='numbers of pages in generated files')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timing runs, best one is reported')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print(f'{"pages":>10} {"loop, s":>10} {"vectorized, s":>14} {"speedup":>8}')
+        for pages in args.pages:
+            file = os.path.join(tmp_dir, f'{pages}_page_data')
+            generate_page_data(file, pages)
+
+            # both readers have to agree before their timings are compared
+            expected = np.array(legacy_read_page_data(file), dtype=np.uint64).reshape(-1, 4)
+            snapshot = PageSnapshot.from_page_records(load_page_records(file))
+            actual = np.column_stack((snapshot.offsets, snapshot.is_present, snapshot.is_dirty, snapshot.is_anon))
+            assert np.array_equal(expected, actual.astype(np.uint64)), 'readers disagree'
+
+            loop_time = min(timeit.repeat(lambda: legacy_read_page_data(file), number=1, repeat=args.repeat))
+            vector_time = min(timeit.repeat(lambda: PageSnapshot.from_page_records(load_page_records(file)),
+                                            number=1, repeat=args.repeat))
+            print(f'{pages:>10} {loop_time:>10.4f} {vector_time:>14.4f} {loop_time / vector_time:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Compares rendering frames of iterations serially and by pools of worker processes of different sizes
+
+Synthetic pagedata of several processes is generated for each iteration, then frames' data
+(maps of memory blocks' owners and numbers of pages with each combination of flags) is rendered serially and by worker processes
+receiving pagedata through shared memory. Results of every pool are checked to be identical
+to serial ones, pools are started before timing.
+
+Usage example (from the repository root):
+    python -m benchmarks.render_frames --iterations 32 --workers 1 2 4 8 16
+"""
+
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from benchmarks.render_pagemap import generate_page_data
+from src.graphics.frame_renderer import render_frame_data, render_shared_frame_data, share_page_data
+
+
+def render_parallel(executor, iterations_data, pids):
+    """Renders frames' data of all iterations by worker processes
+
+    :param executor: pool of worker processes
+    :param iterations_data: list of pagedata of each iteration
+    :param pids: list of pids
+    :return: list of frame data of each iteration
+    :rtype: List
+    """
+    shared = [share_page_data(page_data) for page_data in iterations_data]
+    try:
+        futures = [executor.submit(render_shared_frame_data, shm.name, layout, pids) for shm, layout in shared]
+        return [future.result() for future in futures]
+    finally:
+        for shm, _ in shared:
+            shm.close()
+            shm.unlink()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=32, help='number of iterations')
+    parser.add_argument('--pids', type=int, default=10, help='number of processes')
+    parser.add_argument('--pages', type=int, default=20000, help='number of pages of each process')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count()],
+                        help='numbers of worker processes')
+    args = parser.parse_args()
+
+    iterations_data = [generate_page_data(args.pids, args.pages, seed=i) for i in range(args.iterations)]
+    pids = list(iterations_data[0].keys())
+
+    start = time.perf_counter()
+    expected = [render_frame_data(page_data, pids) for page_data in iterations_data]
+    serial_time = time.perf_counter() - start
+    print(f'{"workers":>8} {"time, s":>10} {"speedup":>8}')
+    print(f'{"serial":>8} {serial_time:>10.3f} {1:>7.1f}x')
+
+    for workers in sorted(set(args.workers)):
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+            render_parallel(executor, iterations_data[:workers], pids)  # start workers
+
+            start = time.perf_counter()
+            actual = render_parallel(executor, iterations_data, pids)
+            parallel_time = time.perf_counter() - start
+
+        for expected_data, actual_data in zip(expected, actual):
+            assert np.array_equal(expected_data.owner_map, actual_data.owner_map) and \
+                all(np.array_equal(expected_data.flags_counts[pid], actual_data.flags_counts[pid]) for pid in pids), \
+                'parallel rendering differs from serial one'
+        print(f'{workers:>8} {parallel_time:>10.3f} {serial_time / parallel_time:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
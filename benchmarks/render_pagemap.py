@@ -0,0 +1,102 @@
+"""Compares vectorized search of blocks' owners with the per-block region queries it replaced
+
+Synthetic snapshots of several processes are generated with pages clustered into runs,
+then both searches find the owner of each RAM block and best time is reported.
+Blocks where several processes have the same number of regions are excluded from comparison,
+previous search resolved such ties in an arbitrary order.
+
+Usage example (from the repository root):
+    python -m benchmarks.render_pagemap --pids 10 100 --pages 20000
+"""
+
+import argparse
+import timeit
+from collections import Counter, OrderedDict
+
+import numpy as np
+
+from src.device.page_snapshot import SNAPSHOT_DTYPE, PageSnapshot
+from src.device.region_index import RegionIndex
+from src.graphics.pages_graphics import EMPTY_SLOT, PAGES_IN_BLOCK, PAGE_SIZE, RAM_SIZE, find_block_owners
+
+
+def block_pid_counter(regions, block):
+    """Counts regions of each process intersecting a block
+
+    :param regions: index of regions of pages
+    :param block: number of block of <pages_in_block> pages
+    :return: counter of regions with pid as key
+    :rtype: Counter
+    """
+    pfn = block * PAGES_IN_BLOCK
+    return Counter(regions.pids[slot] for slot in regions.slots[regions.overlapping(pfn, pfn + PAGES_IN_BLOCK)])
+
+
+def legacy_find_block_owners(regions, blocks_count):
+    """Finds owner of each block querying regions block by block, as pages_graphics.draw_addr_area used to do
+
+    :param regions: index of regions of pages
+    :param blocks_count: number of blocks of <pages_in_block> pages
+    :return: list of pids owning blocks, None for blocks without inspected processes' pages
+    :rtype: List
+    """
+    owners = []
+    for block in range(blocks_count):
+        most_counted_pid = block_pid_counter(regions, block).most_common(1)
+        owners.append(most_counted_pid[0][0] if most_counted_pid else None)
+    return owners
+
+
+def generate_page_data(pids, pages, seed=0):
+    """Generates snapshots of processes with present pages clustered into runs of random length
+
+    :param pids: number of processes
+    :param pages: number of pages of each process
+    :param seed: random generator seed
+    :return: ordered dict with pid as key, and PageSnapshot as value
+    :rtype: OrderedDict
+    """
+    rng = np.random.default_rng(seed)
+    page_data = OrderedDict()
+    for pid in range(1, pids + 1):
+        run_starts = rng.integers(0, RAM_SIZE // PAGE_SIZE, size=pages // 16)
+        run_lengths = rng.integers(1, 32, size=len(run_starts))
+        offsets = np.concatenate([np.arange(start, start + length) for start, length in zip(run_starts, run_lengths)])
+        records = np.zeros(min(len(offsets), pages), dtype=SNAPSHOT_DTYPE)
+        records['offset'] = offsets[:len(records)]
+        records['flags'] = PageSnapshot.PRESENT
+        page_data[pid] = PageSnapshot(records)
+    return page_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pids', type=int, nargs='+', default=[1, 10, 50], help='numbers of processes')
+    parser.add_argument('--pages', type=int, default=20000, help='number of pages of each process')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timing runs, best one is reported')
+    args = parser.parse_args()
+
+    blocks_count = RAM_SIZE // PAGE_SIZE // PAGES_IN_BLOCK
+    print(f'{"pids":>6} {"loop, s":>10} {"vectorized, s":>14} {"speedup":>8}')
+    for pids in args.pids:
+        page_data = generate_page_data(pids, args.pages)
+        regions = RegionIndex.from_page_data(page_data)
+
+        # both searches have to agree before their timings are compared
+        expected = legacy_find_block_owners(regions, blocks_count)
+        actual = find_block_owners(regions, blocks_count)
+        for block, pid in enumerate(expected):
+            counts = block_pid_counter(regions, block).most_common(2)
+            if len(counts) == 2 and counts[0][1] == counts[1][1]:
+                continue
+            assert actual[block] == (EMPTY_SLOT if pid is None else regions.pids.index(pid)), 'searches disagree'
+
+        loop_time = min(timeit.repeat(lambda: legacy_find_block_owners(regions, blocks_count),
+                                      number=1, repeat=args.repeat))
+        vector_time = min(timeit.repeat(lambda: find_block_owners(regions, blocks_count),
+                                        number=1, repeat=args.repeat))
+        print(f'{pids:>6} {loop_time:>10.4f} {vector_time:>14.4f} {loop_time / vector_time:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Compares collecting pagedata of several processes by a single run of pagemap tool and by
+concurrent runs, one per process
+
+A stand-in adb server answers pagemap tool commands with synthetic page records after spending
+given time scanning every requested process, as the tool on a device does. Each way of collecting
+is timed and per-pid latencies reported by DeviceInteraction are summarized.
+
+Usage example (from the repository root):
+    python -m benchmarks.scan_concurrency --pids 16 --scan-time 0.05 --concurrency 1 2 4 8
+"""
+
+import argparse
+import os
+import time
+
+from benchmarks.fake_adb_server import FakeAdbServer
+from src.device.interaction import DeviceInteraction
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pids', type=int, default=16, help='number of processes')
+    parser.add_argument('--pages', type=int, default=2000, help='number of pages of each process')
+    parser.add_argument('--scan-time', type=float, default=0.05, help='time in seconds to scan one process')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help='max numbers of concurrent pagemap runs')
+    args = parser.parse_args()
+
+    server = FakeAdbServer(scan_time=args.scan_time, pages=args.pages)
+    server.start()
+    os.environ['ANDROID_ADB_SERVER_PORT'] = str(server.port)
+    pid_list = list(range(1000, 1000 + args.pids))
+    try:
+        print(f'{"concurrency":>11} {"time, s":>10} {"mean latency, s":>16} {"max latency, s":>15}')
+        for max_concurrency in [None] + sorted(set(args.concurrency)):
+            interaction = DeviceInteraction()
+            interaction.set_device(server.devices[0])
+            start = time.perf_counter()
+            error_pids = interaction.collect_page_data(0, pid_list, max_concurrency=max_concurrency)
+            elapsed = time.perf_counter() - start
+            assert not error_pids and len(interaction.get_page_data(0)) == args.pids, 'pagedata is incomplete'
+
+            latencies = list(interaction.get_latencies(0).values())
+            print(f'{max_concurrency or "batch":>11} {elapsed:>10.3f} {sum(latencies) / len(latencies):>16.3f} '
+                  f'{max(latencies):>15.3f}')
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -8,57 +8,221 @@
 #include <ctype.h>
 
 #define BUF_SIZE 256
+#define STAT_SIZE 1024
 #define PROC_DIRECTORY "/proc/"
 
+typedef struct {
+    int pid;
+    unsigned long long start_time;
+    char name[BUF_SIZE];
+} Process;
+
 int str_is_digit(const char *str){
     unsigned int i = 0;
     for (; isdigit(str[i]); i++);
     return i == strlen(str);
 }
 
+int compare_processes(const void *first, const void *second) {
+    return ((const Process *) first)->pid - ((const Process *) second)->pid;
+}
+
+//function reads start time (in clock ticks after boot) and short name of a process from /proc/<pid>/stat,
+//start time tells apart processes reusing the same pid
+//returns 0 on success, -1 if process is gone
+int read_stat(const char *pid, Process *process) {
+    char path[BUF_SIZE];
+    char stat[STAT_SIZE];
+    sprintf(path, "/proc/%s/stat", pid);
+    FILE *stat_file = fopen(path, "r");
+    if (stat_file == NULL) {
+        return -1;
+    }
+    size_t size = fread(stat, 1, STAT_SIZE - 1, stat_file);
+    fclose(stat_file);
+    stat[size] = '\0';
+
+    //name is enclosed in parentheses and may contain spaces or parentheses itself
+    char *name_begin = strchr(stat, '(');
+    char *name_end = strrchr(stat, ')');
+    if (name_begin == NULL || name_end == NULL || name_end < name_begin) {
+        return -1;
+    }
+    size_t name_size = name_end - name_begin - 1 < BUF_SIZE - 1 ? name_end - name_begin - 1 : BUF_SIZE - 1;
+    memcpy(process->name, name_begin + 1, name_size);
+    process->name[name_size] = '\0';
+
+    //start time is the 22nd field, fields from the 3rd one follow the name
+    if (sscanf(name_end + 2, "%*c %*d %*d %*d %*d %*d %*u %*u %*u %*u %*u %*u %*u %*d %*d %*d %*d %*d %*d %llu",
+               &process->start_time) != 1) {
+        return -1;
+    }
+    process->pid = atoi(pid);
+    return 0;
+}
+
+//function reads full name of a process from its cmdline, short name from stat is kept if cmdline is empty
+void read_name(const char *pid, Process *process) {
+    char path[BUF_SIZE];
+    char raw_name[BUF_SIZE] = "";
+    sprintf(path, "/proc/%s/cmdline", pid);
+    FILE *cmdline_file = fopen(path, "r");
+    if (cmdline_file == NULL) {
+        return;
+    }
+    if (fscanf(cmdline_file, "%255s", raw_name) == 1) {
+        char *cut_name = strrchr(raw_name, '/');
+        strcpy(process->name, cut_name == NULL ? raw_name : cut_name + sizeof(char));
+    }
+    fclose(cmdline_file);
+}
+
+//function collects all running processes sorted by pid, returns their number
+unsigned long read_processes(Process **processes) {
+    unsigned long capacity = 1024;
+    unsigned long count = 0;
+    *processes = malloc(capacity * sizeof(Process));
+
+    DIR *dir_proc = opendir(PROC_DIRECTORY);
+    struct dirent *dir_info = NULL;
+    while ((dir_info = readdir(dir_proc))) {
+        if (dir_info->d_type != DT_DIR || !str_is_digit(dir_info->d_name)) {
+            continue;
+        }
+        if (count == capacity) {
+            capacity *= 2;
+            *processes = realloc(*processes, capacity * sizeof(Process));
+        }
+        if (read_stat(dir_info->d_name, &(*processes)[count]) == 0) {
+            read_name(dir_info->d_name, &(*processes)[count]);
+            count++;
+        }
+    }
+    closedir(dir_proc);
+    qsort(*processes, count, sizeof(Process), compare_processes);
+    return count;
+}
+
+//function reads processes listed by the previous run from state file, returns their number, -1 if there is no state
+long read_state(const char *state_path, Process **processes) {
+    FILE *state_file = fopen(state_path, "r");
+    if (state_file == NULL) {
+        return -1;
+    }
+    size_t capacity = 1024;
+    size_t count = 0;
+    *processes = malloc(capacity * sizeof(Process));
+    char line[BUF_SIZE + 64];
+    while (fgets(line, sizeof(line), state_file)) {
+        if (count == capacity) {
+            capacity *= 2;
+            *processes = realloc(*processes, capacity * sizeof(Process));
+        }
+        //name is the rest of the line, it may contain spaces
+        Process *process = &(*processes)[count];
+        int name_offset = 0;
+        if (sscanf(line, "%d %llu %n", &process->pid, &process->start_time, &name_offset) == 2) {
+            line[strcspn(line, "\n")] = '\0';
+            strncpy(process->name, line + name_offset, BUF_SIZE - 1);
+            process->name[BUF_SIZE - 1] = '\0';
+            count++;
+        }
+    }
+    fclose(state_file);
+    return (long)count;
+}
+
+//function stores current processes for the next run, file is replaced at once, so it is never left incomplete
+void write_state(const char *state_path, const Process *processes, unsigned long count) {
+    char tmp_path[BUF_SIZE + 4];
+    sprintf(tmp_path, "%s.tmp", state_path);
+    FILE *state_file = fopen(tmp_path, "w");
+    if (state_file == NULL) {
+        return;
+    }
+    for (unsigned long i = 0; i < count; i++) {
+        fprintf(state_file, "%d %llu %s\n", processes[i].pid, processes[i].start_time, processes[i].name);
+    }
+    fclose(state_file);
+    rename(tmp_path, state_path);
+}
+
+//function prints processes started and finished since the previous run:
+//"+<pid>,<start time>,<name>" for started ones and "-<pid>,<start time>" for finished ones,
+//"~<pid>,<start time>,<name>" for ones which changed their name, e.g. app processes forked from zygote,
+//output starts with "=" line if there is no previous run and all processes are listed as started
+void print_diff(const char *state_path, int restart) {
+    Process *current = NULL;
+    Process *previous = NULL;
+    unsigned long current_count = read_processes(&current);
+    long previous_count = restart ? -1 : read_state(state_path, &previous);
+    if (previous_count < 0) {
+        printf("=\n");
+        previous_count = 0;
+    }
+
+    unsigned long i = 0;
+    unsigned long j = 0;
+    while (i < current_count || j < (unsigned long) previous_count) {
+        if (j == (unsigned long) previous_count || (i < current_count && current[i].pid < previous[j].pid)) {
+            printf("+%d,%llu,%s\n", current[i].pid, current[i].start_time, current[i].name);
+            i++;
+        } else if (i == current_count || previous[j].pid < current[i].pid) {
+            printf("-%d,%llu\n", previous[j].pid, previous[j].start_time);
+            j++;
+        } else {
+            //pid was reused if start time differs
+            if (current[i].start_time != previous[j].start_time) {
+                printf("-%d,%llu\n", previous[j].pid, previous[j].start_time);
+                printf("+%d,%llu,%s\n", current[i].pid, current[i].start_time, current[i].name);
+            } else if (strcmp(current[i].name, previous[j].name) != 0) {
+                printf("~%d,%llu,%s\n", current[i].pid, current[i].start_time, current[i].name);
+            }
+            i++;
+            j++;
+        }
+    }
+    write_state(state_path, current, current_count);
+    free(current);
+    free(previous);
+}
+
 // usage example:
 // ./get_pid_list <path/to/directory>
+// ./get_pid_list -d <path/to/state/file> [-r]
 // example:
 // ./get_pid_list .
 // will create file pid_list.csv in current directory
+// ./get_pid_list -d ./pid_list_state
+// will print processes started and finished since the previous run with the same state file
+// and ones which changed their name,
+// -r makes it list all processes as if there was no previous run
 int main (int argc, char* argv[]) {
     if(argc < 2){
         perror("Not enough parameters, provide path\n");
         exit(EXIT_FAILURE);
     }
 
-    struct dirent* dir_info = NULL;
-    DIR* dir_proc = NULL;
+    if (strcmp(argv[1], "-d") == 0) {
+        if (argc < 3) {
+            perror("Not enough parameters, provide state file path\n");
+            exit(EXIT_FAILURE);
+        }
+        print_diff(argv[2], argc > 3 && strcmp(argv[3], "-r") == 0);
+        return 0;
+    }
 
     char save_path[BUF_SIZE] = "";
     strcat(save_path, argv[1]);
     strcat(save_path, "/pid_list.csv");
     FILE* result = fopen(save_path, "w");
 
-    dir_proc = opendir(PROC_DIRECTORY);
-
-    char pid_name_path[BUF_SIZE] = "";
-    char pid_raw_name[BUF_SIZE] = "";
-    FILE* fname;
-
-    while ((dir_info = readdir(dir_proc))) {
-        if (dir_info->d_type == DT_DIR && str_is_digit(dir_info->d_name)) {
-            sprintf(pid_name_path, "/proc/%s/cmdline", dir_info->d_name);
-            fname = fopen(pid_name_path, "r");
-            fscanf(fname, "%s", pid_raw_name);
-
-            char pid_name[BUF_SIZE] = "";
-            char *pid_cut_name = strrchr(pid_raw_name, '/');
-            if (pid_cut_name == NULL) {
-                strcpy(pid_name, pid_raw_name);
-            } else {
-                strcpy(pid_name, pid_cut_name + sizeof(char));
-            }
-            fprintf(result, "%s,%s\n", dir_info->d_name, pid_name);
-            fclose(fname);
-        }
+    Process *processes = NULL;
+    unsigned long count = read_processes(&processes);
+    for (unsigned long i = 0; i < count; i++) {
+        fprintf(result, "%d,%s\n", processes[i].pid, processes[i].name);
     }
     fclose(result);
-    closedir(dir_proc);
+    free(processes);
     return 0;
 }
@@ -4,218 +4,501 @@
 #include <fcntl.h>
 #include <sys/types.h>
 #include <limits.h>
+#include <errno.h>
+#include <time.h>
 #include "page_tool.h"
 
-AddrPair *addr_data;
-PageInfo *pages_data;
 const char *pid_str;
+FILE *log_fp;
 
-//function reads an 64-bit number from file
-uint64_t read_u64(int fd, unsigned long offset) {
-    unsigned long nread;
-    uint64_t data;
-    nread = pread(fd, &data, sizeof(uint64_t), (off_t)(offset) * sizeof(uint64_t));
-    if (nread < sizeof(uint64_t)) {
-        perror("Error with reading u64\n");
-        exit(EXIT_FAILURE);
+//buffers of a scan window, their size doesn't depend on size of scanned mappings
+uint64_t window_entries[SCAN_WINDOW];
+uint64_t window_pfns[SCAN_WINDOW];
+uint64_t window_flags[SCAN_WINDOW];
+char window_reported[SCAN_WINDOW];
+
+//direct-mapped cache of kpageflags entries, shared by all blocks and processes scanned in one run
+uint64_t flags_cache_pfn[FLAGS_CACHE_SIZE];
+uint64_t flags_cache_data[FLAGS_CACHE_SIZE];
+FlagsStats flags_stats;
+
+void init_flags_cache() {
+    for (unsigned long i = 0; i < FLAGS_CACHE_SIZE; i++) {
+        flags_cache_pfn[i] = FLAGS_CACHE_EMPTY;
     }
-    return data;
+    memset(&flags_stats, 0, sizeof(FlagsStats));
 }
 
-//function initializes an array of AddrPair structures  and fills it with pairs of block's start and end addresses
-unsigned long parse_maps_blocks(AddrPair **addresses, FILE *maps_fp) {
-    if (*addresses != NULL) {
-        perror("Addresses pointer should be NULL before calling parse_blocks()\n");
-        exit(EXIT_FAILURE);
+int compare_pfn_refs(const void *first, const void *second) {
+    uint64_t first_pfn = ((const PfnRef *) first)->pfn;
+    uint64_t second_pfn = ((const PfnRef *) second)->pfn;
+    return (first_pfn > second_pfn) - (first_pfn < second_pfn);
+}
+
+//function fills flags with kpageflags entries of given pfns, count should not exceed SCAN_WINDOW
+//pfns missing in cache are sorted and read with one pread per range of FLAGS_CHUNK_SIZE neighbouring entries
+void read_page_flags(int flags_fd, const uint64_t *pfns, unsigned long count, uint64_t *flags) {
+    static PfnRef misses[SCAN_WINDOW];
+    unsigned long misses_count = 0;
+    unsigned long slot;
+    for (unsigned long i = 0; i < count; i++) {
+        slot = FLAGS_CACHE_SLOT(pfns[i]);
+        if (flags_cache_pfn[slot] == pfns[i]) {
+            flags[i] = flags_cache_data[slot];
+            flags_stats.cache_hits++;
+        } else {
+            misses[misses_count].pfn = pfns[i];
+            misses[misses_count].index = i;
+            misses_count++;
+        }
     }
-    unsigned long size = INIT_ARR_SIZE;
-    *addresses = (AddrPair *) malloc(size * sizeof(AddrPair));
-    unsigned long counter = 0;
-    char buffer[BUF_SIZE] = "";
+    flags_stats.lookups += count;
+    qsort(misses, misses_count, sizeof(PfnRef), compare_pfn_refs);
+
+    uint64_t chunk[FLAGS_CHUNK_SIZE];
+    unsigned long range_begin = 0;
+    unsigned long range_end;
+    while (range_begin < misses_count) {
+        uint64_t first_pfn = misses[range_begin].pfn;
+        range_end = range_begin + 1;
+        while (range_end < misses_count && misses[range_end].pfn - first_pfn < FLAGS_CHUNK_SIZE) {
+            range_end++;
+        }
+        unsigned long entries = misses[range_end - 1].pfn - first_pfn + 1;
+        ssize_t nread = pread(flags_fd, chunk, entries * sizeof(uint64_t), (off_t)(first_pfn * sizeof(uint64_t)));
+        unsigned long entries_read = nread > 0 ? nread / sizeof(uint64_t) : 0;
+        flags_stats.syscalls++;
+
+        for (unsigned long i = range_begin; i < range_end; i++) {
+            unsigned long pos = misses[i].pfn - first_pfn;
+            if (pos >= entries_read) {
+                //flags of a page are unknown, it is treated as clean and not anonymous
+                flags_stats.failed++;
+                flags[misses[i].index] = 0;
+                continue;
+            }
+            flags[misses[i].index] = chunk[pos];
+            slot = FLAGS_CACHE_SLOT(misses[i].pfn);
+            flags_cache_pfn[slot] = misses[i].pfn;
+            flags_cache_data[slot] = chunk[pos];
+        }
+        range_begin = range_end;
+    }
+}
+
+void print_flags_stats() {
+    //one pread per page was done before reads were batched
+    fprintf(log_fp, "Flags lookups: %lu, cache hits: %lu, reads: %lu, syscalls saved: %lu\n",
+            flags_stats.lookups, flags_stats.cache_hits, flags_stats.syscalls,
+            flags_stats.lookups - flags_stats.syscalls);
+    if (flags_stats.failed > 0) {
+        fprintf(stderr, "Flags of %lu pages couldn't be read\n", flags_stats.failed);
+    }
+}
 
+//function parses a line of maps file into pair of mapping's start and end addresses, returns 1 on success
+int parse_maps_line(const char *line, AddrPair *addresses) {
     unsigned long vm_start;
     unsigned long vm_end;
     unsigned long long pgoff;
     int major, minor;
     char r, w, x, s;
     unsigned long ino;
-    int values_count;
-
-    while (fgets(buffer, sizeof(buffer), maps_fp)) {
-        if (counter == size - 1) {
-            size *= RESIZE_C;
-            *addresses = (AddrPair *) realloc(*addresses, size * sizeof(AddrPair));
-        }
-        values_count = sscanf(buffer, "%lx-%lx %c%c%c%c %llx %x:%x %lu", &vm_start,
+    int values_count = sscanf(line, "%lx-%lx %c%c%c%c %llx %x:%x %lu", &vm_start,
                               &vm_end,
                               &r, &w, &x, &s,
                               &pgoff,
                               &major, &minor,
                               &ino);
-        (*addresses)[counter].begin = vm_start;
-        (*addresses)[counter].end = vm_end;
-        if (values_count < 10) {
-            fprintf(stderr, "unexpected line: %s\n", buffer);
-            continue;
-        }
-        counter++;
-        buffer[0] = '\0';
+    if (values_count < 10) {
+        fprintf(stderr, "unexpected line: %s\n", line);
+        return 0;
     }
-    return counter;
+    addresses->begin = vm_start;
+    addresses->end = vm_end;
+    return 1;
 }
 
-unsigned long get_page_info_block(int page_fd,
-                                  int flags_fd,
-                                  PageInfo **pagemap,
-                                  unsigned long block_size,
-                                  uintptr_t vaddr,
-                                  unsigned long pagemap_pos) {
-    unsigned long nread;
-    uint64_t data[block_size];
-    nread = pread(page_fd, data, block_size * sizeof(uint64_t), (off_t)((vaddr / PAGE_SIZE) * sizeof(uint64_t)));
-
-    unsigned long off = pagemap_pos;
-    uint64_t flags_data;
-    for (unsigned long i = 0; i < block_size; i++) {
-        (*pagemap)[off + i].addr = vaddr + i * PAGE_SIZE;
-        (*pagemap)[off + i].pfn = PFN(data[i]);
-        (*pagemap)[off + i].file_page = PAGE_FILE(data[i]);
-        (*pagemap)[off + i].shared_anon = (*pagemap)[off + i].file_page == 1 ? 0 : 1;
-        (*pagemap)[off + i].swapped = PAGE_SWAPPED(data[i]);
-        (*pagemap)[off + i].present = PAGE_PRESENT(data[i]);
-        if ((*pagemap)[off + i].present == 1) {
-            flags_data = read_u64(flags_fd, (*pagemap)[off + i].pfn);
-            (*pagemap)[off + i].dirty = PAGE_DIRTY(flags_data);
-            (*pagemap)[off + i].anon = PAGE_ANON(flags_data);
-        } else {
-            (*pagemap)[off + i].swap_offset = SWAP_OFFSET(data[i]);
-            (*pagemap)[off + i].dirty = 0;
-            (*pagemap)[off + i].anon = 0;
-        }
+//function opens <path_to_save>/<filename> file for writing, or returns stdout if path_to_save is STDOUT_PATH
+FILE *open_data_file(char *path_to_save, const char *filename) {
+    if (strcmp(path_to_save, STDOUT_PATH) == 0) {
+        return stdout;
     }
-    return nread / sizeof(uint64_t);
-}
+    char file_path[BUF_SIZE] = "";
+    strcat(file_path, path_to_save);
+    strcat(file_path, "/");
+    strcat(file_path, filename);
+    fprintf(log_fp, "Path to saved data: %s\n", file_path);
+    FILE *result = fopen(file_path, "w");
 
-//function initializes an array of PageInfo structures and fills it with info about each process's page
-unsigned long get_pages_info(PageInfo **pages, AddrPair *addr_data, unsigned long addr_data_size, int page_fd, int flags_fd) {
-    if (*pages != NULL) {
-        perror("Pages pointer should be NULL before calling get_pages()\n");
+    if (result == NULL) {
+        fprintf(stderr, "Error with creating %s\n", file_path);
         exit(EXIT_FAILURE);
     }
-    unsigned long size = INIT_ARR_SIZE;
-    *pages = (PageInfo *) malloc(size * sizeof(PageInfo));
-    unsigned long pages_counter = 0;
-    unsigned long block_size;
-    unsigned long nread;
-    for (unsigned long i = 0; i < addr_data_size; i++) {
-        block_size = (addr_data[i].end - addr_data[i].begin) / PAGE_SIZE;
-        if (pages_counter + block_size >= size - 1) {
-            size = (unsigned long) (size + block_size + 1);
-            *pages = (PageInfo *)realloc(*pages, size * sizeof(PageInfo));
-        }
-        nread = get_page_info_block(page_fd, flags_fd, pages, block_size, addr_data[i].begin, pages_counter);
-        pages_counter += nread;
+    return result;
+}
+
+void close_data_file(FILE *result) {
+    if (result == stdout) {
+        fflush(result);
+    } else {
+        fclose(result);
     }
-    return pages_counter;
 }
 
-void create_data_file(PageInfo *data, unsigned long data_size, char *path_to_save) {
-    char filename[BUF_SIZE] = "";
-    strcat(filename, path_to_save);
-    strcat(filename, "/");
-    strcat(filename, pid_str);
-    strcat(filename, "_page_data");
-    printf("Path to saved data: %s\n", filename);
-    FILE *result = fopen(filename, "w");
+uint64_t monotonic_ns() {
+    struct timespec now;
+    clock_gettime(CLOCK_MONOTONIC, &now);
+    return (uint64_t) now.tv_sec * 1000000000 + now.tv_nsec;
+}
 
-    if (result == NULL) {
-        fprintf(stderr, "Error with creating %s\n", filename);
+void init_writer(RecordWriter *writer, FILE *output, int framed, int with_vpn) {
+    writer->output = output;
+    writer->framed = framed;
+    writer->record_size = with_vpn ? DELTA_RECORD_SIZE : RECORD_SIZE;
+    writer->pid = 0;
+    writer->run_start = monotonic_ns();
+    writer->scan_start = 0;
+    writer->count = 0;
+}
+
+//function writes buffered records, in batch mode they are preceded by a frame header with given status
+//and times of the process' scan, so the last frame of a process tells when its scan started and ended
+void flush_records(RecordWriter *writer, int status) {
+    if (writer->framed) {
+        FrameHeader header;
+        header.pid = writer->pid;
+        header.status = status;
+        header.count = writer->count;
+        header.scan_start = writer->scan_start;
+        header.scan_end = monotonic_ns() - writer->run_start;
+        fwrite(&header, sizeof(FrameHeader), 1, writer->output);
+    }
+    if (writer->count > 0) {
+        fwrite(writer->buffer, writer->record_size, writer->count, writer->output);
+    }
+    writer->count = 0;
+}
+
+//function encodes a page into output buffer, full buffer is written as a frame to be continued
+//virtual page number is written in front of a record only by incremental scan
+void add_record(RecordWriter *writer, uint64_t vpn, uint64_t page_offset, uint32_t flags_data) {
+    char *record = writer->buffer + writer->count * writer->record_size;
+    if (writer->record_size == DELTA_RECORD_SIZE) {
+        memcpy(record, &vpn, sizeof(uint64_t));
+        record += sizeof(uint64_t);
+    }
+    memcpy(record, &page_offset, sizeof(uint64_t));
+    memcpy(record + sizeof(uint64_t), &flags_data, sizeof(uint32_t));
+    writer->count++;
+    if (writer->count == RECORDS_CHUNK) {
+        flush_records(writer, FRAME_CONTINUED);
+    }
+}
+
+void read_prev_state(ScanState *state) {
+    state->has_prev = state->prev_fp != NULL && fread(&state->prev, sizeof(StateEntry), 1, state->prev_fp) == 1;
+}
+
+//function opens state of the previous scan of a process and starts the new one
+//state is a file of StateEntry sorted by vpn, one entry per present or swapped page
+void open_scan_state(ScanState *state, const char *state_dir, int pid, int restart) {
+    if (snprintf(state->path, FILE_PATH_SIZE, "%s/%d%s", state_dir, pid, STATE_FILE_SUFFIX) >= FILE_PATH_SIZE) {
+        fprintf(stderr, "Path of scan state in %s is too long\n", state_dir);
+        exit(EXIT_FAILURE);
+    }
+    snprintf(state->next_path, sizeof(state->next_path), "%s%s", state->path, NEXT_STATE_SUFFIX);
+    state->prev_fp = restart ? NULL : fopen(state->path, "r");
+    state->next_fp = fopen(state->next_path, "w");
+    if (state->next_fp == NULL) {
+        fprintf(stderr, "Error with creating %s\n", state->next_path);
         exit(EXIT_FAILURE);
     }
+    read_prev_state(state);
+}
 
-    char file_buffer[CHUNK_SIZE];
-    memset(file_buffer, 0, CHUNK_SIZE);
-    unsigned long buffer_count = 0;
-    unsigned long i = 0;
+//function reports pages of the previous scan which are below vpn and weren't met in the current scan as removed
+void remove_state_until(ScanState *state, uint64_t vpn, RecordWriter *writer) {
+    while (state->has_prev && state->prev.vpn < vpn) {
+        add_record(writer, state->prev.vpn, 0, VALUE_BITMASK(1, REMOVED_FLAG_OFFSET));
+        read_prev_state(state);
+    }
+}
 
-    uint64_t page_offset = 0;
-    uint32_t flags_data = 0;
-    while (i < data_size) {
-        flags_data = 0;
+//function stores page in the current scan state and compares it with the previous scan
+//returns 1 if page has to be reported: it was mapped, written or its pfn, swap offset or state changed
+int update_state(ScanState *state, uint64_t vpn, uint64_t entry, RecordWriter *writer) {
+    remove_state_until(state, vpn, writer);
+    int known = state->has_prev && state->prev.vpn == vpn;
+    int changed = 0;
+    if (PAGE_PRESENT(entry) || PAGE_SWAPPED(entry)) {
+        StateEntry current;
+        current.vpn = vpn;
+        current.entry = entry & STATE_ENTRY_MASK;
+        fwrite(&current, sizeof(StateEntry), 1, state->next_fp);
+        changed = !known || state->prev.entry != current.entry || PAGE_SOFT_DIRTY(entry);
+    } else if (known) {
+        add_record(writer, vpn, 0, VALUE_BITMASK(1, REMOVED_FLAG_OFFSET));
+    }
+    if (known) {
+        read_prev_state(state);
+    }
+    return changed;
+}
 
-        //skip pages filled with 0
-        if (data[i].swapped || data[i].present) {
-            INITIALIZE_CUSTOM_DIRTY(flags_data, data[i].dirty);
-            INITIALIZE_CUSTOM_ANON(flags_data, data[i].anon);
-            INITIALIZE_CUSTOM_PRESENT(flags_data, data[i].present);
+//function replaces state of the previous scan with the current one and clears soft-dirty bits of a process
+//pages written after pagemap was read and before bits are cleared are missed until they are written again
+void close_scan_state(ScanState *state, int pid) {
+    if (state->prev_fp != NULL) {
+        fclose(state->prev_fp);
+    }
+    fclose(state->next_fp);
+    rename(state->next_path, state->path);
 
-            page_offset = data[i].present == 1 ? data[i].pfn : data[i].swap_offset;
-            memcpy(file_buffer + buffer_count, &page_offset, sizeof(uint64_t));
-            buffer_count += sizeof(uint64_t);
-            memcpy(file_buffer + buffer_count, &flags_data, sizeof(uint32_t));
-            buffer_count += sizeof(uint32_t);
-        }
-        i++;
-        // if the chunk is big enough, write it.
-        if (buffer_count >= CHUNK_SIZE) {
-            fwrite(file_buffer, buffer_count, 1, result);
-            buffer_count = 0;
-            memset(file_buffer, 0, CHUNK_SIZE);
-        }
+    char path[FILE_PATH_SIZE];
+    sprintf(path, "/proc/%d/clear_refs", pid);
+    FILE *clear_refs_fp = fopen(path, "w");
+    if (clear_refs_fp == NULL || fputs(CLEAR_SOFT_DIRTY, clear_refs_fp) < 0) {
+        fprintf(stderr, "Error with clearing soft-dirty bits of %d\n", pid);
     }
-    // Write remainder
-    if (buffer_count > 0) {
-        fwrite(file_buffer, buffer_count, 1, result);
+    if (clear_refs_fp != NULL) {
+        fclose(clear_refs_fp);
     }
-    fclose(result);
 }
 
-//execute: ./a.out <pid> <path_to_save_data>
-//example: ./page 8345 .
-int main(int argc, char *argv[]) {
-    if (argc < 3) {
-        perror("Not enough parameters: pid or path wasn't provided by user\n");
-        exit(EXIT_FAILURE);
+//function scans pages of a mapping window by window and passes them to writer, returns number of pages scanned
+//if state is given, only pages changed since the previous scan are passed along with removed ones
+unsigned long scan_mapping(int page_fd, int flags_fd, AddrPair *mapping, ScanState *state, RecordWriter *writer) {
+    unsigned long pages_count = 0;
+    unsigned long first_page = mapping->begin / PAGE_SIZE;
+    unsigned long last_page = mapping->end / PAGE_SIZE;
+    while (first_page < last_page) {
+        unsigned long window_size = last_page - first_page < SCAN_WINDOW ? last_page - first_page : SCAN_WINDOW;
+        ssize_t nread = pread(page_fd, window_entries, window_size * sizeof(uint64_t),
+                              (off_t)(first_page * sizeof(uint64_t)));
+        if (nread <= 0) {
+            break;
+        }
+        window_size = nread / sizeof(uint64_t);
+
+        //flags of the whole window are read at once
+        unsigned long present_count = 0;
+        for (unsigned long i = 0; i < window_size; i++) {
+            if (state != NULL) {
+                window_reported[i] = update_state(state, first_page + i, window_entries[i], writer);
+            } else {
+                //skip pages filled with 0
+                window_reported[i] = PAGE_PRESENT(window_entries[i]) || PAGE_SWAPPED(window_entries[i]);
+            }
+            if (window_reported[i] && PAGE_PRESENT(window_entries[i])) {
+                window_pfns[present_count++] = PFN(window_entries[i]);
+            }
+        }
+        read_page_flags(flags_fd, window_pfns, present_count, window_flags);
+
+        unsigned long present_pos = 0;
+        for (unsigned long i = 0; i < window_size; i++) {
+            if (!window_reported[i]) {
+                continue;
+            }
+            uint32_t flags_data = 0;
+            if (PAGE_PRESENT(window_entries[i])) {
+                INITIALIZE_CUSTOM_DIRTY(flags_data, PAGE_DIRTY(window_flags[present_pos]));
+                INITIALIZE_CUSTOM_ANON(flags_data, PAGE_ANON(window_flags[present_pos]));
+                INITIALIZE_CUSTOM_PRESENT(flags_data, 1);
+                add_record(writer, first_page + i, PFN(window_entries[i]), flags_data);
+                present_pos++;
+            } else {
+                add_record(writer, first_page + i, SWAP_OFFSET(window_entries[i]), flags_data);
+            }
+        }
+        pages_count += window_size;
+        first_page += window_size;
     }
-    pid_str = argv[1];
+    return pages_count;
+}
+
+//function streams records of each page of a process to writer, returns 0 on success or errno value otherwise
+//if state_dir is given, scan is incremental: only changes since the previous scan stored in state_dir are streamed
+int scan_pid(int pid, int flags_fd, const char *state_dir, int restart, RecordWriter *writer) {
     char path[FILE_PATH_SIZE];
-    int pid = atoi(pid_str);
     sprintf(path, "/proc/%d/maps", pid);
 
     FILE *fp = fopen(path, "r");
     if (fp == NULL) {
-        perror("Error with opening a maps file");
-        exit(EXIT_FAILURE);
+        int status = errno;
+        fprintf(stderr, "Error with opening a maps file of %d: %s\n", pid, strerror(status));
+        return status;
     }
 
-    addr_data = NULL;
-    pages_data = NULL;
-
-    unsigned long addr_data_size = parse_maps_blocks(&addr_data, fp);
-    printf("Mapped blocks count: %ld\n", addr_data_size);
-    fclose(fp);
-
     sprintf(path, "/proc/%d/pagemap", pid);
     int page_fd = open(path, O_RDONLY);
     if (page_fd < 0) {
-        perror("Error with opening a pagemap file");
+        int status = errno;
+        fprintf(stderr, "Error with opening a pagemap file of %d: %s\n", pid, strerror(status));
+        fclose(fp);
+        return status;
+    }
+
+    static ScanState state;
+    ScanState *scan_state = NULL;
+    if (state_dir != NULL) {
+        scan_state = &state;
+        open_scan_state(scan_state, state_dir, pid, restart);
+    }
+    int status = scan_state != NULL && scan_state->prev_fp != NULL ? FRAME_DELTA : 0;
+
+    //mappings are scanned while maps file is read, so no list of them is kept
+    char buffer[BUF_SIZE] = "";
+    AddrPair mapping;
+    unsigned long mappings_count = 0;
+    unsigned long pages_count = 0;
+    while (fgets(buffer, sizeof(buffer), fp)) {
+        if (parse_maps_line(buffer, &mapping)) {
+            pages_count += scan_mapping(page_fd, flags_fd, &mapping, scan_state, writer);
+            mappings_count++;
+        }
+        buffer[0] = '\0';
+    }
+    fprintf(log_fp, "Mapped blocks count: %ld\n", mappings_count);
+    fprintf(log_fp, "Pages scanned: %ld\n", pages_count);
+
+    if (scan_state != NULL) {
+        //pages above the last mapping were unmapped
+        remove_state_until(scan_state, UINT64_MAX, writer);
+        close_scan_state(scan_state, pid);
+    }
+    fclose(fp);
+    close(page_fd);
+    return status;
+}
+
+//function reads pids from a file containing one pid per line, like cgroup tasks file
+unsigned long read_tasks_file(const char *tasks_path, int **pids) {
+    FILE *tasks_fp = fopen(tasks_path, "r");
+    if (tasks_fp == NULL) {
+        perror("Error with opening a tasks file");
+        exit(EXIT_FAILURE);
+    }
+    unsigned long size = INIT_ARR_SIZE;
+    unsigned long counter = 0;
+    *pids = (int *) malloc(size * sizeof(int));
+    char buffer[BUF_SIZE] = "";
+    while (fgets(buffer, sizeof(buffer), tasks_fp)) {
+        if (counter == size) {
+            size *= RESIZE_C;
+            *pids = (int *) realloc(*pids, size * sizeof(int));
+        }
+        (*pids)[counter++] = atoi(buffer);
+    }
+    fclose(tasks_fp);
+    return counter;
+}
+
+//function scans every given process and writes its frames to <path_to_save>/batch_page_data
+//records of a process are split into frames of at most RECORDS_CHUNK records,
+//all frames but the last one have FRAME_CONTINUED status, the last one has status of the scan
+void scan_batch(int *pids, unsigned long pids_count, char *path_to_save, int flags_fd,
+                const char *state_dir, int restart, int with_vpn) {
+    static RecordWriter writer;
+    init_writer(&writer, open_data_file(path_to_save, "batch_page_data"), 1, with_vpn);
+    for (unsigned long i = 0; i < pids_count; i++) {
+        writer.pid = pids[i];
+        writer.scan_start = monotonic_ns() - writer.run_start;
+        int status = scan_pid(pids[i], flags_fd, state_dir, restart, &writer);
+        if (status > 0 && state_dir != NULL) {
+            //process is gone or inaccessible, the next scan of its pid starts over
+            char state_path[FILE_PATH_SIZE];
+            snprintf(state_path, FILE_PATH_SIZE, "%s/%d%s", state_dir, pids[i], STATE_FILE_SUFFIX);
+            unlink(state_path);
+        }
+        flush_records(&writer, status);
+    }
+    close_data_file(writer.output);
+}
+
+//execute: ./a.out <pid> <path_to_save_data>
+//example: ./page 8345 .
+//use - as path to write data to stdout, messages are written to stderr then:
+//example: ./page 8345 -
+//batch mode scans several processes, each one's records are preceded by FrameHeader:
+//execute: ./a.out -b <path_to_save_data> <pid> [<pid> ...]
+//execute: ./a.out -t <path_to_save_data> <path_to_tasks_file>
+//example: ./page -b - 8345 8346 8400
+//example: ./page -t . /sys/fs/cgroup/freezer/tasks
+//incremental mode reports only pages changed since the previous scan, records are prefixed with vpn,
+//state of scans is kept in <state_dir>, -I starts over and reports all pages:
+//execute: ./a.out -i <state_dir> <any of the above>
+//example: ./page -I /data/local/testing -b - 8345 8346
+//example: ./page -i /data/local/testing -b - 8345 8346
+//records of a full scan are prefixed with vpn too, if -v is given:
+//execute: ./a.out -v <any of the above but incremental mode>
+//example: ./page -v -b - 8345 8346
+int main(int argc, char *argv[]) {
+    char *state_dir = NULL;
+    int restart = 0;
+    int with_vpn = 0;
+    if (argc > 2 && (strcmp(argv[1], INCREMENTAL_OPTION) == 0 || strcmp(argv[1], RESTART_OPTION) == 0)) {
+        restart = strcmp(argv[1], RESTART_OPTION) == 0;
+        state_dir = argv[2];
+        with_vpn = 1;
+        argc -= 2;
+        argv += 2;
+    } else if (argc > 1 && strcmp(argv[1], VPN_OPTION) == 0) {
+        with_vpn = 1;
+        argc -= 1;
+        argv += 1;
+    }
+    if (argc < 3) {
+        perror("Not enough parameters: pid or path wasn't provided by user\n");
         exit(EXIT_FAILURE);
     }
+    int batch = strcmp(argv[1], BATCH_OPTION) == 0 || strcmp(argv[1], TASKS_OPTION) == 0;
+    if (batch && argc < 4) {
+        perror("Not enough parameters: pids or tasks file wasn't provided by user\n");
+        exit(EXIT_FAILURE);
+    }
+    char *path_to_save = argv[2];
+    log_fp = strcmp(path_to_save, STDOUT_PATH) == 0 ? stderr : stdout;
 
-    sprintf(path, "/proc/kpageflags");
-    int flags_fd = open(path, O_RDONLY);
+    int flags_fd = open("/proc/kpageflags", O_RDONLY);
     if (flags_fd < 0) {
         perror("Error with opening a flags file");
         exit(EXIT_FAILURE);
     }
+    init_flags_cache();
 
-    unsigned long pages_data_size = get_pages_info(&pages_data, addr_data, addr_data_size, page_fd, flags_fd);
+    if (batch) {
+        int *pids = NULL;
+        unsigned long pids_count;
+        if (strcmp(argv[1], TASKS_OPTION) == 0) {
+            pids_count = read_tasks_file(argv[3], &pids);
+        } else {
+            pids_count = argc - 3;
+            pids = (int *) malloc(pids_count * sizeof(int));
+            for (unsigned long i = 0; i < pids_count; i++) {
+                pids[i] = atoi(argv[i + 3]);
+            }
+        }
+        scan_batch(pids, pids_count, path_to_save, flags_fd, state_dir, restart, with_vpn);
+        print_flags_stats();
+        free(pids);
+        close(flags_fd);
+        return 0;
+    }
 
-    printf("Pages scanned: %ld\n", pages_data_size);
-    create_data_file(pages_data, pages_data_size, argv[2]);
-    free(addr_data);
-    free(pages_data);
-    close(page_fd);
+    pid_str = argv[1];
+    char filename[BUF_SIZE] = "";
+    strcat(filename, pid_str);
+    strcat(filename, "_page_data");
+    static RecordWriter writer;
+    init_writer(&writer, open_data_file(path_to_save, filename), 0, with_vpn);
+    if (scan_pid(atoi(pid_str), flags_fd, state_dir, restart, &writer) > 0) {
+        exit(EXIT_FAILURE);
+    }
+    flush_records(&writer, 0);
+    close_data_file(writer.output);
+    print_flags_stats();
     close(flags_fd);
     return 0;
 }
@@ -8,13 +8,33 @@
 #define BUF_SIZE 1000
 #define INIT_ARR_SIZE 1000
 #define RESIZE_C 1.5
-#define CHUNK_SIZE 9600 //single pagedata includes 64 + 32 = 96 bytes, buffer for 100 data records
+#define RECORD_SIZE 12 //single pagedata record includes 64 + 32 bits = 12 bytes
+#define DELTA_RECORD_SIZE 20 //incremental scan record is prefixed with 64 bits of virtual page number
+#define RECORDS_CHUNK 4096 //number of records buffered before they are written
+#define SCAN_WINDOW 4096 //number of pagemap entries read at once
 #define PAGE_SIZE sysconf(_SC_PAGE_SIZE)
+#define FLAGS_CHUNK_SIZE 512 //max number of kpageflags entries read by one pread
+#define FLAGS_CACHE_SIZE 16384 //number of cached kpageflags entries, power of 2
+#define FLAGS_CACHE_SLOT(pfn) ((pfn) & (FLAGS_CACHE_SIZE - 1))
+#define FLAGS_CACHE_EMPTY UINT64_MAX
+#define STDOUT_PATH "-" //path to save data meaning data is written to stdout
+#define BATCH_OPTION "-b" //option to scan pids given as arguments
+#define TASKS_OPTION "-t" //option to scan pids listed in a tasks file
+#define FRAME_CONTINUED -1 //status of a frame followed by another frame of the same process
+#define FRAME_DELTA -2 //status of a successful incremental scan reporting changes since the previous scan
+#define INCREMENTAL_OPTION "-i" //option to report only pages changed since the previous scan
+#define RESTART_OPTION "-I" //option to start incremental scans over, all pages are reported
+#define VPN_OPTION "-v" //option to prefix records of a full scan with virtual page numbers
+#define STATE_FILE_SUFFIX "_scan_state"
+#define NEXT_STATE_SUFFIX ".new" //suffix of a file the current scan is written to
+#define CLEAR_SOFT_DIRTY "4" //value written to clear_refs to clear soft-dirty bits of a process
 
 #define PFN(page) (page & 0x7FFFFFFFFFFFFF)            //first 54 bits
 #define SWAP_OFFSET(page) (page & 0x7FFFFFFFFFFFE0) //5-54 bits
+#define STATE_ENTRY_MASK 0xE07FFFFFFFFFFFFF //pagemap entry without soft-dirty and exclusive bits (55, 56)
 
 #define GET_FLAG(data, offset) ((data >> offset) & 1U)
+#define PAGE_SOFT_DIRTY(page) (GET_FLAG(page, 55))
 #define PAGE_FILE(page) (GET_FLAG(page, 61))
 #define PAGE_SWAPPED(page) (GET_FLAG(page, 62))
 #define PAGE_PRESENT(page) (GET_FLAG(page, 63))
@@ -26,28 +46,81 @@
 #define INITIALIZE_CUSTOM_DIRTY(custom_flags_data, value) (custom_flags_data |=  VALUE_BITMASK(value, 4))
 #define INITIALIZE_CUSTOM_ANON(custom_flags_data, value) (custom_flags_data |=  VALUE_BITMASK(value, 12))
 #define INITIALIZE_CUSTOM_PRESENT(custom_flags_data, value) (custom_flags_data |=  VALUE_BITMASK(value, 26))
-
-typedef struct {
-    unsigned long addr;
-    uint64_t pfn;
-    uint64_t swap_offset;
-    int dirty;
-    int shared_anon;
-    int file_page;
-    int anon;
-    int swapped;
-    int present;
-} PageInfo;
+#define REMOVED_FLAG_OFFSET 31 //custom flag of incremental scan record, set if page is no longer mapped
 
 typedef struct {
     unsigned long begin;
     unsigned long end;
 } AddrPair;
 
-uint64_t read_u64(int fd, unsigned long offset);
-unsigned long parse_maps_blocks(AddrPair **addresses, FILE *maps_fp);
-unsigned long get_page_info_block(int page_fd, int flags_fd, PageInfo **pagemap, unsigned long block_size, uintptr_t vaddr, unsigned long pagemap_pos);
-unsigned long get_pages_info(PageInfo **pages, AddrPair *addr_data, unsigned long addr_data_size, int page_fd, int flags_fd);
-void create_data_file(PageInfo *data, unsigned long data_size, char *path_to_save);
+typedef struct {
+    uint64_t pfn;
+    unsigned long index; //position of pfn in lookup request
+} PfnRef;
+
+typedef struct {
+    unsigned long lookups;
+    unsigned long cache_hits;
+    unsigned long syscalls;
+    unsigned long failed;
+} FlagsStats;
+
+//header preceding records of every process in batch mode output
+typedef struct {
+    int32_t pid;
+    int32_t status; //0 if process was scanned, errno value otherwise, FRAME_CONTINUED if more frames follow
+    uint64_t count; //number of records following the header
+    uint64_t scan_start; //CLOCK_MONOTONIC nanoseconds since the start of the run when scan of the process started
+    uint64_t scan_end; //CLOCK_MONOTONIC nanoseconds since the start of the run when the frame was written
+} FrameHeader;
+
+//buffer encoding records of a process before they are written to output
+typedef struct {
+    FILE *output;
+    int framed; //1 if records are written in frames (batch mode), 0 otherwise
+    unsigned long record_size; //RECORD_SIZE, or DELTA_RECORD_SIZE if records are prefixed with vpn
+    int pid;
+    uint64_t run_start; //CLOCK_MONOTONIC nanoseconds when the run started
+    uint64_t scan_start; //nanoseconds since the start of the run when scan of the current process started
+    unsigned long count; //number of buffered records
+    char buffer[RECORDS_CHUNK * DELTA_RECORD_SIZE];
+} RecordWriter;
+
+typedef struct {
+    uint64_t vpn;
+    uint64_t entry; //pagemap entry masked with STATE_ENTRY_MASK
+} StateEntry;
+
+//states of the previous and the current incremental scans of a process
+typedef struct {
+    char path[FILE_PATH_SIZE];
+    char next_path[FILE_PATH_SIZE + sizeof(NEXT_STATE_SUFFIX) - 1]; //path with NEXT_STATE_SUFFIX always fits
+    FILE *prev_fp;
+    FILE *next_fp;
+    StateEntry prev; //the lowest entry of the previous scan which wasn't compared yet
+    int has_prev;
+} ScanState;
+
+void init_flags_cache();
+int compare_pfn_refs(const void *first, const void *second);
+void read_page_flags(int flags_fd, const uint64_t *pfns, unsigned long count, uint64_t *flags);
+void print_flags_stats();
+int parse_maps_line(const char *line, AddrPair *addresses);
+FILE *open_data_file(char *path_to_save, const char *filename);
+void close_data_file(FILE *result);
+uint64_t monotonic_ns();
+void init_writer(RecordWriter *writer, FILE *output, int framed, int with_vpn);
+void flush_records(RecordWriter *writer, int status);
+void add_record(RecordWriter *writer, uint64_t vpn, uint64_t page_offset, uint32_t flags_data);
+void read_prev_state(ScanState *state);
+void open_scan_state(ScanState *state, const char *state_dir, int pid, int restart);
+void remove_state_until(ScanState *state, uint64_t vpn, RecordWriter *writer);
+int update_state(ScanState *state, uint64_t vpn, uint64_t entry, RecordWriter *writer);
+void close_scan_state(ScanState *state, int pid);
+unsigned long scan_mapping(int page_fd, int flags_fd, AddrPair *mapping, ScanState *state, RecordWriter *writer);
+int scan_pid(int pid, int flags_fd, const char *state_dir, int restart, RecordWriter *writer);
+unsigned long read_tasks_file(const char *tasks_path, int **pids);
+void scan_batch(int *pids, unsigned long pids_count, char *path_to_save, int flags_fd,
+                const char *state_dir, int restart, int with_vpn);
 
 #endif //PAGE_TOOL_H
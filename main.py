@@ -1,4 +1,5 @@
 import sys
+from multiprocessing import freeze_support
 
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QApplication
@@ -15,5 +16,6 @@ class App(QApplication):
 
 
 if __name__ == '__main__':
+    freeze_support()  # frames are rendered by worker processes, which packaged executable has to start
     app = App(sys.argv)
     sys.exit(app.exec_())
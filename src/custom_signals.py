@@ -5,6 +5,7 @@ class CustomSignals(QObject):
     """CustomSignals class: contains custom signals for interaction between MainView and dialogs
     """
     pids_changed = pyqtSignal(list)
+    pids_diff = pyqtSignal(list, list, list)
     cgroup_changed = pyqtSignal(list)
     devices_changed = pyqtSignal(list)
     send_data = pyqtSignal(object)
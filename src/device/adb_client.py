@@ -0,0 +1,345 @@
+"""Contains AdbClient class - client of adb server speaking its host protocol
+
+Requests are sent to adb server through sockets, instead of starting adb program for every command.
+Every request is prefixed with its length as 4 hex digits, server answers OKAY or FAIL followed by
+length-prefixed message. Device services (shell:, exec:, sync:) are reached by switching connection
+to a device with host:transport:<serial> request first. Shell and exec services close connection
+when command exits, connections switched to sync mode serve any number of file transfers, so they
+are kept in a pool per device and reused. Changes of devices' list are followed by host:track-devices
+request, server sends the whole list over the same connection whenever it changes.
+
+Usage example:
+    client = get_client()
+    serials = [serial for serial, state in client.devices()]
+    for devices in client.track_devices():
+        ...
+    mounts = client.shell(serials[0], 'cat', '/proc/mounts')
+    client.pull(serials[0], '/data/local/testing/pid_list.csv', './resources/data/pids_data')
+"""
+
+import os
+import posixpath
+import socket
+import struct
+import threading
+from subprocess import CalledProcessError
+
+from src.device.commands import exec_command
+
+ADB_HOST = '127.0.0.1'
+ADB_PORT = 5037
+ADB_TIMEOUT = 120  # seconds without data from server before connection is considered lost
+MAX_POOLED_CONNECTIONS = 4  # per device
+
+SYNC_HEADER = struct.Struct('<4sI')  # id of sync request or response and length of data following it
+
+
+class AdbError(CalledProcessError):
+    """Failure reported by adb server or loss of connection to it, handled the same way as failure of adb program
+
+    :ivar message: description of failure
+    """
+    def __init__(self, message, request):
+        super().__init__(1, request)
+        self.message = message
+
+    def __str__(self):
+        return f'{self.cmd}: {self.message}'
+
+
+def encode_request(request):
+    """Prefixes request with its length
+
+    :param request: text of request, e.g. host:devices
+    :return: request as sent to server
+    :rtype: bytes
+    """
+    data = request.encode('UTF-8')
+    return f'{len(data):04x}'.encode('ascii') + data
+
+
+def read_exactly(sock, size):
+    """Reads given number of bytes from socket
+
+    :param sock: connected socket
+    :param size: number of bytes
+    :return: received bytes
+    :rtype: bytes
+    :raises ConnectionError: if connection is closed before all bytes are received
+    """
+    chunks = []
+    while size > 0:
+        chunk = sock.recv(min(size, 2 ** 20))
+        if not chunk:
+            raise ConnectionError('Connection closed by adb server')
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def read_devices(sock):
+    """Reads list of devices sent by adb server as length-prefixed text
+
+    :param sock: connected socket
+    :return: list of (serial number, state) of each device
+    :rtype: List
+    """
+    text = read_exactly(sock, int(read_exactly(sock, 4), 16)).decode('UTF-8')
+    return [tuple(line.split('\t')[:2]) for line in text.splitlines() if '\t' in line]
+
+
+def read_to_end(sock):
+    """Reads from socket until the other side closes connection
+
+    :param sock: connected socket
+    :return: received bytes
+    :rtype: bytes
+    """
+    chunks = []
+    while True:
+        chunk = sock.recv(2 ** 20)
+        if not chunk:
+            return b''.join(chunks)
+        chunks.append(chunk)
+
+
+class DeviceTracking:
+    """Stream of lists of devices, iterating over it blocks until the next list comes
+
+    :ivar __sock: connection to adb server
+    """
+    def __init__(self, sock):
+        self.__sock = sock
+
+    def __iter__(self):
+        """Yields list of (serial number, state) of each device every time devices change
+
+        :raises AdbError: if connection is lost or closed
+        """
+        try:
+            while True:
+                yield read_devices(self.__sock)
+        except OSError as error:
+            raise AdbError(str(error), 'host:track-devices') from error
+
+    def close(self):
+        """Closes stream, iteration waiting for the next list in another thread is interrupted
+
+        :return: None
+        """
+        try:
+            self.__sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass  # connection is already lost
+        self.__sock.close()
+
+
+class AdbClient:
+    """Sends requests to adb server, safe to be used from several threads at once
+
+    :ivar __address: (host, port) of adb server
+    :ivar __timeout: max time in seconds to wait for data from server
+    :ivar __sync_pool: dict with device's serial number as key, and list of idle connections in sync mode as value
+    :ivar __lock: lock guarding the pool
+    """
+    def __init__(self, host=ADB_HOST, port=None, timeout=ADB_TIMEOUT):
+        # the same variable sets port of adb program
+        port = port or int(os.environ.get('ANDROID_ADB_SERVER_PORT', ADB_PORT))
+        self.__address = (host, port)
+        self.__timeout = timeout
+        self.__sync_pool = {}
+        self.__lock = threading.Lock()
+
+    def devices(self):
+        """Lists devices known to adb server
+
+        :return: list of (serial number, state) of each device
+        :rtype: List
+        :raises AdbError: if request fails
+        """
+        try:
+            with self.__connect() as sock:
+                self.__request(sock, 'host:devices')
+                return read_devices(sock)
+        except OSError as error:
+            raise AdbError(str(error), 'host:devices') from error
+
+    def track_devices(self):
+        """Opens stream of devices' lists, server sends the current list right away
+        and a new one whenever a device is connected, disconnected or changes its state
+
+        :return: stream of lists of devices
+        :rtype: DeviceTracking
+        :raises AdbError: if request fails
+        """
+        try:
+            sock = self.__connect()
+            try:
+                self.__request(sock, 'host:track-devices')
+            except BaseException:
+                sock.close()
+                raise
+        except OSError as error:
+            raise AdbError(str(error), 'host:track-devices') from error
+        sock.settimeout(None)  # changes may not come for any time
+        return DeviceTracking(sock)
+
+    def shell(self, device, *args):
+        """Runs command by device's shell
+
+        :param device: device's serial number
+        :param args: arguments of a command, joined by spaces as adb program does
+        :return: output of command, stderr is mixed into it
+        :rtype: bytes
+        :raises AdbError: if request fails
+        """
+        return self.__run_service(device, 'shell:' + ' '.join(map(str, args)))
+
+    def exec_out(self, device, *args):
+        """Runs command by device's shell, keeping its output intact, as needed for binary data
+
+        :param device: device's serial number
+        :param args: arguments of a command, joined by spaces as adb program does
+        :return: output of command
+        :rtype: bytes
+        :raises AdbError: if request fails
+        """
+        return self.__run_service(device, 'exec:' + ' '.join(map(str, args)))
+
+    def read_file(self, device, remote_path):
+        """Transfers file from device by sync protocol
+
+        :param device: device's serial number
+        :param remote_path: path to file on device
+        :return: contents of file
+        :rtype: bytes
+        :raises AdbError: if file can't be read
+        """
+        sock = self.__acquire_sync(device)
+        try:
+            sock.sendall(SYNC_HEADER.pack(b'RECV', len(remote_path.encode('UTF-8'))) + remote_path.encode('UTF-8'))
+            chunks = []
+            while True:
+                response, length = SYNC_HEADER.unpack(read_exactly(sock, SYNC_HEADER.size))
+                if response == b'DONE':
+                    break
+                data = read_exactly(sock, length)
+                if response == b'FAIL':
+                    # transfer is over, connection is still in sync mode
+                    self.__release_sync(device, sock)
+                    raise AdbError(data.decode('UTF-8', 'replace'), f'sync:RECV {remote_path}')
+                if response != b'DATA':
+                    raise ConnectionError(f'Unexpected sync response {response}')
+                chunks.append(data)
+        except OSError as error:
+            sock.close()
+            raise AdbError(str(error), f'sync:RECV {remote_path}') from error
+        self.__release_sync(device, sock)
+        return b''.join(chunks)
+
+    def pull(self, device, remote_path, local_path):
+        """Copies file from device
+
+        :param device: device's serial number
+        :param remote_path: path to file on device
+        :param local_path: path to file or directory on PC
+        :return: path to copied file
+        :rtype: String
+        :raises AdbError: if file can't be read
+        """
+        data = self.read_file(device, remote_path)
+        if os.path.isdir(local_path):
+            local_path = os.path.join(local_path, posixpath.basename(remote_path))
+        with open(local_path, 'wb') as f:
+            f.write(data)
+        return local_path
+
+    def close(self):
+        """Closes pooled connections
+
+        :return: None
+        """
+        with self.__lock:
+            pool, self.__sync_pool = self.__sync_pool, {}
+        for connections in pool.values():
+            for sock in connections:
+                sock.close()
+
+    def __connect(self):
+        """Connects to adb server, starts server if it isn't running, as adb program does"""
+        try:
+            sock = socket.create_connection(self.__address, self.__timeout)
+        except ConnectionRefusedError:
+            exec_command('adb', 'start-server')
+            sock = socket.create_connection(self.__address, self.__timeout)
+        # requests are small, they are sent right away instead of waiting for acknowledgement of previous ones
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+    @staticmethod
+    def __request(sock, request):
+        """Sends request and checks server's answer"""
+        sock.sendall(encode_request(request))
+        status = read_exactly(sock, 4)
+        if status == b'OKAY':
+            return
+        if status == b'FAIL':
+            message = read_exactly(sock, int(read_exactly(sock, 4), 16)).decode('UTF-8', 'replace')
+            raise AdbError(message, request)
+        raise ConnectionError(f'Unexpected answer {status} of adb server')
+
+    def __open_service(self, device, service):
+        """Connects to device's service"""
+        sock = self.__connect()
+        try:
+            self.__request(sock, f'host:transport:{device}')
+            self.__request(sock, service)
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+    def __run_service(self, device, service):
+        """Runs shell or exec service and reads its output"""
+        try:
+            with self.__open_service(device, service) as sock:
+                return read_to_end(sock)
+        except OSError as error:
+            raise AdbError(str(error), service) from error
+
+    def __acquire_sync(self, device):
+        """Takes idle connection in sync mode from pool or opens a new one"""
+        with self.__lock:
+            connections = self.__sync_pool.get(device)
+            if connections:
+                return connections.pop()
+        try:
+            return self.__open_service(device, 'sync:')
+        except OSError as error:
+            raise AdbError(str(error), 'sync:') from error
+
+    def __release_sync(self, device, sock):
+        """Returns connection in sync mode to pool"""
+        with self.__lock:
+            connections = self.__sync_pool.setdefault(device, [])
+            if len(connections) < MAX_POOLED_CONNECTIONS:
+                connections.append(sock)
+                return
+        sock.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Returns client shared by the whole application, so connections are pooled across all requests
+
+    :return: client of adb server
+    :rtype: AdbClient
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = AdbClient()
+        return _client
@@ -0,0 +1,199 @@
+"""Contains CollectionThread class - collects pagedata of processes on devices in background,
+and DeadlineScheduler class - keeps iterations on a fixed time grid
+
+Iterations of data collection are run in a separate thread, so GUI stays responsive while
+devices are examined. Each collected iteration is reported right away, collection may be stopped
+at any moment keeping iterations collected so far. Iterations start at fixed deadlines counted from
+the start of collection, so time spent scanning doesn't add up to the period. Scans lasting longer
+than the period are handled according to overrun policy. Several devices are scanned at once
+by a worker per device, every iteration starts on all of them at the same deadline,
+so their iterations are comparable. A device failing to be examined has its processes reported as
+error pids at that iteration, collection stops only if all devices fail.
+
+Usage example:
+    collector = CollectionThread([(device_interaction, pid_list), (other_device_interaction, other_pid_list)],
+                                 iteration_time=1, total_time=60, overrun_policy=OVERRUN_COALESCE)
+    collector.iteration_collected.connect(show_iteration)
+    collector.finished.connect(finish_collection)
+    collector.start()
+    collector.stop()
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+# Policies for scans overrunning their slots:
+# next scan waits for the first deadline which hasn't passed yet, missed deadlines are skipped
+OVERRUN_SKIP = 'skip'
+# next scan starts right away on behalf of all passed deadlines, following ones stay on the grid
+OVERRUN_COALESCE = 'coalesce'
+
+
+class DeadlineScheduler:
+    """Computes start times of iterations, k-th iteration is due at start time + k * period
+
+    :ivar __period: time between iterations in seconds
+    :ivar __overrun_policy: OVERRUN_SKIP or OVERRUN_COALESCE
+    :ivar __start_time: monotonic time of the first deadline
+    :ivar __slot: number of the current deadline
+    :ivar __missed: number of deadlines skipped or coalesced because of overruns
+    """
+    def __init__(self, period, overrun_policy=OVERRUN_SKIP, start_time=None):
+        if overrun_policy not in (OVERRUN_SKIP, OVERRUN_COALESCE):
+            raise ValueError(f'Unknown overrun policy {overrun_policy}')
+        self.__period = period
+        self.__overrun_policy = overrun_policy
+        self.__start_time = time.monotonic() if start_time is None else start_time
+        self.__slot = 0
+        self.__missed = 0
+
+    @property
+    def start_time(self):
+        """Monotonic time of the first deadline
+
+        :getter: returns time in seconds
+        :type: Float
+        """
+        return self.__start_time
+
+    @property
+    def missed(self):
+        """Number of deadlines skipped or coalesced because scans overran their slots
+
+        :getter: returns number of deadlines
+        :type: Int
+        """
+        return self.__missed
+
+    def next_deadline(self, now=None):
+        """Moves to the next slot of the grid
+
+        :param now: current monotonic time, taken from clock if none is given
+        :return: monotonic time the next iteration has to start at
+        :rtype: Float
+        """
+        now = time.monotonic() if now is None else now
+        if self.__period <= 0:
+            return now  # iterations go back to back
+        self.__slot += 1
+        deadline = self.__start_time + self.__slot * self.__period
+        if deadline > now:
+            return deadline
+
+        passed = int((now - deadline) // self.__period) + 1  # deadlines not later than now
+        if self.__overrun_policy == OVERRUN_SKIP:
+            self.__slot += passed
+            self.__missed += passed
+            return self.__start_time + self.__slot * self.__period
+        self.__slot += passed - 1
+        self.__missed += passed - 1
+        return now
+
+
+class CollectionThread(QThread):
+    """Runs iterations of pagedata collection, stores them in DeviceInteraction instance of each device.
+    Signals are emitted from collecting thread, so they are queued to receivers living in GUI thread
+
+    :ivar iteration_collected: signal emitted with (iteration, list of pids of the first device, for which data
+    couldn't be collected) after iteration of all devices is stored
+    :ivar progress_changed: signal emitted with percentage of collecting time passed
+    :ivar collection_failed: signal emitted with error message when collection can't go on
+    :ivar device_failed: signal emitted with serial number of a device the first time it fails to be examined,
+    collection goes on with the other devices
+    :ivar collection_stopped: signal emitted with number of collected iterations when collection was stopped
+    :ivar __targets: list of (DeviceInteraction instance storing collected data, list of pids to collect data from)
+    for each device
+    :ivar __iteration_time: time to wait between iterations in seconds
+    :ivar __total_time: limit of time that all data collection would take in seconds
+    :ivar __overrun_policy: policy for scans lasting longer than iteration time, OVERRUN_SKIP or OVERRUN_COALESCE
+    :ivar __max_concurrency: max number of pids scanned at once by separate runs of pagemap tool,
+    None if all pids are scanned by a single run
+    :ivar __stop_event: event set when collection has to be stopped
+    """
+    iteration_collected = pyqtSignal(int, list)
+    progress_changed = pyqtSignal(int)
+    collection_failed = pyqtSignal(str)
+    device_failed = pyqtSignal(str)
+    collection_stopped = pyqtSignal(int)
+
+    def __init__(self, targets, iteration_time, total_time, overrun_policy=OVERRUN_SKIP, max_concurrency=None,
+                 parent=None):
+        super().__init__(parent)
+        self.__targets = [(device_interaction, list(pid_list)) for device_interaction, pid_list in targets]
+        self.__iteration_time = iteration_time
+        self.__total_time = total_time
+        self.__overrun_policy = overrun_policy
+        self.__max_concurrency = max_concurrency
+        self.__stop_event = threading.Event()
+
+    def stop(self):
+        """Requests collection to stop, iteration being collected is finished and kept
+
+        :return: None
+        """
+        self.__stop_event.set()
+
+    @property
+    def is_stopped(self):
+        """Whether stopping of collection has been requested
+
+        :getter: returns True if collection was requested to stop, False if not
+        :type: Bool
+        """
+        return self.__stop_event.is_set()
+
+    def run(self):
+        """Collects iterations due within total time until collection is stopped
+
+        :return: None
+        """
+        for device_interaction, _ in self.__targets:
+            device_interaction.set_iterations(0)
+        with ThreadPoolExecutor(len(self.__targets)) as executor:
+            self.__collect(executor)
+
+    def __collect(self, executor):
+        """Runs iterations on all devices at once, each device is examined by a worker of executor"""
+        iterations = 0
+        failed_devices = set()
+        scheduler = DeadlineScheduler(self.__iteration_time, self.__overrun_policy)
+        deadline = scheduler.start_time
+        while deadline - scheduler.start_time <= self.__total_time and not self.is_stopped:
+            futures = [executor.submit(device_interaction.collect_page_data, cur_iteration=iterations,
+                                       pid_list=pid_list, incremental=True, max_concurrency=self.__max_concurrency)
+                       for device_interaction, pid_list in self.__targets]
+            if all(future.exception() is not None for future in futures):
+                devices = ', '.join(str(device_interaction.device) for device_interaction, _ in self.__targets)
+                self.collection_failed.emit('Either the process is a system process (no access) '
+                                            f'or it has already completed, also check tool presence on {devices}')
+                return
+
+            error_pids = []
+            for (device_interaction, pid_list), future in zip(self.__targets, futures):
+                if future.exception() is None:
+                    error_pids.append(future.result())
+                    continue
+                # the other devices go on, this one has no data at the iteration
+                error_pids.append(device_interaction.skip_iteration(iterations, pid_list))
+                if device_interaction.device not in failed_devices:
+                    failed_devices.add(device_interaction.device)
+                    self.device_failed.emit(str(device_interaction.device))
+
+            # iterations are published after data of all devices is stored, so they can be shown right away
+            iterations += 1
+            for device_interaction, _ in self.__targets:
+                device_interaction.set_iterations(iterations)
+            self.iteration_collected.emit(iterations - 1, error_pids[0])
+
+            deadline = scheduler.next_deadline()
+            if deadline - scheduler.start_time <= self.__total_time:
+                # wakes up as soon as collection is stopped
+                self.__stop_event.wait(max(0.0, deadline - time.monotonic()))
+            self.progress_changed.emit(min(100, int((time.monotonic() - scheduler.start_time) * 100
+                                                    // self.__total_time)))
+
+        if self.is_stopped:
+            self.collection_stopped.emit(iterations)
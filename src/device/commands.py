@@ -0,0 +1,59 @@
+"""Contains functions to run commands on PC
+
+Commands are run as asyncio subprocesses from lists of arguments, no shell is involved.
+Every command has a timeout. Blocking wrapper is provided for code which doesn't run an event loop.
+
+Usage example:
+    output = exec_command('adb', 'start-server')
+"""
+
+import asyncio
+import subprocess
+
+COMMAND_TIMEOUT = 120  # seconds
+
+
+async def run_command(args, timeout=COMMAND_TIMEOUT):
+    """Runs command and collects its output, command is killed if it doesn't finish in time or is cancelled
+
+    :param args: list of arguments of a command, the first one is a program to run
+    :param timeout: time limit in seconds, None if command may run as long as it takes
+    :return: the console output for executed command
+    :rtype: bytes
+    :raises CalledProcessError: if command can't be started or exits with non-zero status
+    :raises TimeoutExpired: if command doesn't finish in time
+    """
+    try:
+        process = await asyncio.create_subprocess_exec(*args, stdout=subprocess.PIPE)
+    except OSError:
+        # reported the way shell reports commands which can't be found
+        raise subprocess.CalledProcessError(127, args)
+    try:
+        output, _ = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        raise subprocess.TimeoutExpired(args, timeout)
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, args, output)
+    return output
+
+
+def exec_command(*args, print_output=False, timeout=COMMAND_TIMEOUT):
+    """Executes command and waits for it to finish
+
+    :param args: arguments of a command to be executed, the first one is a program to run
+    :param print_output: True is output has to be printed, False if not
+    :param timeout: time limit in seconds
+    :return: the console output for executed command
+    :rtype: bytes
+    :raises CalledProcessError: if command can't be started or exits with non-zero status
+    :raises TimeoutExpired: if command doesn't finish in time
+    """
+    output = asyncio.run(run_command(list(args), timeout))
+    if print_output:
+        print(output.decode('UTF-8'))
+    return output
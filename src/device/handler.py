@@ -1,7 +1,4 @@
-import re
-from itertools import chain
-
-from src.utilities import exec_command, list_difference
+from src.utilities import list_difference
 
 
 class DeviceHandler:
@@ -69,18 +66,15 @@ class DeviceHandler:
         """
         self.__listeners.append(listener)
 
-    def update(self):
-        """Updates list of all connected devices and notifies listeners
+    def set_devices(self, serial_numbers):
+        """Updates list of all connected devices, e.g. with a list reported by DeviceTracker,
+        and notifies listeners if it changed
 
+        :param serial_numbers: serial numbers of connected devices
         :return: None
         """
-        res = exec_command('adb devices')
         prev_state = self.__serial_numbers
-        output = [x for x in res.decode('UTF-8').split('\n') if x]
-        number_pattern = re.compile(r'(.*)\t')
-        serial_numbers = list(map(lambda x: number_pattern.findall(x), output[1:]))
-        # flatten list
-        self.__serial_numbers = list(chain.from_iterable(serial_numbers))
+        self.__serial_numbers = list(serial_numbers)
 
         if len(self.__serial_numbers) == 0:
             self.__current_device_id = None
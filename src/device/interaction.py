@@ -11,80 +11,119 @@ Usage example:
     pid_list = connection.get_all_pid_list()
 """
 
+import asyncio
 import re
-import struct
-import subprocess
-from collections import OrderedDict
+import time
+from collections import OrderedDict, namedtuple
 from subprocess import SubprocessError
 
 import numpy as np
 import pandas as pd
 from pandas.errors import EmptyDataError
 
+from src.device.adb_client import get_client
+from src.device.page_snapshot import DELTA_RECORD_DTYPE, FRAME_CONTINUED, FRAME_DELTA, FRAME_HEADER_DTYPE, \
+    PAGE_RECORD_DTYPE, PageSnapshot, apply_page_delta
+from src.device.process_list import ProcessList
+from src.device.snapshot_store import SnapshotStore
+
+# File on device where pid list tool keeps processes listed by its previous run
+PID_LIST_STATE = '/data/local/testing/pid_list_state'
+
+# Monotonic time in seconds when scan of pages started and ended
+ScanTimes = namedtuple('ScanTimes', ['start', 'end'])
+
+# Scan times of a collecting iteration as a whole and of each process, dict with pid as key and ScanTimes as value
+IterationTimes = namedtuple('IterationTimes', ['start', 'end', 'pids'])
+
 
 def get_bit(data, shift):
     """Get the flag information from data
 
-    :param data: 32-bit number, containing info about flags for 1 page
+    :param data: 32-bit number, containing info about flags for 1 page, or array of such numbers
     :param shift: bit offset for certain flag checking
-    :return: 0 or 1 (ex. 1 if page present : 0 if swapped for shift=26)
-    :rtype: Int
+    :return: 0 or 1 (ex. 1 if page present : 0 if swapped for shift=26), elementwise for arrays
+    :rtype: Int or numpy.ndarray
     """
     return (data >> shift) & 1
 
 
-def exec_command(*args, print_output=False):
-    """Executes command using subprocess module
+def load_page_records(file):
+    """Loads binary page data file into numpy array of packed records in one read.
+    One record is one page, its layout matches the one written by pagemap tool:
+    8 bytes of swap offset or page frame number followed by 4 bytes of flags
+
+    :param file: path to binary page data file
+    :return: array of records with 'offset' and 'flags' fields
+    :rtype: numpy.ndarray
+    """
+    return np.fromfile(file, dtype=PAGE_RECORD_DTYPE)
+
+
+def parse_page_records(buffer, record_dtype=PAGE_RECORD_DTYPE):
+    """Interprets raw output of pagemap tool as array of page records without copying it
 
-    :param args: arguments of a command to be executed
-    :param print_output: True is output has to be printed, False if not
-    :return: the console output for executed command
-    :rtype: byte
+    :param buffer: bytes written by pagemap tool
+    :param record_dtype: layout of records written by pagemap tool
+    :return: array of records with 'offset' and 'flags' fields
+    :rtype: numpy.ndarray
+    :raises ValueError: if buffer doesn't consist of whole records
     """
-    exec_str = ' '.join(args)
-    output = subprocess.check_output(exec_str, shell=True)
-    if print_output:
-        print(output.decode('UTF-8'))
-    return output
+    if len(buffer) % record_dtype.itemsize != 0:
+        raise ValueError(f'Page data of {len(buffer)} bytes is not a sequence of page records')
+    return np.frombuffer(buffer, dtype=record_dtype)
 
 
 def read_page_data(pid):
-    """Reads binary data for pages of a given pid and convert it to list of tuples.
-    One tuple is one page. Tuple is kind of (<Swap offset or page address>, <flag>, <flag>, ...)
+    """Reads binary data for pages of a given pid and packs it into snapshot.
+    One record is one page. Record is kind of (<Swap offset or page address>, <flags>)
 
     :param pid: pid
-    :return: list containing information about each page
-    :rtype: List
+    :return: snapshot containing information about each page
+    :rtype: PageSnapshot
     :raises EmptyDataError: if no data was stored for current pid
     """
-    # The number of bytes for offset (address) and flags in binary file
-    offset_size = 8
-    flags_size = 4
-    data = []
-    file = f'resources/data/binary_page_data/{pid}_page_data'
-    # Opens a file in byte reading mode
-    with open(file, 'rb') as f:
-        # Read the first 8 bytes as offset and next 4 bytes as flags
-        offset = f.read(offset_size)
-        flags = f.read(flags_size)
-        while offset and flags:
-            # Convert to uint64_t
-            offset = struct.unpack('Q', offset)[0]
-            # Convert to uint32_t
-            flags = struct.unpack('I', flags)[0]
-            data.append((offset,  # Swap offset or page address
-                         get_bit(flags, shift=26),  # return 1 if page present : 0 if swapped
-                         get_bit(flags, shift=4),  # return 1 if page dirty : 0 if clean
-                         get_bit(flags, shift=12)))  # return 1 if page anonymous : 0 if not
-            # Read address
-            offset = f.read(offset_size)
-            flags = f.read(flags_size)
-
-    # Throw exception if no data in list
-    if data:
-        return data
-    else:
+    records = load_page_records(f'resources/data/binary_page_data/{pid}_page_data')
+
+    # Throw exception if no data in file
+    if len(records) == 0:
         raise EmptyDataError
+    return PageSnapshot.from_page_records(records)
+
+
+def split_page_frames(buffer, record_dtype=PAGE_RECORD_DTYPE):
+    """Splits batch output of pagemap tool into records of each process.
+    Every frame of records is preceded by a header (pid, status, count, scan start, scan end), records of a process
+    may span several frames, all of them but the last one have FRAME_CONTINUED status
+
+    :param buffer: bytes written by pagemap tool in batch mode
+    :param record_dtype: layout of records written by pagemap tool
+    :return: frames - ordered dict with pid as key, and (status, records) as value, status is 0 or errno
+    of a failed scan, scan_times - dict with pid as key, and ScanTimes in seconds since the start of the tool's run
+    as value
+    :rtype: OrderedDict, Dict
+    """
+    frames = OrderedDict()
+    scan_times = {}
+    view = memoryview(buffer)
+    chunks = []
+    pos = 0
+    while pos + FRAME_HEADER_DTYPE.itemsize <= len(view):
+        header = np.frombuffer(view, dtype=FRAME_HEADER_DTYPE, count=1, offset=pos)[0]
+        pos += FRAME_HEADER_DTYPE.itemsize
+        records_end = pos + int(header['count']) * record_dtype.itemsize
+        if records_end > len(view):
+            break  # output was cut off, records of the last process are incomplete
+        chunks.append(parse_page_records(view[pos:records_end], record_dtype))
+        pos = records_end
+
+        status = int(header['status'])
+        if status != FRAME_CONTINUED:
+            # records of a single frame are kept in place, split ones are joined
+            frames[int(header['pid'])] = (status, chunks[0] if len(chunks) == 1 else np.concatenate(chunks))
+            scan_times[int(header['pid'])] = ScanTimes(int(header['scan_start']) / 1e9, int(header['scan_end']) / 1e9)
+            chunks = []
+    return frames, scan_times
 
 
 def adb_cgroups_list(device):
@@ -95,7 +134,7 @@ def adb_cgroups_list(device):
     :rtype: List
     """
     try:
-        raw_data = str(exec_command(f'adb -s {device}', 'shell', 'cat', '/proc/mounts'))
+        raw_data = str(get_client().shell(device, 'cat', '/proc/mounts'))
     except SubprocessError:
         raw_data = ''
     return list(map(lambda x: x + '/tasks', re.findall(r'(\S+) cgroup ', raw_data)))
@@ -112,63 +151,180 @@ def adb_collect_pid_list(device, tool, filename, pull_path, group_name):
     :return: list of processes like [[<pid>, <process full name>], [<pid>, <process full name>]...]
     :rtype: numpy.ndarray
     """
-    exec_command(f'adb -s {device}',
-                 'shell',
-                 f'/data/local/testing/{tool}',
-                 '/data/local/testing/',
-                 group_name)
+    get_client().shell(device,
+                       f'/data/local/testing/{tool}',
+                       '/data/local/testing/',
+                       group_name)
     # pull pid list from device
-    exec_command(f'adb -s {device}',
-                 'pull',
-                 f'/data/local/testing/{filename}.csv',
-                 f'./resources/data/{pull_path}',
-                 print_output=True)
+    get_client().pull(device,
+                      f'/data/local/testing/{filename}.csv',
+                      f'./resources/data/{pull_path}')
     return pd.read_csv(f'resources/data/{pull_path}/{filename}.csv', sep=',', header=None).values
 
 
-def adb_collect_page_data(device, pid_list):
-    """Collect information about memory pages
+def adb_collect_pid_list_diff(device, restart=False):
+    """Collects processes started and finished on device since the previous call
 
     :param device: target device's serial number
+    :param restart: True if all processes have to be listed, as if there was no previous call
+    :return: output of pid list tool in diff mode
+    :rtype: bytes
+    """
+    args = ['/data/local/testing/get_pid_list', '-d', PID_LIST_STATE]
+    return get_client().exec_out(device, *(args + ['-r'] if restart else args))
+
+
+def pagemap_command(pid_list=None, tasks_file=None, options=''):
+    """Makes command running pagemap tool in batch mode
+
     :param pid_list: list of processes to be examined
-    :return: page_data - info about all pages for each pid from pid_list, except error_pids,
-    present_data - info about all PRESENT pages for each pid from pid_list,
-    swapped_data - info about all SWAPPED pages for each pid from pid_list,
-    error_pids - list of pids, to which there was no access
-    :rtype: OrderedDict, OrderedDict, OrderedDict, List
+    :param tasks_file: path to cgroup tasks file on device, processes listed in it are examined instead of pid_list
+    :param options: options of pagemap tool preceding batch mode ones
+    :return: command for device's shell
+    :rtype: String
     """
-    page_data = OrderedDict()
-    swapped_data = OrderedDict()
-    present_data = OrderedDict()
-    error_pids = []
-    for pid in pid_list:
-        try:
-            filename = f'{pid}_page_data'
-            # collect raw data on device
-            exec_command(f'adb -s {device}',
-                         'shell',
-                         '/data/local/testing/pagemap',
-                         str(pid),
-                         '/data/local/testing',
-                         print_output=True)
-            # pull raw data
-            exec_command(f'adb -s {device}',
-                         'pull',
-                         f'/data/local/testing/{filename}',
-                         './resources/data/binary_page_data',
-                         print_output=True)
-            # create data from raw data
-            data = read_page_data(pid)
-        except (SubprocessError, EmptyDataError):
+    if tasks_file is None:
+        target = f'-b - {" ".join(map(str, pid_list))}'
+    else:
+        target = f'-t - {tasks_file}'
+    # messages of the tool are dropped, exec service would mix them with page records otherwise
+    return f'/data/local/testing/pagemap {options} {target} 2>/dev/null'
+
+
+def split_scan_output(output, pid_list, run_start, record_dtype=PAGE_RECORD_DTYPE):
+    """Splits output of pagemap tool into records of requested processes
+
+    :param output: bytes written by pagemap tool in batch mode
+    :param pid_list: list of requested processes
+    :param run_start: monotonic time when the tool's run was requested, times of scans are counted from it
+    :param record_dtype: layout of records written by pagemap tool
+    :return: frames - (status, records) for each examined pid,
+    missing_pids - list of pids, which the tool didn't reach, scan_times - ScanTimes of each examined pid
+    :rtype: OrderedDict, List, Dict
+    """
+    # pids are reported the way they were requested
+    requested_pids = {int(pid): pid for pid in pid_list}
+    frames, scan_times = split_page_frames(output, record_dtype)
+    frames = OrderedDict((requested_pids.get(frame_pid, frame_pid), frame) for frame_pid, frame in frames.items())
+    # device's clock isn't the one of PC, only durations measured by the tool are taken
+    scan_times = {requested_pids.get(frame_pid, frame_pid): ScanTimes(run_start + times.start, run_start + times.end)
+                  for frame_pid, times in scan_times.items()}
+    return frames, [pid for pid in pid_list if pid not in frames], scan_times
+
+
+async def scan_pids_concurrently(device, pid_list, options='', record_dtype=PAGE_RECORD_DTYPE, max_concurrency=4):
+    """Runs pagemap tool for each process separately, several runs at once, so scans of some processes
+    overlap with transfer of records of the others
+
+    :param device: target device's serial number
+    :param pid_list: list of processes to be examined
+    :param options: options of pagemap tool preceding batch mode ones
+    :param record_dtype: layout of records written by pagemap tool with given options
+    :param max_concurrency: max number of pagemap tool runs at once
+    :return: frames - (status, records) for each examined pid, missing_pids - list of pids, which the tool
+    didn't reach, scan_times - ScanTimes of each examined pid
+    :rtype: OrderedDict, List, Dict
+    :raises SubprocessError: if runs for all processes failed
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def scan(pid):
+        async with semaphore:
+            start = time.monotonic()  # waiting for semaphore isn't a part of latency
+            # client blocks on its connection, so each scan waits in a thread of its own
+            output = await asyncio.to_thread(get_client().exec_out, device, pagemap_command([pid], options=options))
+            return output, start
+
+    results = await asyncio.gather(*(scan(pid) for pid in pid_list), return_exceptions=True)
+    failures = [result for result in results if isinstance(result, BaseException)]
+    if failures and len(failures) == len(results):
+        raise failures[0]
+
+    frames, scan_times = OrderedDict(), {}
+    for pid, result in zip(pid_list, results):
+        if isinstance(result, BaseException):
+            continue  # pid is reported as missing
+        output, start = result
+        pid_frames, _, pid_scan_times = split_scan_output(output, [pid], start, record_dtype)
+        frames.update(pid_frames)
+        scan_times.update(pid_scan_times)
+    return frames, [pid for pid in pid_list if pid not in frames], scan_times
+
+
+def adb_scan_pages(device, pid_list=None, tasks_file=None, options='', record_dtype=PAGE_RECORD_DTYPE,
+                   max_concurrency=None):
+    """Runs pagemap tool in batch mode for several processes and splits its output
+
+    :param device: target device's serial number
+    :param pid_list: list of processes to be examined
+    :param tasks_file: path to cgroup tasks file on device, processes listed in it are examined instead of pid_list
+    :param options: options of pagemap tool preceding batch mode ones
+    :param record_dtype: layout of records written by pagemap tool with given options
+    :param max_concurrency: max number of pagemap tool runs at once, each process of pid_list is scanned
+    by a separate run if given, all processes are scanned by a single run if None
+    :return: frames - (status, records) for each examined pid, missing_pids - list of pids, which the tool
+    didn't reach, scan_times - ScanTimes of each examined pid
+    :rtype: OrderedDict, List, Dict
+    """
+    pid_list = list(pid_list) if tasks_file is None else []
+    if max_concurrency is not None and tasks_file is None:
+        return asyncio.run(scan_pids_concurrently(device, pid_list, options, record_dtype, max_concurrency))
+
+    start = time.monotonic()
+    output = get_client().exec_out(device, pagemap_command(pid_list, tasks_file, options))
+    return split_scan_output(output, pid_list, start, record_dtype)
+
+
+def adb_collect_page_data(device, pid_list=None, tasks_file=None, max_concurrency=None):
+    """Collect information about memory pages of several processes with a single run of pagemap tool,
+    or with several concurrent runs, one per process
+
+    :param device: target device's serial number
+    :param pid_list: list of processes to be examined
+    :param tasks_file: path to cgroup tasks file on device, processes listed in it are examined instead of pid_list
+    :param max_concurrency: max number of pagemap tool runs at once, None if all processes are scanned by one run
+    :return: page_data - snapshot of all pages for each examined pid, except error_pids,
+    error_pids - list of pids, to which there was no access, scan_times - ScanTimes of each examined pid,
+    page_vpns - sorted virtual page numbers of pages of each snapshot
+    :rtype: OrderedDict, List, Dict, Dict
+    """
+    # records are prefixed with virtual page numbers, so snapshots of iterations can be matched page by page
+    frames, error_pids, scan_times = adb_scan_pages(device, pid_list, tasks_file, '-v', DELTA_RECORD_DTYPE,
+                                                    max_concurrency)
+    page_data, page_vpns = OrderedDict(), {}
+    for pid, (status, records) in frames.items():
+        if status == 0 and len(records) > 0:
+            page_vpns[pid], page_data[pid] = apply_page_delta(None, records)
+        else:
             error_pids.append(pid)
-            continue
+    return page_data, error_pids, scan_times, page_vpns
 
-        p_data = list(filter(lambda el: el[1] == 1, data))
-        s_data = list(filter(lambda el: el[1] == 0, data))
-        page_data[pid] = pd.DataFrame(np.array(data))
-        present_data[pid] = pd.DataFrame(np.array(p_data))
-        swapped_data[pid] = pd.DataFrame(np.array(s_data))
-    return page_data, present_data, swapped_data, error_pids
+
+def adb_collect_page_deltas(device, pid_list=None, tasks_file=None, restart=False, max_concurrency=None):
+    """Collect pages changed since the previous scan of several processes with a single run of pagemap tool,
+    or with several concurrent runs, one per process. Pages written since the previous scan are found
+    by soft-dirty bit, state of the previous scan of each process is kept on device
+
+    :param device: target device's serial number
+    :param pid_list: list of processes to be examined
+    :param tasks_file: path to cgroup tasks file on device, processes listed in it are examined instead of pid_list
+    :param restart: True if previous scans have to be forgotten and all pages reported, False if not
+    :param max_concurrency: max number of pagemap tool runs at once, None if all processes are scanned by one run
+    :return: deltas - (is_delta, records) for each examined pid, except error_pids, is_delta is False
+    if all pages of a process are reported, error_pids - list of pids, to which there was no access,
+    scan_times - ScanTimes of each examined pid
+    :rtype: OrderedDict, List, Dict
+    """
+    options = f'{"-I" if restart else "-i"} /data/local/testing'
+    frames, error_pids, scan_times = adb_scan_pages(device, pid_list, tasks_file, options, DELTA_RECORD_DTYPE,
+                                                    max_concurrency)
+    deltas = OrderedDict()
+    for pid, (status, records) in frames.items():
+        if status in (0, FRAME_DELTA):
+            deltas[pid] = (status == FRAME_DELTA, records)
+        else:
+            error_pids.append(pid)
+    return deltas, error_pids, scan_times
 
 
 class DeviceInteraction:
@@ -176,10 +332,14 @@ class DeviceInteraction:
     Class for interaction with Android device and collection of device's running processes' pagedata
 
     :ivar __device: serial number of connected Android device
-    :ivar __page_data: processes' memory pagedata
-    :ivar __present_page_data: processes' present memory pagedata
-    :ivar __swapped_page_data: processes' swapped memory pagedata
+    :ivar __page_data: processes' memory pagedata, snapshot per pid per iteration, unchanged and slightly
+    changed snapshots are stored as the ones of the previous iteration and the changes against them
+    :ivar __timestamps: dict with iteration as key, and IterationTimes of its scans as value
+    :ivar __delta_bases: (vpns, snapshot) of the last incremental scan for each pid, deltas of the next one apply to it
+    :ivar __restart_scan: flag indicating if incremental scans on device have to start over
     :ivar __error_pids: list of pids, for which data couldn't be collected
+    :ivar __processes: cache of all running processes on connected device, updated by their changes
+    :ivar __restart_pid_list: flag indicating if the next pid list has to be collected in full
     :ivar __pid_list_all: list of all running processes' pids on connected device
     :ivar __pid_list_cgroup: list of processes' pids  in chosen cgroup, running on connected device
     :ivar __cgroups_list: list of connected device's available cgroups
@@ -187,15 +347,27 @@ class DeviceInteraction:
     """
     def __init__(self):
         self.__device = None
-        self.__page_data = {}
-        self.__present_page_data = {}
-        self.__swapped_page_data = {}
+        self.__page_data = SnapshotStore()
+        self.__timestamps = {}
+        self.__delta_bases = {}
+        self.__restart_scan = False
         self.__error_pids = []
+        self.__processes = ProcessList()
+        self.__restart_pid_list = True
         self.__pid_list_all = []
         self.__pid_list_cgroup = []
         self.__cgroups_list = []
         self.__iterations = None
 
+    @property
+    def device(self):
+        """Serial number of device data is collected from
+
+        :getter: returns serial number
+        :type: String
+        """
+        return self.__device
+
     @property
     def pid_list_all(self):
         """List of all running processes' pids
@@ -224,21 +396,46 @@ class DeviceInteraction:
         return self.__cgroups_list
 
     def get_page_data(self, iteration=None, present=False, swapped=False):
-        """Returns processes' memory pagedata
+        """Returns processes' memory pagedata, present and swapped pages are returned as views
+        sharing records with the whole pagedata
 
         :param iteration: number of collecting iteration
         :param present: True if only present pages are required, False if not
         :param swapped: True if only swapped pages are required, False if not
 
-        :return: returns processes' memory pagedata
+        :return: returns processes' memory pagedata as snapshot for each pid, for each iteration if none is given
+        (every stored iteration is materialized then, prefer requesting iterations one by one)
         :rtype: Dict
         """
-        if not present and not swapped:
-            return self.__page_data if iteration is None else self.__page_data.get(iteration)
-        elif present:
-            return self.__present_page_data if iteration is None else self.__present_page_data.get(iteration)
-        else:
-            return self.__swapped_page_data if iteration is None else self.__swapped_page_data.get(iteration)
+        if iteration is None:
+            return {i: self.get_page_data(i, present, swapped) for i in self.__page_data}
+
+        page_data = self.__page_data.get(iteration)
+        if page_data is None or (not present and not swapped):
+            return page_data
+        return OrderedDict((pid, snapshot.present if present else snapshot.swapped)
+                           for pid, snapshot in page_data.items())
+
+    def get_timestamps(self, iteration):
+        """Returns monotonic times when pages of an iteration were scanned
+
+        :param iteration: number of collecting iteration
+        :return: scan times of the iteration and of each pid, None if iteration wasn't collected
+        :rtype: IterationTimes
+        """
+        return self.__timestamps.get(iteration)
+
+    def get_elapsed_time(self, iteration):
+        """Returns time passed since collecting started till scan of an iteration started
+
+        :param iteration: number of collecting iteration
+        :return: seconds since the start of the first iteration, None if iteration wasn't collected
+        :rtype: Float
+        """
+        first, current = self.__timestamps.get(0), self.__timestamps.get(iteration)
+        if first is None or current is None:
+            return None
+        return current.start - first.start
 
     @property
     def iterations(self):
@@ -255,30 +452,48 @@ class DeviceInteraction:
         :param device: device's serial number
         :return: None
         """
+        if device != self.__device:
+            self.__reset_pid_list()
         self.__device = device
 
+    def __reset_pid_list(self):
+        """Drops cached processes, so the next pid list is collected in full"""
+        self.__processes.clear()
+        self.__restart_pid_list = True
+        self.__pid_list_all = []
+
     def clear(self):
         """Removes collected data
 
         :return: None
         """
         self.__pid_list_cgroup = []
-        self.__pid_list_all = []
+        self.__reset_pid_list()
         self.__cgroups_list = []
         self.__error_pids = []
 
     def set_iterations(self, iterations):
-        """Sets total amount of iterations and initializes page_data structures
+        """Sets total amount of iterations and drops pagedata of iterations beyond it
 
         :param iterations: amount to be set
         :return: None
         """
         self.__iterations = iterations
+        self.__page_data.truncate(iterations)
+        self.__timestamps = {i: times for i, times in self.__timestamps.items() if i < iterations}
+
+    def match_pids(self, titles):
+        """Finds processes by their names in list of all processes, so the same processes
+        can be examined on several devices
 
-        for i in range(self.__iterations):
-            self.__page_data.setdefault(i, OrderedDict())
-            self.__present_page_data.setdefault(i, OrderedDict())
-            self.__swapped_page_data.setdefault(i, OrderedDict())
+        :param titles: list of processes' full names
+        :return: list of pids for each name, the lowest pid of processes sharing a name, None if there is no process
+        :rtype: List
+        """
+        pids = {}
+        for pid, title in sorted(self.__pid_list_all, key=lambda process: process[0]):
+            pids.setdefault(title, pid)
+        return [pids.get(title) for title in titles]
 
     def collect_cgroups_list(self):
         """Collects list of available cgroups from a device
@@ -288,20 +503,28 @@ class DeviceInteraction:
         self.__cgroups_list = adb_cgroups_list(self.__device)
 
     def collect_pid_list_all(self):
-        """Collects list of all processes running on a device
+        """Collects list of all processes running on a device, only processes started and finished
+        since the previous call are transferred
 
-        :return: None
+        :return: processes added to and removed from the list
+        :rtype: ProcessListDiff
+        :raises SubprocessError: if pid list tool can't be run
+        :raises EmptyDataError: if pid list is unavailable
         """
         try:
-            pid_list_all = adb_collect_pid_list(self.__device,
-                                                tool='get_pid_list',
-                                                filename='pid_list',
-                                                pull_path='pids_data',
-                                                group_name='')
-            self.__pid_list_all = pid_list_all.tolist()
-        except (SubprocessError, EmptyDataError):
-            self.__pid_list_all = []
+            diff = self.__processes.apply(adb_collect_pid_list_diff(self.__device, self.__restart_pid_list))
+        except SubprocessError:
+            self.__reset_pid_list()
             raise
+        except ValueError as ex:
+            self.__reset_pid_list()
+            raise EmptyDataError(str(ex)) from ex
+
+        self.__restart_pid_list = False
+        self.__pid_list_all = self.__processes.rows
+        if not self.__pid_list_all:
+            raise EmptyDataError('No processes are listed')
+        return diff
 
     def collect_pid_list_cgroup(self, group=''):
         """Collects list of all processes in a given cgroup running on a device
@@ -320,16 +543,97 @@ class DeviceInteraction:
             self.__pid_list_cgroup = []
             raise
 
-    def collect_page_data(self, cur_iteration, pid_list):
+    def get_latencies(self, iteration):
+        """Returns time taken by scans of each pid at an iteration
+
+        :param iteration: number of collecting iteration
+        :return: dict with pid as key, and scan time in seconds as value, None if iteration wasn't collected
+        :rtype: Dict
+        """
+        times = self.__timestamps.get(iteration)
+        if times is None:
+            return None
+        return {pid: scan.end - scan.start for pid, scan in times.pids.items()}
+
+    def collect_page_data(self, cur_iteration, pid_list=None, tasks_file=None, incremental=False,
+                          max_concurrency=None):
         """Collects information about memory pages
 
         :param cur_iteration: current iteration of collecting
         :param pid_list: list of pids to collect data from
+        :param tasks_file: path to cgroup tasks file on device, pids listed in it are used instead of pid_list
+        :param incremental: True if only pages changed since the previous iteration have to be transferred,
+        False if all pages
+        :param max_concurrency: max number of pids scanned at once by separate runs of pagemap tool,
+        None if all pids are scanned by a single run
         :return: list of pids, for which data couldn't be collected
         :rtype: List
         """
-        page_data, present_data, swapped_data, error_pids = adb_collect_page_data(self.__device, pid_list)
-        self.__page_data[cur_iteration] = page_data
-        self.__present_page_data[cur_iteration] = present_data
-        self.__swapped_page_data[cur_iteration] = swapped_data
+        start = time.monotonic()
+        if incremental:
+            page_data, error_pids, scan_times = self.__collect_page_deltas(cur_iteration, pid_list, tasks_file,
+                                                                           max_concurrency)
+            page_vpns = {pid: self.__delta_bases[pid][0] for pid in page_data}
+        else:
+            page_data, error_pids, scan_times, page_vpns = adb_collect_page_data(self.__device, pid_list, tasks_file,
+                                                                                 max_concurrency)
+            self.__delta_bases = {}
+        end = time.monotonic()
+
+        self.__timestamps[cur_iteration] = IterationTimes(start=start, end=end,
+                                                          pids={pid: scan_times[pid] for pid in page_data})
+        self.__page_data.put(cur_iteration, page_data, page_vpns)
+        self.__error_pids = error_pids
         return error_pids
+
+    def skip_iteration(self, cur_iteration, pid_list=None):
+        """Stores iteration without pagedata, when device couldn't be examined, incremental scans start over then
+
+        :param cur_iteration: current iteration of collecting
+        :param pid_list: list of pids data was to be collected from
+        :return: list of pids, for which data couldn't be collected
+        :rtype: List
+        """
+        now = time.monotonic()
+        self.__timestamps[cur_iteration] = IterationTimes(start=now, end=now, pids={})
+        self.__page_data.put(cur_iteration, OrderedDict())
+        # device may have kept scans which weren't received
+        self.__delta_bases = {}
+        self.__restart_scan = True
+        self.__error_pids = list(pid_list or [])
+        return self.__error_pids
+
+    def __collect_page_deltas(self, cur_iteration, pid_list, tasks_file, max_concurrency=None):
+        """Collects pages changed since the previous iteration and applies them to pagedata of the previous iteration
+
+        :param cur_iteration: current iteration of collecting
+        :param pid_list: list of pids to collect data from
+        :param tasks_file: path to cgroup tasks file on device, pids listed in it are used instead of pid_list
+        :param max_concurrency: max number of pids scanned at once, None if all pids are scanned by a single run
+        :return: page_data - snapshot of all pages for each pid, error_pids - list of pids, for which
+        data couldn't be collected, scan_times - ScanTimes of each scanned pid
+        :rtype: OrderedDict, List, Dict
+        """
+        # scans kept on device have to match the ones kept here, a pid without a previous scan on device
+        # is scanned in full anyway, so pids which failed don't make other pids start over
+        restart = cur_iteration == 0 or self.__restart_scan
+        deltas, error_pids, scan_times = adb_collect_page_deltas(self.__device, pid_list, tasks_file, restart,
+                                                                 max_concurrency)
+
+        self.__restart_scan = False
+        delta_bases = {}
+        page_data = OrderedDict()
+        for pid, (is_delta, records) in deltas.items():
+            base = self.__delta_bases.get(pid)
+            if is_delta and base is None:
+                # device reported changes since a scan which wasn't received
+                error_pids.append(pid)
+                self.__restart_scan = True
+                continue
+            delta_bases[pid] = apply_page_delta(base if is_delta else None, records)
+            if len(delta_bases[pid][1]) > 0:
+                page_data[pid] = delta_bases[pid][1]
+            else:
+                error_pids.append(pid)
+        self.__delta_bases = delta_bases
+        return page_data, error_pids, scan_times
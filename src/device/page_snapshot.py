@@ -0,0 +1,202 @@
+"""Contains PageSnapshot class - compact storage of pagedata collected for one process at one iteration
+
+Pagemap tool writes 12-byte records (8 bytes of swap offset or page frame number and 4 bytes of flags).
+PageSnapshot keeps them packed into 9 bytes per page: the offset and a single byte of bit flags.
+Present and swapped parts of a snapshot are views sharing the records of the whole snapshot.
+
+Usage example:
+    snapshot = PageSnapshot.from_page_records(load_page_records(file))
+    present_pages_count = len(snapshot.present)
+    dirty_swapped_offsets = snapshot.swapped.offsets[snapshot.swapped.is_dirty]
+"""
+
+import numpy as np
+
+# Layout of a single page record written by pagemap tool, see data_tool/page_tool.h
+PAGE_RECORD_DTYPE = np.dtype([('offset', '<u8'), ('flags', '<u4')])
+
+# Header preceding records of every process in batch output of pagemap tool, see FrameHeader in data_tool/page_tool.h
+# scan of the process started and the frame was written at given nanoseconds since the start of the tool's run
+FRAME_HEADER_DTYPE = np.dtype([('pid', '<i4'), ('status', '<i4'), ('count', '<u8'),
+                               ('scan_start', '<u8'), ('scan_end', '<u8')])
+
+# Status of a frame followed by another frame of the same process
+FRAME_CONTINUED = -1
+
+# Status of an incremental scan reporting pages changed since the previous scan
+FRAME_DELTA = -2
+
+# Layout of a page record written by incremental scan, record is prefixed with virtual page number
+DELTA_RECORD_DTYPE = np.dtype([('vpn', '<u8'), ('offset', '<u8'), ('flags', '<u4')])
+
+# Bit offsets of custom flags inside of a page record
+DIRTY_SHIFT = 4
+ANON_SHIFT = 12
+PRESENT_SHIFT = 26
+REMOVED_SHIFT = 31  # set by incremental scan if page is no longer mapped
+
+# Layout of a single page stored in PageSnapshot
+SNAPSHOT_DTYPE = np.dtype([('offset', '<u8'), ('flags', 'u1')])
+
+
+class PageSnapshot:
+    """Pagedata of one process, one page per record
+
+    :cvar PRESENT: bit of a flags byte set if page is present, unset if swapped
+    :cvar DIRTY: bit of a flags byte set if page is dirty
+    :cvar ANON: bit of a flags byte set if page is anonymous
+    :ivar __records: packed array of (offset, flags) records shared by snapshot and its views
+    :ivar __selector: (bit, value) pair selecting pages of a view, None if snapshot contains all pages
+    """
+    PRESENT = 1
+    DIRTY = 2
+    ANON = 4
+
+    def __init__(self, records=None, selector=None):
+        self.__records = np.empty(0, dtype=SNAPSHOT_DTYPE) if records is None else records
+        self.__selector = selector
+
+    @classmethod
+    def from_page_records(cls, records):
+        """Creates snapshot from records written by pagemap tool
+
+        :param records: array of PAGE_RECORD_DTYPE records
+        :return: snapshot containing all given pages
+        :rtype: PageSnapshot
+        """
+        flags = records['flags']
+        packed = np.empty(len(records), dtype=SNAPSHOT_DTYPE)
+        packed['offset'] = records['offset']
+        packed['flags'] = ((flags >> PRESENT_SHIFT) & 1) * cls.PRESENT | \
+                          ((flags >> DIRTY_SHIFT) & 1) * cls.DIRTY | \
+                          ((flags >> ANON_SHIFT) & 1) * cls.ANON
+        return cls(packed)
+
+    @property
+    def records(self):
+        """Packed records of the whole snapshot, views share them with the snapshot they were taken from
+
+        :getter: returns array of SNAPSHOT_DTYPE records
+        :type: numpy.ndarray
+        """
+        return self.__records
+
+    @property
+    def mask(self):
+        """Boolean mask of records belonging to this view
+
+        :getter: returns mask over records, None if all records belong to snapshot
+        :type: numpy.ndarray
+        """
+        if self.__selector is None:
+            return None
+        bit, value = self.__selector
+        return (self.__records['flags'] & bit).astype(bool) == value
+
+    @property
+    def present(self):
+        """View of present pages
+
+        :getter: returns snapshot view containing present pages only
+        :type: PageSnapshot
+        """
+        return PageSnapshot(self.__records, (self.PRESENT, True))
+
+    @property
+    def swapped(self):
+        """View of swapped pages
+
+        :getter: returns snapshot view containing swapped pages only
+        :type: PageSnapshot
+        """
+        return PageSnapshot(self.__records, (self.PRESENT, False))
+
+    def __column(self, name):
+        mask = self.mask
+        return self.__records[name] if mask is None else self.__records[name][mask]
+
+    @property
+    def offsets(self):
+        """Swap offsets of swapped pages and page frame numbers of present pages
+
+        :getter: returns array of offsets
+        :type: numpy.ndarray
+        """
+        return self.__column('offset')
+
+    @property
+    def flags(self):
+        """Flags of pages, combination of PRESENT, DIRTY and ANON bits
+
+        :getter: returns array of flags bytes
+        :type: numpy.ndarray
+        """
+        return self.__column('flags')
+
+    @property
+    def is_present(self):
+        """Shows if pages are present
+
+        :getter: returns boolean array, True for present pages
+        :type: numpy.ndarray
+        """
+        return (self.flags & self.PRESENT).astype(bool)
+
+    @property
+    def is_dirty(self):
+        """Shows if pages are dirty
+
+        :getter: returns boolean array, True for dirty pages
+        :type: numpy.ndarray
+        """
+        return (self.flags & self.DIRTY).astype(bool)
+
+    @property
+    def is_anon(self):
+        """Shows if pages are anonymous
+
+        :getter: returns boolean array, True for anonymous pages
+        :type: numpy.ndarray
+        """
+        return (self.flags & self.ANON).astype(bool)
+
+    @property
+    def nbytes(self):
+        """Memory taken by the snapshot
+
+        :getter: returns size of records of the whole snapshot in bytes
+        :type: Int
+        """
+        return self.__records.nbytes
+
+    def __len__(self):
+        mask = self.mask
+        return len(self.__records) if mask is None else int(np.count_nonzero(mask))
+
+
+def apply_page_delta(base, delta):
+    """Rebuilds full pagedata of a process from pagedata of its previous scan and changes reported by incremental scan
+
+    :param base: pair (vpns, snapshot) of the previous scan, sorted by virtual page number, None if there is no one
+    :param delta: array of DELTA_RECORD_DTYPE records, changed pages and removed ones (REMOVED_SHIFT flag set)
+    :return: pair (vpns, snapshot) of the current scan, sorted by virtual page number
+    :rtype: Tuple
+    """
+    is_removed = ((delta['flags'] >> REMOVED_SHIFT) & 1).astype(bool)
+    changed = delta[~is_removed]
+    changed_records = PageSnapshot.from_page_records(changed).records
+    if base is None:
+        order = np.argsort(changed['vpn'], kind='stable')
+        return changed['vpn'][order], PageSnapshot(changed_records[order])
+
+    vpns, snapshot = base
+    # both removed and changed pages of the previous scan are replaced
+    delta_vpns = np.sort(delta['vpn'])
+    pos = np.searchsorted(delta_vpns, vpns)
+    is_kept = delta_vpns[np.minimum(pos, len(delta_vpns) - 1)] != vpns if len(delta_vpns) > 0 \
+        else np.ones(len(vpns), dtype=bool)
+
+    new_vpns = np.concatenate((vpns[is_kept], changed['vpn']))
+    new_records = np.concatenate((snapshot.records[is_kept], changed_records))
+    order = np.argsort(new_vpns, kind='stable')
+    return new_vpns[order], PageSnapshot(new_records[order])
@@ -0,0 +1,92 @@
+"""Contains ProcessList class - cache of processes running on a device, kept up to date by changes
+
+Pid list tool run in diff mode prints only processes started and finished since its previous run,
+one line per process: "+<pid>,<start time>,<name>" or "-<pid>,<start time>". Processes are told
+apart by pid together with start time, so a pid reused by a new process is seen as a change.
+Process which changed its name, like an app forked from zygote, is printed as "~<pid>,<start time>,<name>".
+Output starting with "=" line lists all processes, cache is brought in line with it then.
+
+Usage example:
+    processes = ProcessList()
+    diff = processes.apply(b'=\\n+1,5,init\\n+2,5,kthreadd\\n')
+    diff = processes.apply(b'-2,5\\n~1,5,/sbin/init\\n')
+    pid_list = processes.rows
+"""
+
+from collections import namedtuple
+
+# Processes added to, removed from and renamed in list, as lists of [<pid>, <process full name>],
+# renamed ones are given with their new names
+ProcessListDiff = namedtuple('ProcessListDiff', ['added', 'removed', 'renamed'])
+
+
+class ProcessList:
+    """Processes of a device keyed by (pid, start time)
+
+    :ivar __processes: dict with (pid, start time) as key, and process full name as value
+    :ivar __rows: list of [<pid>, <process full name>] sorted by pid, None if it has to be rebuilt
+    """
+    def __init__(self):
+        self.__processes = {}
+        self.__rows = []
+
+    @property
+    def rows(self):
+        """List of processes sorted by pid
+
+        :getter: returns list of processes like [[<pid>, <process full name>], [<pid>, <process full name>]...]
+        :type: List
+        """
+        if self.__rows is None:
+            self.__rows = [[pid, name] for (pid, _), name in sorted(self.__processes.items())]
+        return self.__rows
+
+    def clear(self):
+        """Removes all processes
+
+        :return: None
+        """
+        self.__processes = {}
+        self.__rows = []
+
+    def apply(self, output):
+        """Applies changes printed by pid list tool
+
+        :param output: output of pid list tool in diff mode
+        :return: processes added to, removed from and renamed in list
+        :rtype: ProcessListDiff
+        :raises ValueError: if output can't be parsed, list is left unchanged then
+        """
+        processes = dict(self.__processes)
+        added, removed, renamed = [], [], []
+        stale = set()
+        for line in output.decode('UTF-8', errors='replace').splitlines():
+            if not line:
+                continue
+            if line == '=':
+                # full listing, processes which aren't in it have finished
+                stale = set(processes)
+                continue
+            fields = line[1:].split(',', 2)
+            if (line[0], len(fields)) not in (('+', 3), ('-', 2), ('~', 3)):
+                raise ValueError(f'Unexpected line of pid list: {line}')
+            key = (int(fields[0]), int(fields[1]))
+            if line[0] == '-':
+                stale.discard(key)
+                if key in processes:
+                    removed.append([key[0], processes.pop(key)])
+            elif key in processes:
+                stale.discard(key)
+                if processes[key] != fields[2]:
+                    processes[key] = fields[2]
+                    renamed.append([key[0], fields[2]])
+            elif line[0] == '+':
+                processes[key] = fields[2]
+                added.append([key[0], fields[2]])
+
+        for key in stale:
+            removed.append([key[0], processes.pop(key)])
+        if added or removed or renamed:
+            self.__processes = processes
+            self.__rows = None
+        return ProcessListDiff(added, removed, renamed)
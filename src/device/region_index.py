@@ -0,0 +1,141 @@
+"""Contains RegionIndex class - index of contiguous regions of pages owned by inspected processes
+
+Pages of every process are sorted by offset (page frame number or swap offset) and split into runs
+of consecutive offsets. Runs of all processes are stored as parallel arrays sorted by start offset,
+so regions intersecting a range of offsets are found with binary search.
+
+Usage example:
+    regions = RegionIndex.from_page_data(page_data)
+    pids_owning_page = regions.lookup(pfn)
+    counts = regions.count_in_blocks(PAGES_IN_BLOCK, blocks_count)
+"""
+
+import numpy as np
+
+
+class RegionIndex:
+    """Regions (start_offset, end_offset, pid) of pages, end offset is exclusive
+
+    :ivar __starts: first offsets of regions, sorted ascending
+    :ivar __ends: offsets following last pages of regions
+    :ivar __slots: positions of regions' processes in the list of pids
+    :ivar __pids: list of pids, in order processes were given
+    :ivar __max_ends: running maximum of ends, no region before position i ends after max_ends[i]
+    """
+    def __init__(self, starts, ends, slots, pids):
+        order = np.argsort(starts, kind='stable')
+        self.__starts = starts[order]
+        self.__ends = ends[order]
+        self.__slots = slots[order]
+        self.__pids = list(pids)
+        self.__max_ends = np.maximum.accumulate(self.__ends) if len(self.__ends) > 0 else self.__ends
+
+    @classmethod
+    def from_page_data(cls, page_data, pids=None):
+        """Creates index of regions of processes' pages
+
+        :param page_data: snapshot of pages for each inspected process
+        :param pids: list of pids defining positions of processes, pids of page_data in its order if none is given,
+        processes not listed are skipped
+        :return: index of regions of all given processes
+        :rtype: RegionIndex
+        """
+        pids = list(page_data.keys()) if pids is None else list(pids)
+        starts, ends, slots = [], [], []
+        for slot, pid in enumerate(pids):
+            data = page_data.get(pid)
+            if data is None:
+                continue
+            offsets = np.unique(data.offsets).astype(np.int64)  # sorted, shared pages counted once
+            if len(offsets) == 0:
+                continue
+            breaks = np.flatnonzero(np.diff(offsets) != 1) + 1
+            starts.append(offsets[np.concatenate(([0], breaks))])
+            ends.append(offsets[np.concatenate((breaks - 1, [len(offsets) - 1]))] + 1)
+            slots.append(np.full(len(breaks) + 1, slot))
+
+        if not starts:
+            empty = np.empty(0, dtype=np.int64)
+            return cls(empty, empty, empty, pids)
+        return cls(np.concatenate(starts), np.concatenate(ends), np.concatenate(slots), pids)
+
+    @property
+    def starts(self):
+        """First offsets of regions
+
+        :getter: returns array of offsets sorted ascending
+        :type: numpy.ndarray
+        """
+        return self.__starts
+
+    @property
+    def ends(self):
+        """Offsets following last pages of regions
+
+        :getter: returns array of offsets
+        :type: numpy.ndarray
+        """
+        return self.__ends
+
+    @property
+    def slots(self):
+        """Positions of regions' processes in the list of pids
+
+        :getter: returns array of positions
+        :type: numpy.ndarray
+        """
+        return self.__slots
+
+    @property
+    def pids(self):
+        """Pids of indexed processes
+
+        :getter: returns list of pids, in order processes were given
+        :type: List
+        """
+        return self.__pids
+
+    def overlapping(self, begin, end):
+        """Finds regions intersecting a range of offsets
+
+        :param begin: first offset of a range
+        :param end: offset following the last one of a range
+        :return: positions of regions in starts, ends and slots arrays
+        :rtype: numpy.ndarray
+        """
+        # regions starting before the end of a range, skipping the ones all of which ended before its beginning
+        last = np.searchsorted(self.__starts, end, side='left')
+        first = np.searchsorted(self.__max_ends[:last], begin, side='right')
+        candidates = np.arange(first, last)
+        return candidates[self.__ends[first:last] > begin]
+
+    def lookup(self, offset):
+        """Finds processes owning a page
+
+        :param offset: page frame number or swap offset of a page
+        :return: list of pids having the page mapped
+        :rtype: List
+        """
+        return [self.__pids[slot] for slot in self.__slots[self.overlapping(offset, offset + 1)]]
+
+    def count_in_blocks(self, block_size, blocks_count, start=0):
+        """Counts regions of each process intersecting each block of offsets
+
+        :param block_size: number of offsets in a block
+        :param blocks_count: number of blocks
+        :param start: offset the first block starts with
+        :return: 2d array of numbers of regions, row per process, column per block
+        :rtype: numpy.ndarray
+        """
+        # every region adds one to each block from the first to the last one it intersects,
+        # counted by difference array per process: +1 at the first block, -1 past the last one
+        first_blocks = np.clip((self.__starts - start) // block_size, 0, blocks_count)
+        end_blocks = np.clip((self.__ends - start - 1) // block_size + 1, 0, blocks_count)
+        row_len = blocks_count + 1
+        size = len(self.__pids) * row_len
+        diff = np.bincount(self.__slots * row_len + first_blocks, minlength=size) - \
+            np.bincount(self.__slots * row_len + end_blocks, minlength=size)
+        return np.cumsum(diff.reshape(len(self.__pids), row_len), axis=1)[:, :blocks_count]
+
+    def __len__(self):
+        return len(self.__starts)
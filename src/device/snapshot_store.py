@@ -0,0 +1,232 @@
+"""Contains SnapshotStore class - storage of processes' pagedata collected at every iteration
+
+Consecutive snapshots of a process are usually identical or nearly so. Each snapshot is stored
+either as the entry of the previous iteration (shared, no copy is made), as sparse changes against
+the previous iteration, or in full. Changes are found by virtual page numbers of pages if they are known
+(pagemap tool reports them), by positions of pages otherwise, so pages mapped or unmapped in between don't make
+the following pages count as changed. Snapshots stored as changes are materialized lazily on access.
+Store may be accessed from several threads, frames of iterations are rendered in background.
+
+Usage example:
+    store = SnapshotStore()
+    store.put(0, {pid: snapshot})
+    store.put(1, {pid: next_snapshot}, {pid: next_vpns})
+    next_snapshot = store.get(1)[pid]
+"""
+
+from collections import OrderedDict
+from threading import Lock
+
+import numpy as np
+
+from src.device.page_snapshot import PageSnapshot
+
+
+def is_in_sorted(keys, other_keys):
+    """Checks which of sorted keys are among other sorted keys
+
+    :return: boolean array, True for keys found among other keys
+    :rtype: numpy.ndarray
+    """
+    if len(other_keys) == 0:
+        return np.zeros(len(keys), dtype=bool)
+    pos = np.minimum(np.searchsorted(other_keys, keys), len(other_keys) - 1)
+    return other_keys[pos] == keys
+
+
+class SnapshotDelta:
+    """Sparse changes of a process' snapshot against its snapshot of another iteration
+
+    :ivar base_iteration: iteration of a snapshot the changes apply to
+    :ivar positions: positions of changed records in the base snapshot
+    :ivar records: new values of changed records
+    :ivar removed: positions of removed records in the base snapshot
+    :ivar inserted: positions of inserted records among records left after removal, as taken by numpy.insert
+    :ivar inserted_records: values of inserted records
+    :ivar chain_length: number of deltas to be applied to materialize snapshot
+    """
+    def __init__(self, base_iteration, positions, records, removed, inserted, inserted_records, chain_length):
+        self.base_iteration = base_iteration
+        self.positions = positions
+        self.records = records
+        self.removed = removed
+        self.inserted = inserted
+        self.inserted_records = inserted_records
+        self.chain_length = chain_length
+
+    def __len__(self):
+        return len(self.positions) + len(self.removed) + len(self.inserted)
+
+    def apply(self, records):
+        """Applies the changes to records of the base snapshot
+
+        :param records: array of SNAPSHOT_DTYPE records of the base snapshot
+        :return: new array of records of the changed snapshot
+        :rtype: numpy.ndarray
+        """
+        records = records.copy()
+        records[self.positions] = self.records
+        if len(self.removed) > 0:
+            records = np.delete(records, self.removed)
+        if len(self.inserted) > 0:
+            records = np.insert(records, self.inserted.astype(np.intp), self.inserted_records)
+        return records
+
+    @property
+    def nbytes(self):
+        """Memory taken by the changes
+
+        :getter: returns size of positions and records in bytes
+        :type: Int
+        """
+        return self.positions.nbytes + self.records.nbytes + self.removed.nbytes + self.inserted.nbytes + \
+            self.inserted_records.nbytes
+
+
+class SnapshotStore:
+    """Storage of pagedata of all iterations, memory it takes grows with pages' churn rather than with time
+
+    :ivar __entries: PageSnapshot or SnapshotDelta for each pid for each iteration
+    :ivar __latest: (iteration, snapshot, vpns) of the latest iteration for each pid, the next one is compared
+    with it, vpns are None if virtual page numbers of pages aren't known
+    :ivar __cache: recently materialized snapshots for SnapshotDelta entries of each pid, least recently used first,
+    every pid keeps its own ones, so getting an iteration of many pids doesn't evict snapshots it needs next
+    :ivar __max_changed_ratio: max ratio of changed records for snapshot to be stored as changes
+    :ivar __max_chain_length: max number of deltas applied to materialize snapshot, full one is stored then
+    :ivar __cache_depth: max number of materialized snapshots kept in cache for each pid
+    :ivar __lock: lock guarding entries and cache
+    """
+    def __init__(self, max_changed_ratio=0.25, max_chain_length=16, cache_depth=4):
+        self.__entries = {}
+        self.__latest = {}
+        self.__cache = {}
+        self.__max_changed_ratio = max_changed_ratio
+        self.__max_chain_length = max_chain_length
+        self.__cache_depth = cache_depth
+        self.__lock = Lock()
+
+    def put(self, iteration, page_data, page_vpns=None):
+        """Stores pagedata of an iteration encoding it against the previous iteration
+
+        :param iteration: number of collecting iteration
+        :param page_data: ordered dict with pid as key, and PageSnapshot as value
+        :param page_vpns: dict with pid as key, and sorted virtual page numbers of snapshot's pages as value,
+        pages of snapshots missing in it are matched by their positions
+        :return: None
+        """
+        page_vpns = page_vpns or {}
+        with self.__lock:
+            entries = OrderedDict()
+            for pid, snapshot in page_data.items():
+                entries[pid] = self.__encode(iteration, pid, snapshot, page_vpns.get(pid))
+            self.__entries[iteration] = entries
+            self.__latest = {pid: (iteration, snapshot, page_vpns.get(pid)) for pid, snapshot in page_data.items()}
+
+    def get(self, iteration):
+        """Returns pagedata of an iteration, snapshots stored as changes are materialized
+
+        :param iteration: number of collecting iteration
+        :return: ordered dict with pid as key, and PageSnapshot as value, None if iteration wasn't stored
+        :rtype: OrderedDict
+        """
+        with self.__lock:
+            entries = self.__entries.get(iteration)
+            if entries is None:
+                return None
+            return OrderedDict((pid, self.__materialize(pid, entry)) for pid, entry in entries.items())
+
+    def truncate(self, iterations):
+        """Removes pagedata of iterations starting from a given one
+
+        :param iterations: number of iterations to be kept
+        :return: None
+        """
+        with self.__lock:
+            dropped = [i for i in self.__entries if i >= iterations]
+            if not dropped:
+                return  # collecting goes on, materialized snapshots stay valid
+            for iteration in dropped:
+                del self.__entries[iteration]
+            self.__latest = {pid: latest for pid, latest in self.__latest.items() if latest[0] < iterations}
+            self.__cache.clear()
+
+    @property
+    def nbytes(self):
+        """Memory taken by stored pagedata, shared entries are counted once
+
+        :getter: returns size of stored records in bytes
+        :type: Int
+        """
+        with self.__lock:
+            unique_entries = {id(entry): entry for entries in self.__entries.values() for entry in entries.values()}
+        return sum(entry.nbytes for entry in unique_entries.values())
+
+    def __contains__(self, iteration):
+        return iteration in self.__entries
+
+    def __iter__(self):
+        with self.__lock:
+            return iter(sorted(self.__entries))
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __encode(self, iteration, pid, snapshot, vpns):
+        """Encodes snapshot against snapshot of the same pid at the previous iteration
+
+        :return: entry of the previous iteration if nothing changed, SnapshotDelta if few records changed,
+        snapshot itself otherwise
+        :rtype: PageSnapshot or SnapshotDelta
+        """
+        prev_iteration, prev_snapshot, prev_vpns = self.__latest.get(pid, (None, None, None))
+        if prev_iteration != iteration - 1 or (prev_vpns is None) != (vpns is None):
+            return snapshot
+
+        prev_entry = self.__entries[prev_iteration][pid]
+        if prev_snapshot.records is snapshot.records:
+            return prev_entry
+        if vpns is None:
+            prev_vpns, vpns = np.arange(len(prev_snapshot.records)), np.arange(len(snapshot.records))
+        is_kept = is_in_sorted(prev_vpns, vpns)
+        is_old = is_in_sorted(vpns, prev_vpns)
+        # pages mapped in both snapshots are in the same order
+        kept = np.flatnonzero(is_kept)
+        changed = np.flatnonzero(prev_snapshot.records[kept] != snapshot.records[is_old])
+        removed = np.flatnonzero(~is_kept)
+        inserted = np.flatnonzero(~is_old)
+        delta = SnapshotDelta(prev_iteration,
+                              kept[changed].astype(np.uint32),
+                              snapshot.records[is_old][changed],
+                              removed.astype(np.uint32),
+                              (inserted - np.arange(len(inserted))).astype(np.uint32),
+                              snapshot.records[inserted],
+                              prev_entry.chain_length + 1 if isinstance(prev_entry, SnapshotDelta) else 1)
+        if len(delta) == 0:
+            return prev_entry
+        if len(delta) > self.__max_changed_ratio * len(snapshot) or delta.chain_length > self.__max_chain_length:
+            return snapshot
+        return delta
+
+    def __materialize(self, pid, entry):
+        """Applies chain of changes to the snapshot they are based on
+
+        :return: snapshot represented by entry
+        :rtype: PageSnapshot
+        """
+        if isinstance(entry, PageSnapshot):
+            return entry
+
+        cache = self.__cache.setdefault(pid, OrderedDict())
+        snapshot = cache.get(entry)
+        if snapshot is not None:
+            cache.move_to_end(entry)
+            return snapshot
+
+        base = self.__materialize(pid, self.__entries[entry.base_iteration][pid])
+        snapshot = PageSnapshot(entry.apply(base.records))
+
+        cache[entry] = snapshot
+        if len(cache) > self.__cache_depth:
+            cache.popitem(last=False)
+        return snapshot
+
@@ -0,0 +1,78 @@
+"""Contains DeviceTracker class - follows connection and disconnection of devices in background
+
+Tracker keeps a host:track-devices stream to adb server open in a separate thread, every list
+of devices sent by server is passed on by a signal, so changes are known as soon as they happen
+without polling. If connection to server is lost, devices are reported as gone and tracking
+is resumed after a delay, growing while server stays unavailable.
+
+Usage example:
+    tracker = DeviceTracker()
+    tracker.devices_changed.connect(devices_handler.set_devices)
+    tracker.start()
+    tracker.stop()
+    tracker.wait()
+"""
+
+import threading
+from subprocess import CalledProcessError
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from src.device.adb_client import get_client
+
+RETRY_DELAY = 1  # seconds
+MAX_RETRY_DELAY = 30  # seconds
+
+
+class DeviceTracker(QThread):
+    """Reads stream of devices' lists from adb server.
+    Signals are emitted from tracking thread, so they are queued to receivers living in GUI thread
+
+    :ivar devices_changed: signal emitted with list of serial numbers of connected devices
+    whenever devices change
+    :ivar __tracking: stream being read, None if there is no connection
+    :ivar __stop_event: event set when tracking has to be stopped
+    """
+    devices_changed = pyqtSignal(list)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.__tracking = None
+        self.__stop_event = threading.Event()
+
+    def stop(self):
+        """Stops tracking, closing stream interrupts waiting for the next list
+
+        :return: None
+        """
+        self.__stop_event.set()
+        tracking = self.__tracking
+        if tracking is not None:
+            tracking.close()
+
+    def run(self):
+        """Reads lists of devices until tracking is stopped, reconnects if connection is lost
+
+        :return: None
+        """
+        delay = RETRY_DELAY
+        while not self.__stop_event.is_set():
+            try:
+                self.__tracking = get_client().track_devices()
+                if self.__stop_event.is_set():
+                    break  # stopped while connecting
+                for devices in self.__tracking:
+                    delay = RETRY_DELAY
+                    self.devices_changed.emit([serial for serial, _ in devices])
+            except CalledProcessError:
+                pass
+            finally:
+                if self.__tracking is not None:
+                    self.__tracking.close()
+                    self.__tracking = None
+
+            if self.__stop_event.is_set():
+                break
+            self.devices_changed.emit([])  # devices can't be reached without server
+            self.__stop_event.wait(delay)
+            delay = min(delay * 2, MAX_RETRY_DELAY)
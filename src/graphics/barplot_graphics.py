@@ -1,95 +1,156 @@
-import matplotlib.patches as mpatches
+from functools import lru_cache
+
 import numpy as np
-from matplotlib.figure import Figure
+from PyQt5.QtCore import QRect, QRectF, Qt
+from PyQt5.QtGui import QColor, QFont, QImage, QPainter
 
+from src.device.page_snapshot import PageSnapshot
 
-def barplot_pids_pagemap(page_data, highlighted_pids, iteration=''):
-    """Displays 2 bar plot for each pid marked as highlighted and saves them to .png
-    * 1 bar is [swapped % |     clean %     |    dirty %  ]
-    * 2 bar is [swapped % | not anonymous % | anonymous % ]
+# TODO Remove hardcoded values, use values depending on widget size
+WIDTH, HEIGHT = 1300, 200  # pixel size
+PLOT_RECT = QRect(162, 24, 1008, 136)  # area of bars, axes are drawn around it
+BAR_HEIGHT = 0.8  # part of bar's row filled by bar
 
-    :param page_data: ordered dict with pid as key, and data frame, containing info about each page as value
-    :param highlighted_pids: list of pids to be shown
-    :param iteration: number of iteration of data collecting
-    :return: None
-    """
-    # TODO Remove hardcoded values, use values depending on widget size
-    width = 13
-    height = 2
-    fig = Figure(figsize=(width, height), dpi=100, facecolor='white')  # Figure constructor
-    ax = fig.add_subplot()
-
-    flags_colors = {'Swapped': 'yellow',
-                    'Clean': 'lime',
-                    'Dirty': 'blue',
-                    'Not Anon': 'orange',
-                    'Anon': 'red'
-                    }
+FLAGS_COLORS = {'Swapped': QColor('yellow'),
+                'Clean': QColor('lime'),
+                'Dirty': QColor('blue'),
+                'Not Anon': QColor('orange'),
+                'Anon': QColor('red')
+                }
 
-    for i, pid in enumerate(highlighted_pids):
-        pid_pages_data = page_data.get(pid)
-        total_pages = len(pid_pages_data)
-
-        present_flag_count = get_flags_count(pid_pages_data, column=1)
-        dirty_flag_count = get_flags_count(pid_pages_data, column=2)
-        anon_flag_count = get_flags_count(pid_pages_data, column=3)
-
-        is_dirty_bar = get_percentage_values(total_pages, present_flag_count, dirty_flag_count)
-        is_anon_bar = get_percentage_values(total_pages, present_flag_count, anon_flag_count)
-
-        plot_bar(ax, is_dirty_bar, y_offset=-i * 2,
-                 colors=[flags_colors.get('Swapped'), flags_colors.get('Clean'), flags_colors.get('Dirty')])
-        plot_bar(ax, is_anon_bar, y_offset=-i * 2 - 1,
-                 colors=[flags_colors.get('Swapped'), flags_colors.get('Not Anon'), flags_colors.get('Anon')])
-
-    # Set ticks and legend
-    ax.set_ylabel('Pid number')
-    ax.set_yticks([-x * 2 - 0.5 for x in range(len(highlighted_pids))])
-    ax.set_yticklabels(highlighted_pids)
-    ax.set_xlabel('Total pages, %')
-    ax.set_xlim([0, 100])
-    ax.legend(handles=[mpatches.Patch(color=flags_colors.get(flag), label=flag) for flag in flags_colors],
-              bbox_to_anchor=(1, 1), loc='upper left', ncol=1, fontsize='small')
-    # Save data to png
-    ax.figure.savefig('resources/data/pictures/barplot/b' + iteration + '.png')
-
-
-def get_flags_count(data, column):
-    """From dataFrame (page by page data) creates dict, containing number of times pages contained particular flag.
-     Flags are stored in dataFrame columns.
-
-    :param data: dataFrame containing info about each page of process
-    :param column: number of column in dataFrame.
-    :return: dict like {0: <Number of 0-values in that column>, 1: <Number of 1-values in that column>}
-    :rtype: Dict
+# All values of flags byte of PageSnapshot, masks selecting values with particular bit set
+FLAGS_VALUES = np.arange(8)
+IS_PRESENT = (FLAGS_VALUES & PageSnapshot.PRESENT) != 0
+IS_DIRTY = (FLAGS_VALUES & PageSnapshot.DIRTY) != 0
+IS_ANON = (FLAGS_VALUES & PageSnapshot.ANON) != 0
+
+
+def count_page_flags(snapshot):
+    """Counts pages with each combination of flags
+
+    :param snapshot: PageSnapshot of a process
+    :return: array of numbers of pages for each value of flags byte
+    :rtype: numpy.ndarray
     """
-    unique, counts = np.unique(data[column], return_counts=True)
-    return dict(zip(unique, counts))
+    return np.bincount(snapshot.flags, minlength=len(FLAGS_VALUES))
 
 
-def get_percentage_values(total_pages, present_flag, any_flag):
-    """Calculate width of the bar plot in percentage ratio format
+def count_pids_flags(page_data):
+    """Counts pages with each combination of flags for each process, counts are all bar plot needs,
+    so it is redrawn without going through pages again
 
-    :param total_pages: the total number of pages for process
-    :param present_flag: dict formed by get_flags_count(data, column) function. {0: <number of swapped pages>, 1: <number of present pages>}
-    :param any_flag: dict formed by get_flags_count(data, column) function. (ex. {0: <number of clean pages>, 1: <number of dirty pages>})
-    :return: list of the widths for the bar plot (ex. [10, 50, 40]: 10% + 50% + 40% = 100%)
-    :rtype: List
+    :param page_data: ordered dict with pid as key, and PageSnapshot, containing info about each page as value
+    :return: dict with pid as key, and array of numbers of pages for each value of flags byte as value
+    :rtype: Dict
     """
-    flags_count_data = [present_flag.get(0, 0),  # swapped
-                        present_flag.get(1, 0) - any_flag.get(1, 0),  # present - any
-                        any_flag.get(1, 0)]
-    return [100 * flag_pages_count / total_pages for flag_pages_count in flags_count_data]
+    return {pid: count_page_flags(snapshot) for pid, snapshot in page_data.items()}
 
 
-def plot_bar(ax, bar_data, y_offset, colors):
-    """Displays a horizontal bar plot
+def get_percentage_values(flags_count):
+    """Calculate widths of the bars in percentage ratio format
+    * 1 bar is [swapped % |     clean %     |    dirty %  ]
+    * 2 bar is [swapped % | not anonymous % | anonymous % ]
 
-    :param ax: axes instance in the coordinate system
-    :param bar_data: the widths of the bars, formed by def get_percentage_values(total_pages, present_flag, any_flag)
-    :param y_offset: the heights of the bars in y axes in the coordinate system. 0 offset - the highest bar.
+    :param flags_count: array of numbers of pages for each value of flags byte
+    :return: lists of the widths for both bars (ex. [10, 50, 40]: 10% + 50% + 40% = 100%)
+    :rtype: List, List
+    """
+    total_pages = flags_count.sum()
+    if total_pages == 0:
+        return [0, 0, 0], [0, 0, 0]
+    swapped = flags_count[~IS_PRESENT].sum()
+    present = total_pages - swapped
+    dirty = flags_count[IS_DIRTY].sum()
+    anon = flags_count[IS_ANON].sum()
+    return [100 * count / total_pages for count in (swapped, present - dirty, dirty)], \
+        [100 * count / total_pages for count in (swapped, present - anon, anon)]
+
+
+@lru_cache(maxsize=1)
+def draw_axes():
+    """Draws parts of bar plot which don't depend on data: axes, labels and legend
+
+    :return: image of bar plot without bars
+    :rtype: QImage
+    """
+    image = QImage(WIDTH, HEIGHT, QImage.Format_RGB32)
+    image.fill(Qt.white)
+    painter = QPainter(image)
+    font = QFont(painter.font())
+    font.setPixelSize(11)
+    painter.setFont(font)
+
+    painter.drawRect(PLOT_RECT)
+    for percent in range(0, 101, 20):
+        x = PLOT_RECT.left() + PLOT_RECT.width() * percent // 100
+        painter.drawLine(x, PLOT_RECT.bottom(), x, PLOT_RECT.bottom() + 4)
+        painter.drawText(QRect(x - 20, PLOT_RECT.bottom() + 5, 40, 14), Qt.AlignCenter, str(percent))
+    painter.drawText(QRect(PLOT_RECT.left(), PLOT_RECT.bottom() + 20, PLOT_RECT.width(), 14), Qt.AlignCenter,
+                     'Total pages, %')
+
+    painter.save()
+    painter.translate(PLOT_RECT.left() - 45, PLOT_RECT.center().y())
+    painter.rotate(-90)
+    painter.drawText(QRect(-PLOT_RECT.height() // 2, -14, PLOT_RECT.height(), 14), Qt.AlignCenter, 'Pid number')
+    painter.restore()
+
+    for i, (flag, color) in enumerate(FLAGS_COLORS.items()):
+        y = PLOT_RECT.top() + 6 + i * 18
+        painter.fillRect(QRect(PLOT_RECT.right() + 10, y, 28, 10), color)
+        painter.drawText(QRect(PLOT_RECT.right() + 44, y - 2, 80, 14), Qt.AlignLeft | Qt.AlignVCenter, flag)
+    painter.end()
+    return image
+
+
+def plot_bar(painter, bar_data, top, height, colors):
+    """Draws a horizontal stacked bar
+
+    :param painter: QPainter drawing on bar plot image
+    :param bar_data: the widths of the bar's parts in percents, formed by get_percentage_values(flags_count)
+    :param top: y coordinate of the bar's top
+    :param height: height of the bar
     :param colors: list of colors for bar data
     :return: None
     """
-    for i, bar_value in enumerate(bar_data):
-        ax.barh(y=y_offset, width=bar_value, left=sum(bar_data[:i]), color=colors[i])
+    left = float(PLOT_RECT.left())
+    for bar_value, color in zip(bar_data, colors):
+        width = PLOT_RECT.width() * bar_value / 100
+        painter.fillRect(QRectF(left, top, width, height), color)
+        left += width
+
+
+def barplot_pids_pagemap(flags_counts, highlighted_pids):
+    """Plots 2 bars for each pid marked as highlighted
+    * 1 bar is [swapped % |     clean %     |    dirty %  ]
+    * 2 bar is [swapped % | not anonymous % | anonymous % ]
+
+    :param flags_counts: dict with pid as key, and array of numbers of pages for each value of flags byte as value
+    :param highlighted_pids: list of pids to be shown
+    :return: image of bar plot
+    :rtype: QImage
+    """
+    image = draw_axes().copy()
+    if not highlighted_pids:
+        return image
+
+    painter = QPainter(image)
+    font = QFont(painter.font())
+    font.setPixelSize(11)
+    painter.setFont(font)
+
+    row_height = PLOT_RECT.height() / (2 * len(highlighted_pids))
+    bar_height = row_height * BAR_HEIGHT
+    for i, pid in enumerate(highlighted_pids):
+        top = PLOT_RECT.top() + 2 * i * row_height
+        flags_count = flags_counts.get(pid)
+        if flags_count is not None:
+            is_dirty_bar, is_anon_bar = get_percentage_values(flags_count)
+            plot_bar(painter, is_dirty_bar, top + (row_height - bar_height) / 2, bar_height,
+                     [FLAGS_COLORS['Swapped'], FLAGS_COLORS['Clean'], FLAGS_COLORS['Dirty']])
+            plot_bar(painter, is_anon_bar, top + row_height + (row_height - bar_height) / 2, bar_height,
+                     [FLAGS_COLORS['Swapped'], FLAGS_COLORS['Not Anon'], FLAGS_COLORS['Anon']])
+
+        label_rect = QRectF(0, top, PLOT_RECT.left() - 6, 2 * row_height)
+        painter.drawText(label_rect, Qt.AlignRight | Qt.AlignVCenter, str(pid))
+    painter.end()
+    return image
@@ -0,0 +1,104 @@
+"""Contains FrameCache class - storage of rendered memory state images of a collecting session
+
+Frame of an iteration depends on the colors of processes, so frames are keyed by iteration and
+palette version, which changes every time colors or highlighting of processes change.
+Cache keeps the most recently used frames fitting into a memory budget.
+
+Usage example:
+    cache = FrameCache()
+    cache.put(iteration, palette_version, Frame(pages_image, barplot_image))
+    frame = cache.get(iteration, palette_version)
+"""
+
+from collections import OrderedDict, namedtuple
+
+# Images of one memory state: physical memory map and pages percentage bar plot, both QImage
+Frame = namedtuple('Frame', ['pages', 'barplot'])
+
+FRAME_CACHE_BUDGET = 256 * 2 ** 20  # 256 mb, about 60 frames
+
+
+def frame_size(frame):
+    """Memory taken by frame's images
+
+    :param frame: rendered images
+    :return: size of images' pixels in bytes
+    :rtype: Int
+    """
+    return frame.pages.sizeInBytes() + frame.barplot.sizeInBytes()
+
+
+class FrameCache:
+    """Recently used rendered frames of one collecting session
+
+    :ivar __frames: frames with (iteration, palette version) as key, least recently used first
+    :ivar __palette_version: palette version of the latest stored frame
+    :ivar __budget: max memory in bytes taken by frames
+    :ivar __nbytes: memory in bytes taken by stored frames
+    """
+    def __init__(self, budget=FRAME_CACHE_BUDGET):
+        self.__frames = OrderedDict()
+        self.__palette_version = None
+        self.__budget = budget
+        self.__nbytes = 0
+
+    def get(self, iteration, palette_version):
+        """Returns frame rendered for an iteration with given colors
+
+        :param iteration: number of collecting iteration
+        :param palette_version: version of processes' colors
+        :return: frame, None if it hasn't been rendered
+        :rtype: Frame
+        """
+        frame = self.__frames.get((iteration, palette_version))
+        if frame is not None:
+            self.__frames.move_to_end((iteration, palette_version))
+        return frame
+
+    def put(self, iteration, palette_version, frame):
+        """Stores frame, frames rendered with other colors are dropped as they won't be shown anymore,
+        least recently used ones are dropped if frames don't fit into budget
+
+        :param iteration: number of collecting iteration
+        :param palette_version: version of processes' colors
+        :param frame: rendered images
+        :return: None
+        """
+        if palette_version != self.__palette_version:
+            self.clear()
+            self.__palette_version = palette_version
+        self.__discard((iteration, palette_version))
+        self.__frames[(iteration, palette_version)] = frame
+        self.__nbytes += frame_size(frame)
+
+        # the frame just stored is kept even if it exceeds budget alone
+        while self.__nbytes > self.__budget and len(self.__frames) > 1:
+            self.__discard(next(iter(self.__frames)))
+
+    def clear(self):
+        """Removes all frames
+
+        :return: None
+        """
+        self.__frames = OrderedDict()
+        self.__nbytes = 0
+
+    @property
+    def nbytes(self):
+        """Memory taken by stored frames
+
+        :getter: returns size of frames' images in bytes
+        :type: Int
+        """
+        return self.__nbytes
+
+    def __discard(self, key):
+        frame = self.__frames.pop(key, None)
+        if frame is not None:
+            self.__nbytes -= frame_size(frame)
+
+    def __contains__(self, key):
+        return key in self.__frames
+
+    def __len__(self):
+        return len(self.__frames)
@@ -0,0 +1,262 @@
+"""Contains FrameRenderer class - renders frames of memory states on demand and in background
+
+Frame which is about to be shown is rendered right away, frames of neighboring iterations are
+prefetched by a pool of worker processes, so stepping through iterations doesn't wait for rendering.
+Pagedata is passed to workers through shared memory, workers return maps of memory blocks' owners
+and numbers of pages with each combination of flags, which are turned into images in GUI process
+as they arrive. These data don't depend on colors, so frames are redrawn from them when colors change.
+
+Usage example:
+    renderer = FrameRenderer(device_interaction)
+    renderer.frame_rendered.connect(store_frame)
+    frame_data, frame = renderer.render(iteration, palette)
+    renderer.prefetch(neighbor_iterations, palette, frames_data)
+"""
+
+import multiprocessing
+import os
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from threading import Lock
+
+import numpy as np
+from PyQt5.QtCore import QObject, Qt, pyqtSignal, pyqtSlot
+from PyQt5.QtGui import QColor
+
+from src.device.page_snapshot import SNAPSHOT_DTYPE, PageSnapshot
+from src.graphics.barplot_graphics import barplot_pids_pagemap, count_pids_flags
+from src.graphics.frame_cache import Frame
+from src.graphics.pages_graphics import colorize_owner_map, render_owner_map
+
+# Min number of iterations prefetched on each side of the shown one
+PREFETCH_DEPTH = 3
+
+# Colors of processes frames are rendered with:
+# version changes whenever colors change, colors are given for each pid of pids list,
+# bars are plotted for highlighted pids
+Palette = namedtuple('Palette', ['version', 'pids', 'colors', 'highlighted_pids'])
+
+# Color independent data of memory state frame: map of memory blocks' owners and
+# dict with pid as key, and array of numbers of pages for each value of flags byte as value
+FrameData = namedtuple('FrameData', ['owner_map', 'flags_counts'])
+
+
+def make_palette(version, active_pids):
+    """Creates palette from active pids, colors are copied, so palette doesn't change with them
+
+    :param version: version of colors
+    :param active_pids: list of dicts describing pids, as MainView keeps them
+    :return: palette for rendering
+    :rtype: Palette
+    """
+    return Palette(version=version,
+                   pids=[pid['pid'] for pid in active_pids],
+                   colors=[QColor(pid['color']) for pid in active_pids],  # corrupted pids are transparent
+                   highlighted_pids=[pid['pid'] for pid in active_pids
+                                     if pid['highlighted'] is True and pid['corrupted'] is False])
+
+
+def remap_palette(palette, pids):
+    """Gives colors of palette to other processes, e.g. to the same processes on another device
+
+    :param palette: colors of processes
+    :param pids: list of pids taking positions of palette's pids, None for processes which are missing
+    :return: palette for rendering
+    :rtype: Palette
+    """
+    highlighted_pids = set(palette.highlighted_pids)
+    return palette._replace(pids=list(pids),
+                            highlighted_pids=[pid for old_pid, pid in zip(palette.pids, pids)
+                                              if old_pid in highlighted_pids and pid is not None])
+
+
+def render_frame_data(page_data, pids):
+    """Renders color independent data of memory state frame
+
+    :param page_data: ordered dict with pid as key, and PageSnapshot as value
+    :param pids: list of pids, positions of processes in it mark their blocks
+    :return: frame data
+    :rtype: FrameData
+    """
+    owner_map = render_owner_map((OrderedDict((pid, data.present) for pid, data in page_data.items()),
+                                  OrderedDict((pid, data.swapped) for pid, data in page_data.items())),
+                                 pids)
+    return FrameData(owner_map=owner_map, flags_counts=count_pids_flags(page_data))
+
+
+def compose_frame(frame_data, palette):
+    """Turns rendered data into images
+
+    :param frame_data: color independent data of memory state frame
+    :param palette: colors of processes
+    :return: rendered images
+    :rtype: Frame
+    """
+    return Frame(pages=colorize_owner_map(frame_data.owner_map, palette.colors),
+                 barplot=barplot_pids_pagemap(frame_data.flags_counts, palette.highlighted_pids))
+
+
+def share_page_data(page_data):
+    """Copies pagedata to shared memory
+
+    :param page_data: ordered dict with pid as key, and PageSnapshot as value
+    :return: shm - shared memory block, to be unlinked by caller, layout - list of (pid, start, count)
+    of processes' records
+    :rtype: SharedMemory, List
+    """
+    layout = []
+    start = 0
+    for pid, data in page_data.items():
+        layout.append((pid, start, len(data.records)))
+        start += len(data.records)
+
+    shm = SharedMemory(create=True, size=max(start * SNAPSHOT_DTYPE.itemsize, 1))
+    records = np.ndarray(start, dtype=SNAPSHOT_DTYPE, buffer=shm.buf)
+    for (pid, start, count), data in zip(layout, page_data.values()):
+        records[start:start + count] = data.records
+    del records  # shared memory can't be closed while arrays refer to it
+    return shm, layout
+
+
+def attach_page_data(buffer, layout):
+    """Creates pagedata referring to records in shared memory
+
+    :param buffer: buffer of shared memory block
+    :param layout: list of (pid, start, count) of processes' records
+    :return: ordered dict with pid as key, and PageSnapshot as value
+    :rtype: OrderedDict
+    """
+    total = sum(count for _, _, count in layout)
+    records = np.ndarray(total, dtype=SNAPSHOT_DTYPE, buffer=buffer)
+    return OrderedDict((pid, PageSnapshot(records[start:start + count])) for pid, start, count in layout)
+
+
+def render_shared_frame_data(name, layout, pids):
+    """Renders color independent data of memory state frame from pagedata in shared memory,
+    runs in worker process
+
+    :param name: name of shared memory block
+    :param layout: list of (pid, start, count) of processes' records
+    :param pids: list of pids, positions of processes in it mark their blocks
+    :return: frame data
+    :rtype: FrameData
+    """
+    shm = SharedMemory(name=name)
+    try:
+        return render_frame_data(attach_page_data(shm.buf, layout), pids)
+    finally:
+        shm.close()
+
+
+class FrameRenderer(QObject):
+    """Renders frames of memory states, prefetching is done by a pool of worker processes
+
+    :ivar device_interaction: DeviceInteraction instance keeping collected data
+    :ivar frame_rendered: signal emitted with (iteration, palette, frame data, frame) when prefetched frame is ready
+    :ivar data_rendered: signal emitted by pool's thread with (iteration, palette, frame data),
+    delivered to GUI thread
+    :ivar __max_workers: number of worker processes
+    :ivar __executor: pool of worker processes, started on first prefetch
+    :ivar __futures: (future, palette) of submitted frames with iteration as key, removed once frame is finished
+    :ivar __lock: lock guarding futures, finished frames are removed by pool's thread
+    """
+    frame_rendered = pyqtSignal(int, object, object, object)
+    data_rendered = pyqtSignal(int, object, object)
+
+    def __init__(self, device_interaction, max_workers=None, parent=None):
+        super().__init__(parent)
+        self.device_interaction = device_interaction
+        self.__max_workers = max_workers or os.cpu_count() or 1
+        self.__executor = None
+        self.__futures = {}
+        self.__lock = Lock()
+        self.data_rendered.connect(self.__compose_frame, Qt.QueuedConnection)
+
+    @property
+    def prefetch_depth(self):
+        """Number of iterations prefetched on each side of the shown one, enough to keep all workers busy
+
+        :getter: returns number of iterations
+        :type: Int
+        """
+        return max(PREFETCH_DEPTH, -(-self.__max_workers // 2))
+
+    def render(self, iteration, palette, frame_data=None):
+        """Renders frame right away
+
+        :param iteration: iteration of memory state
+        :param palette: colors of processes
+        :param frame_data: color independent data of the iteration's frame, rendered if none is given
+        :return: frame_data - color independent data of frame, frame - rendered images
+        :rtype: FrameData, Frame
+        """
+        if frame_data is None:
+            frame_data = render_frame_data(self.device_interaction.get_page_data(iteration), palette.pids)
+        return frame_data, compose_frame(frame_data, palette)
+
+    def prefetch(self, iterations, palette, frames_data):
+        """Renders frames in background, frames requested before and not started yet are cancelled.
+        Frames having color independent data rendered are just composed, others are rendered by workers
+        unless they are already being rendered with the same palette
+
+        :param iterations: iterations to be rendered, in order of priority
+        :param palette: colors of processes
+        :param frames_data: dict of already rendered color independent data of frames with iteration as key
+        :return: None
+        """
+        self.cancel()
+        if self.__executor is None:
+            # workers are spawned, forking a process running Qt threads isn't safe
+            self.__executor = ProcessPoolExecutor(self.__max_workers, mp_context=multiprocessing.get_context('spawn'))
+
+        for iteration in iterations:
+            if iteration in frames_data:
+                self.data_rendered.emit(iteration, palette, frames_data[iteration])
+                continue
+            with self.__lock:
+                running = self.__futures.get(iteration)
+            if running is not None and running[1].version == palette.version:
+                continue  # running frames can't be cancelled, the result will be reported when it's ready
+            page_data = self.device_interaction.get_page_data(iteration)
+            if page_data is None:
+                continue
+            shm, layout = share_page_data(page_data)
+            future = self.__executor.submit(render_shared_frame_data, shm.name, layout, palette.pids)
+            with self.__lock:
+                self.__futures[iteration] = (future, palette)
+            future.add_done_callback(lambda done, i=iteration, memory=shm: self.__finish(done, i, palette, memory))
+
+    def cancel(self):
+        """Cancels rendering of frames which has not started yet
+
+        :return: None
+        """
+        with self.__lock:
+            futures = [future for future, _ in self.__futures.values()]
+        for future in futures:
+            future.cancel()
+
+    def wait(self):
+        """Cancels frames not started yet, waits for the others and stops worker processes
+
+        :return: None
+        """
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=True, cancel_futures=True)
+            self.__executor = None
+
+    def __finish(self, future, iteration, palette, shm):
+        """Releases shared memory of a finished frame and reports result, runs in pool's thread"""
+        with self.__lock:
+            if self.__futures.get(iteration, (None, None))[0] is future:
+                del self.__futures[iteration]
+        shm.close()
+        shm.unlink()
+        if future.cancelled() or future.exception() is not None:
+            return  # frame will be rendered when it is shown
+        self.data_rendered.emit(iteration, palette, future.result())
+
+    @pyqtSlot(int, object, object)
+    def __compose_frame(self, iteration, palette, frame_data):
+        self.frame_rendered.emit(iteration, palette, frame_data, compose_frame(frame_data, palette))
@@ -1,8 +1,7 @@
-from collections import Counter
+import numpy as np
+from PyQt5.QtGui import QImage
 
-from cairo import ImageSurface, Context, Format
-
-from src.utilities import create_regions_map
+from src.device.region_index import RegionIndex
 
 RAM_SIZE = 2 ** 31  # 2 gb
 SWAP_SIZE = 20 * (2 ** 20)  # 20 mb
@@ -10,115 +9,136 @@ PAGE_SIZE = 4096
 BLOCK_SIZE = 10  # pixel size
 PAGES_IN_BLOCK = 64
 
+BLACK = 0xff000000  # RGB32 pixel values
+WHITE = 0xffffffff
+EMPTY_SLOT = 0xffff  # owner of a block containing no pages of inspected processes
+
+RAM_WIDTH, RAM_HEIGHT = 128, 64  # in blocks
+SWAP_WIDTH, SWAP_HEIGHT = 80, 1
+
 """
 Page size = 4096, i assumed 64 pages in block.
 RAM size in our case = 2**31, so it gives
 2**31 / (64 * 4096) = 2**31 / 2**18 = 2**13 blocks,
 by splitting 2**13 into 2**7 and 2**6,
 we get 128 x 64 blocks RAM visualization,
-each block containing 64 pages    
+each block containing 64 pages
 same for SWAP, resulting in 80x1 blocks
 """
 
 
-def draw_hblocks_line(context, start_point, length, width_in_blocks=1):
+def color_to_rgb32(color):
+    """Converts color to RGB32 pixel value it gets when painted over white background
+
+    :param color: color (QColor)
+    :return: pixel value 0xffRRGGBB
+    :rtype: Int
+    """
+    # same fixed-point arithmetic cairo used to paint semi-transparent color over opaque surface
+    alpha = int(color.alphaF() * 65535 + 0.5) >> 8
+    pixel = 0xff
+    for component in (color.redF(), color.greenF(), color.blueF()):
+        premultiplied = int(component * color.alphaF() * 65535 + 0.5) >> 8
+        pixel = (pixel << 8) | (premultiplied + 255 - alpha)
+    return pixel
+
+
+def draw_hblocks_line(pixels, start_point, length, width_in_blocks=1):
     """Draws horizontal line using blocks (size of <block_size> pixels)
 
-    :param context: cairo context
-    :param start_point: start coordinates on context to start drawing from
+    :param pixels: 2d array of RGB32 pixel values
+    :param start_point: start coordinates on image to start drawing from
     :param length: length of line in pixels
     :param width_in_blocks: width of a line counted in <block_size>
     :return: None
     """
     start_x, start_y = start_point
-    context.rectangle(start_x, start_y, length, BLOCK_SIZE * width_in_blocks - 1)
-    context.set_source_rgb(0, 0, 0)
-    context.fill()
+    pixels[start_y:start_y + BLOCK_SIZE * width_in_blocks - 1, start_x:start_x + length] = BLACK
 
 
-def draw_addr_area(context_data, area_len, regions_map, pid_color_map, start_point=(0, 0), start_pfn=0):
-    """Draws processes' pages, combining them in blocks (size of <block_size> pixels) of different colors related to the process
+def find_block_owners(regions, blocks_count, start_pfn=0):
+    """Finds process owning each block of pages, that is the one having the most regions intersecting the block,
+    the process listed first wins a tie
 
-    :param context_data: contains tuple (cairo context, context width, context height)
-    :param area_len: length in bytes of memory part the is being displayed
-    :param regions_map: tree of intervals (start_phys_index, end_phys_index, pid) that maps areas of pages in memory to processes
-    :param pid_color_map: map of pids to colors for drawing
-    :param start_point: start coordinates on context to start drawing from
-    :param start_pfn: index of page in physical memory to start counting from
-    :return: None
+    :param regions: index of regions of pages in memory owned by processes
+    :param blocks_count: number of blocks of <pages_in_block> pages
+    :param start_pfn: index of page in physical memory the first block starts with
+    :return: array of positions of owning processes in the list of pids, EMPTY_SLOT for blocks without their pages
+    :rtype: numpy.ndarray
     """
-    context, width, height = context_data
-
-    x, y = start_point
-    pfn = start_pfn
-
-    pid_counter = Counter()
-    pages_count = area_len // PAGE_SIZE
+    if len(regions) == 0:
+        return np.full(blocks_count, EMPTY_SLOT, dtype=np.uint16)
 
-    while pfn < pages_count:
-        intervals = regions_map[pfn:pfn + PAGES_IN_BLOCK]
+    counts = regions.count_in_blocks(PAGES_IN_BLOCK, blocks_count, start_pfn)
+    owners = counts.argmax(axis=0).astype(np.uint16)
+    owners[counts.max(axis=0) == 0] = EMPTY_SLOT
+    return owners
 
-        for interval in intervals:
-            pid_counter[interval.data] += 1
 
-        # block has been processed, draw it
-        if pfn % PAGES_IN_BLOCK == 0:
-            most_counted_pid = pid_counter.most_common(1)
-            if most_counted_pid:
-                pid = most_counted_pid[0][0]
-                color = pid_color_map[pid]
-                context.rectangle(x, y, BLOCK_SIZE, BLOCK_SIZE)
-                context.set_source_rgba(color.redF(), color.greenF(), color.blueF(), color.alphaF())
-                context.fill()
+def draw_addr_area(owner_map, area_len, regions, start_block=(0, 0), start_pfn=0):
+    """Marks blocks of processes' pages with positions of processes owning them
 
-            if x + BLOCK_SIZE >= width - 1:
-                y += BLOCK_SIZE
+    :param owner_map: 2d array of blocks' owners
+    :param area_len: length in bytes of memory part the is being displayed
+    :param regions: index of regions of pages in memory owned by processes
+    :param start_block: start coordinates (in blocks) on map to start marking from
+    :param start_pfn: index of page in physical memory to start counting from
+    :return: None
+    """
+    blocks_in_row = owner_map.shape[1]
+    x, y = start_block
 
-            x = (x + BLOCK_SIZE) % width
+    blocks_count = -(-(area_len // PAGE_SIZE - start_pfn) // PAGES_IN_BLOCK)
+    owners = find_block_owners(regions, blocks_count, start_pfn)
 
-            pid_counter.clear()
+    # lay blocks out in rows, the first row is preceded by empty blocks up to start block
+    rows_count = -(-(x + blocks_count) // blocks_in_row)
+    layout = np.full(rows_count * blocks_in_row, EMPTY_SLOT, dtype=np.uint16)
+    layout[x:x + blocks_count] = owners
+    layout = layout.reshape(rows_count, blocks_in_row)
 
-        pfn += PAGES_IN_BLOCK
+    area = owner_map[y:y + rows_count]
+    is_owned = layout[:len(area)] != EMPTY_SLOT
+    area[is_owned] = layout[:len(area)][is_owned]
 
 
-def plot_pids_pagemap(page_data, colors_list, iteration):
-    """Creates an image of visual representation of device physical memory
+def render_owner_map(page_data, pids):
+    """Creates a map of blocks of device physical memory, each block is marked with position of the process
+    owning it, colors are applied to the map when it is displayed
 
     :param page_data: page data divided into present and swapped parts, containing info for each page of a group of processes
-    :param colors_list: list of colors (QColor), so every process can be marked by unique color
-    :param iteration: number of current iteration
-    :return: None
+    :param pids: list of pids, positions of processes in it mark their blocks
+    :return: 2d array of positions of owning processes, EMPTY_SLOT for blocks without their pages
+    :rtype: numpy.ndarray
     """
-    ram_width, ram_height = 128, 64
-    swap_width, swap_height = 80, 1
-
-    pix_width, pix_height = max(ram_width, swap_width) * BLOCK_SIZE, (ram_height + swap_height + 1) * BLOCK_SIZE
+    map_width, map_height = max(RAM_WIDTH, SWAP_WIDTH), RAM_HEIGHT + SWAP_HEIGHT + 1
 
-    present_regions = create_regions_map(page_data[0])
-    swapped_regions = create_regions_map(page_data[1])
+    owner_map = np.full((map_height, map_width), EMPTY_SLOT, dtype=np.uint16)
+    draw_addr_area(owner_map,
+                   RAM_SIZE,
+                   RegionIndex.from_page_data(page_data[0], pids))
+    draw_addr_area(owner_map,
+                   SWAP_SIZE,
+                   RegionIndex.from_page_data(page_data[1], pids),
+                   (0, RAM_HEIGHT + 1))
+    return owner_map
 
-    pid_color_map = dict(zip(page_data[0].keys(), colors_list))
 
-    surface = ImageSurface(Format.RGB24, pix_width, pix_height)
+def colorize_owner_map(owner_map, colors_list):
+    """Creates an image of visual representation of device physical memory from a map of blocks' owners
 
-    context = Context(surface)
-    context.scale(1, 1)
+    :param owner_map: 2d array of blocks' owners created by render_owner_map
+    :param colors_list: list of colors (QColor) for each position in the list of pids
+    :return: image of memory state
+    :rtype: QImage
+    """
+    palette = np.full(EMPTY_SLOT + 1, WHITE, dtype=np.uint32)
+    palette[:len(colors_list)] = [color_to_rgb32(color) for color in colors_list]
 
-    context.save()
-    context.set_source_rgba(1., 1., 1., 1.)
-    context.paint()
-    context.restore()
+    pixels = np.repeat(np.repeat(palette[owner_map], BLOCK_SIZE, axis=0), BLOCK_SIZE, axis=1)
+    pix_height, pix_width = pixels.shape
+    draw_hblocks_line(pixels, (0, RAM_HEIGHT * BLOCK_SIZE), pix_width)
 
-    draw_addr_area((context, pix_width, pix_height),
-                   RAM_SIZE,
-                   present_regions,
-                   pid_color_map)
-    draw_hblocks_line(context, (0, ram_height * BLOCK_SIZE), pix_width)
-    draw_addr_area((context, pix_width, pix_height),
-                   SWAP_SIZE,
-                   swapped_regions,
-                   pid_color_map,
-                   (0, (ram_height + 1) * BLOCK_SIZE))
+    # image is copied, so it doesn't refer to pixels array when it is gone
+    return QImage(pixels.data, pix_width, pix_height, pixels.strides[0], QImage.Format_RGB32).copy()
 
-    surface.write_to_png(f'resources/data/pictures/offsets/p{iteration}.png')
-    surface.finish()
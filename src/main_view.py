@@ -1,19 +1,22 @@
-import time
+import os
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 from PyQt5.QtCore import pyqtSlot, Qt
 from PyQt5.QtGui import QBrush
 from PyQt5.QtGui import QGuiApplication
 from PyQt5.QtWidgets import QMainWindow, QVBoxLayout, QMessageBox, QAbstractItemView, QProgressBar, QTableWidgetItem, \
-    QColorDialog, QTableWidget
+    QColorDialog, QTableWidget, QFileDialog
 
 from src.custom_signals import CustomSignals
+from src.device.collector import CollectionThread
 from src.device.interaction import *
 from src.qt_dialogs.dynamics_dialog import DynamicsDialog
-from src.graphics.barplot_graphics import barplot_pids_pagemap
+from src.graphics.frame_cache import FrameCache
+from src.graphics.frame_renderer import FrameRenderer, compose_frame, make_palette, remap_palette, \
+    render_frame_data
 from src.device.handler import DeviceHandler
+from src.device.tracker import DeviceTracker
 from src.device.listener import Listener
-from src.graphics.pages_graphics import plot_pids_pagemap
 from src.picture_viewer import PictureViewer
 from src.qt_ui.mainwindow_ui import Ui_MainWindow
 from src.qt_dialogs.select_dialog import SelectDialog
@@ -27,17 +30,30 @@ class MainView(QMainWindow, Listener):
     """Main application class
 
     :ivar devices_handler: DeviceHandler instance, handles connected devices
+    :ivar device_tracker: DeviceTracker instance, reports changes of connected devices to devices_handler
     :ivar device_interaction: DeviceInteraction instance, provides data collection from connected device
+    :ivar compared_devices: dict with serial number as key, and DeviceInteraction instance as value for each
+    other selected device, data is collected from them at the same time for comparison
+    :ivar compared_pids: dict with serial number as key, and list of pids of the same processes as active pids
+    as value for each compared device, None for processes missing on device
     :ivar signals: custom signals for interaction with dialogs
     :ivar pages_stats_graph: widget for displaying pages percentage stats graph
     :ivar pages_graph: widget for displaying memory state graph
-    :ivar timer: app clock, used for updating once per certain period
-    :ivar time: app time
+    :ivar frames_data: color independent data of frames for each iteration of the current collecting session
+    :ivar frame_cache: recently shown or prefetched images of memory states of the current collecting session
+    :ivar frame_renderer: renders images of memory states when they are shown and prefetches neighboring ones
+    in worker processes
+    :ivar palette_version: version of pids' colors and highlighting, changes whenever they change
+    :ivar collector: thread collecting data from device, None if data isn't being collected
+    :ivar progress: progress bar of data collection
+    :ivar timer: app clock, used for updating pid lists once per certain period
     :ivar active_pids: list containing pids for memory inspection
     :ivar active_pids_len: length of active pids list
     :ivar active_state: number of current iteration of memory state's data collection
     :ivar iteration_time: time to wait between iterations of data collection
     :ivar total_time: limit of time that all data collection would take
+    :ivar max_concurrency: max number of pids scanned at once by separate scans, None if all pids are scanned
+    by a single scan
     :ivar is_data_collected: flag indicating if data has been collected at the moment
     """
     def __init__(self):
@@ -47,10 +63,12 @@ class MainView(QMainWindow, Listener):
         self.devices_handler = DeviceHandler()
         self.devices_handler.add_listener(self)
         self.device_interaction = DeviceInteraction()
+        self.compared_devices = {}
+        self.compared_pids = {}
         self.signals = CustomSignals()
         self._ui.tableWidget.verticalHeader().setVisible(False)
         self.set_buttons(pid=False, data=False, nxt=False, prev=False, play=False, cgr=False, refc=False,
-                         highlight=False)
+                         highlight=False, export=False, stop=False)
 
         self.pages_stats_graph = PictureViewer(need_zoom=False, parent=self._ui.graphicsBar)
         layout = QVBoxLayout(self._ui.graphicsBar)
@@ -63,8 +81,10 @@ class MainView(QMainWindow, Listener):
         self._ui.graphicsPresent.setStyleSheet("background-color: whitesmoke")
 
         self._ui.dataButton.clicked.connect(self.collect_data)
+        self._ui.stopButton.clicked.connect(self.stop_collection)
         self._ui.pidsButton.clicked.connect(self.select_processes)
         self._ui.actionShow_CGroup_tree.triggered.connect(self.select_processes_cgroup)
+        self._ui.actionExport_pictures.triggered.connect(self.export_pictures)
         self._ui.devicesButton.clicked.connect(self.select_devices)
         self._ui.playButton.clicked.connect(self.mem_dynamics)
         self._ui.prevButton.clicked.connect(self.mem_prev_state)
@@ -75,19 +95,31 @@ class MainView(QMainWindow, Listener):
 
         self._ui.tableWidget.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
 
-        self.timer = QtCore.QTimer()
-        self.time = QtCore.QTime(0, 0, 0)
+        self.frames_data = {}
+        self.frame_cache = FrameCache()
+        self.frame_renderer = FrameRenderer(self.device_interaction, parent=self)
+        self.frame_renderer.frame_rendered.connect(self.store_frame)
+        self.palette_version = 0
+
+        self.collector = None
+        self.progress = QProgressBar(self)
+        self.progress.hide()
 
+        self.timer = QtCore.QTimer()
         self.timer.timeout.connect(self.timer_event)
-        self.timer.start(1000)
+        self.timer.start(30000)
 
-        self.devices_handler.update()
+        # the first list of devices comes as soon as tracking starts
+        self.device_tracker = DeviceTracker(parent=self)
+        self.device_tracker.devices_changed.connect(self.devices_handler.set_devices)
+        self.device_tracker.start()
 
         self.active_pids = []
         self.active_state = -1
         self.active_pids_len = 0
         self.iteration_time = 0
         self.total_time = 0
+        self.max_concurrency = None
         self.is_data_collected = False
 
     def call_menu(self, point):
@@ -113,24 +145,25 @@ class MainView(QMainWindow, Listener):
         self._ui.devicesButton.clicked.emit()
 
     def update_data(self):
-        """Updates data such as pid list from a device with a small time interval
+        """Updates data such as pid list from a device with a small time interval,
+        only processes started and finished since the previous update are transferred
 
-        :return: None
+        :return: processes added to and removed from pid list, None if pid list couldn't be updated
+        :rtype: ProcessListDiff
         """
-        self.device_interaction.clear()
         if not self.devices_handler.is_device_selected():
-            return
+            self.device_interaction.clear()
+            return None
 
         try:
-            self.device_interaction.collect_pid_list_all()
+            diff = self.device_interaction.collect_pid_list_all()
             self.device_interaction.collect_cgroups_list()
+            return diff
         except CalledProcessError:
             self.show_msg('Error', 'Check connection with device and tool presence')
         except EmptyDataError:
             self.show_msg('Error', 'Pid list unavailable')
-        finally:
-            clean_tmp_data_from_device(device=self.devices_handler.current_device, remove_page_data=False)
-            clean_tmp_data(remove_page_data=False, remove_pictures_data=False)
+        return None
 
     def generate_pid_colors(self, update_active_pids=True):
         """Generates colors for pid's representation on a plot
@@ -146,21 +179,52 @@ class MainView(QMainWindow, Listener):
                 self.active_pids[i]['color'].setAlpha(alpha)
             self.set_table_color(i)
 
-    def display_page_data(self):
-        """Plots all memory state graphics
+    def get_frame(self, iteration):
+        """Returns images of memory state for given iteration, renders them if they haven't been rendered
+        with current colors yet
 
+        :param iteration: iteration of memory state
+        :return: rendered images
+        :rtype: Frame
+        """
+        frame = self.frame_cache.get(iteration, self.palette_version)
+        if frame is None:
+            frame_data, frame = self.frame_renderer.render(iteration,
+                                                           make_palette(self.palette_version, self.active_pids),
+                                                           self.frames_data.get(iteration))
+            self.frames_data[iteration] = frame_data
+            self.frame_cache.put(iteration, self.palette_version, frame)
+        return frame
+
+    def prefetch_frames(self, state_index):
+        """Renders images of iterations neighboring given one in background
+
+        :param state_index: index of memory state being shown
         :return: None
         """
-        try:
-            iterations = self.device_interaction.iterations
-            if iterations is not None:
-                for i in range(iterations):
-                    self.plot_page_data(i)
-        except AttributeError:
-            pass  # no data collected yet
-        finally:
-            clean_tmp_data_from_device(device=self.devices_handler.current_device, remove_pids_data=False)
-            clean_tmp_data(remove_pictures_data=False, remove_pids_data=False)
+        neighbors = []
+        for distance in range(1, self.frame_renderer.prefetch_depth + 1):
+            neighbors += [state_index + distance, state_index - distance]
+        iterations = [i for i in neighbors if 0 <= i < self.device_interaction.iterations and
+                      (i, self.palette_version) not in self.frame_cache]
+        self.frame_renderer.prefetch(iterations,
+                                     make_palette(self.palette_version, self.active_pids),
+                                     self.frames_data)
+
+    @pyqtSlot(int, object, object, object)
+    def store_frame(self, iteration, palette, frame_data, frame):
+        """Stores images rendered in background, unless colors, pids or collected data have changed
+        since rendering started
+
+        :param iteration: iteration of memory state
+        :param palette: colors images were rendered with
+        :param frame_data: color independent data of frame
+        :param frame: rendered images
+        :return: None
+        """
+        if palette.version == self.palette_version:
+            self.frames_data.setdefault(iteration, frame_data)
+            self.frame_cache.put(iteration, palette.version, frame)
 
     def refresh_colors(self):
         """Generates new colors for pids on a plot
@@ -168,7 +232,7 @@ class MainView(QMainWindow, Listener):
         :return: None
         """
         self.generate_pid_colors()
-        self.display_page_data()
+        self.palette_version += 1
         self.show_state(self.active_state)
 
     def view_checked_pids(self, checked_pids):
@@ -200,6 +264,10 @@ class MainView(QMainWindow, Listener):
                 self._ui.tableWidget.setItem(i, j, item)
 
         self.active_pids_len = len(self.active_pids)
+        self.frames_data = {}  # blocks are marked with positions in the previous active pids list
+        self.frame_cache.clear()
+        self.frame_renderer.cancel()
+        self.palette_version += 1
 
         self._ui.tableWidget.setSelectionBehavior(QAbstractItemView.SelectRows)
         self._ui.tableWidget.setSelectionMode(QAbstractItemView.SingleSelection)
@@ -210,15 +278,12 @@ class MainView(QMainWindow, Listener):
         self.is_data_collected = False
 
     def timer_event(self):
-        """Calls update method with small time interval
+        """Updates pid lists periodically, changes of devices are reported by device_tracker as they happen
 
         :return: None
         """
-        self.time = self.time.addSecs(1)
-        self.timer.start(1000)
-        self.devices_handler.update()
-        if self.time.second() % 30 == 0:
-            self.react()
+        if self.collector is None:
+            self.react()  # lists are updated after collection, not to compete with it for device
 
     def show_msg(self, msg_type, msg):
         """Shows custom message
@@ -236,7 +301,14 @@ class MainView(QMainWindow, Listener):
         :param event: close request
         :return: None
         """
-        clean_tmp_data_from_device(device=self.devices_handler.current_device)
+        if self.collector is not None:
+            self.collector.stop()
+            self.collector.wait()
+        self.device_tracker.stop()
+        self.device_tracker.wait()
+        self.frame_renderer.wait()
+        for device in [self.devices_handler.current_device] + list(self.compared_devices):
+            clean_tmp_data_from_device(device=device)
         clean_tmp_data()
         event.accept()
 
@@ -251,8 +323,11 @@ class MainView(QMainWindow, Listener):
             self.view_checked_pids([])
             self.set_buttons(pid=False, data=False, cgr=False, refc=False, highlight=False)
         self.set_buttons()
-        self.update_data()
-        self.signals.pids_changed.emit(self.device_interaction.pid_list_all)
+        diff = self.update_data()
+        if diff is None:
+            self.signals.pids_changed.emit(self.device_interaction.pid_list_all)
+        elif diff.added or diff.removed or diff.renamed:
+            self.signals.pids_diff.emit(diff.added, diff.removed, diff.renamed)
         self.signals.devices_changed.emit(self.devices_handler.devices_list)
         self.signals.cgroup_changed.emit(self.device_interaction.cgroups_list)
 
@@ -262,14 +337,24 @@ class MainView(QMainWindow, Listener):
         :param state_index: index of memory state to be shown
         :return: None
         """
-        self.pages_graph.set_item(QtGui.QPixmap(f'resources/data/pictures/offsets/p{state_index}.png'))
-        self.pages_stats_graph.set_item(QtGui.QPixmap(f'resources/data/pictures/barplot/b{state_index}.png'))
+        frame = self.get_frame(state_index)
+        self.pages_graph.set_item(QtGui.QPixmap.fromImage(frame.pages))
+        self.pages_stats_graph.set_item(QtGui.QPixmap.fromImage(frame.barplot))
+        self.prefetch_frames(state_index)
+        elapsed_time = self.device_interaction.get_elapsed_time(state_index)
+        if elapsed_time is not None:
+            message = f'Iteration {state_index + 1}, {elapsed_time:.1f} s since collection start'
+            latencies = self.device_interaction.get_latencies(state_index)
+            if latencies:
+                slowest_pid = max(latencies, key=latencies.get)
+                message += f', slowest scan: pid {slowest_pid} in {latencies[slowest_pid]:.2f} s'
+            self._ui.statusBar.showMessage(message)
         self.set_buttons(prev=(self.active_state > 0),
                          nxt=(self.active_state < self.device_interaction.iterations - 1))
 
     @pyqtSlot()
     def collect_data(self):
-        """Runs scripts on a device, pulls data to application, plots and shows graphs
+        """Starts collecting data from device in background, iterations are shown as soon as they are collected
 
         :return: None
         """
@@ -278,9 +363,7 @@ class MainView(QMainWindow, Listener):
             return
 
         self.pages_graph.set_content(False)
-        self.set_buttons(data=False, refc=False, highlight=False)
-        progress = QProgressBar(self)
-        progress.move(self._ui.centralWidget.geometry().center())
+        self.set_buttons(data=False, refc=False, highlight=False, export=False)
 
         dynamics_dialog = DynamicsDialog()
         dynamics_dialog.signals.send_data.connect(self.set_collection_time)
@@ -291,75 +374,161 @@ class MainView(QMainWindow, Listener):
             self.set_buttons(data=True, refc=True)
             return
 
-        iterations = 0
-        self.device_interaction.set_iterations(iterations)
+        self.frames_data = {}
+        self.frame_cache.clear()
+        self.frame_renderer.cancel()
+        self.palette_version += 1  # frames being rendered in background belong to the previous session
+        self.active_state = -1
 
-        QGuiApplication.setOverrideCursor(Qt.WaitCursor)
-        progress.show()
-        start_time = time.time()
-        cur_time = start_time
-        error_pids = []
-        while cur_time - start_time <= self.total_time:
+        self.collector = CollectionThread(self.get_collection_targets(),
+                                          iteration_time=self.iteration_time,
+                                          total_time=self.total_time,
+                                          max_concurrency=self.max_concurrency,
+                                          parent=self)
+        self.collector.iteration_collected.connect(self.add_iteration)
+        self.collector.progress_changed.connect(self.progress.setValue)
+        self.collector.collection_failed.connect(self.collection_failed)
+        self.collector.device_failed.connect(self.device_failed)
+        self.collector.collection_stopped.connect(self.collection_stopped)
+        self.collector.finished.connect(self.finish_collection)
+
+        self.set_buttons(pid=False, cgr=False, nxt=False, prev=False, play=False, stop=True)
+        self.progress.move(self._ui.centralWidget.geometry().center())
+        self.progress.setValue(0)
+        self.progress.show()
+        self.collector.start()
+
+    def get_collection_targets(self):
+        """Finds active processes on compared devices by their names
+
+        :return: list of (DeviceInteraction instance, list of pids) for the current device followed by compared ones
+        :rtype: List
+        """
+        targets = [(self.device_interaction, [pid['pid'] for pid in self.active_pids])]
+        self.compared_pids = {}
+        for device, device_interaction in list(self.compared_devices.items()):
             try:
-                pid_list = [pid['pid'] for pid in self.active_pids]
-                error_pids = self.device_interaction.collect_page_data(cur_iteration=iterations, pid_list=pid_list)
-            except Exception:
-                self.show_msg('Error', 'Either the process is a system process (no access) or it has already completed,'
-                                       'also check tool presence')
-                progress.hide()
-                self.set_buttons(data=False)
-                return
-
-            iterations += 1
-            self.device_interaction.set_iterations(iterations)
-            sleep(self.iteration_time)
-            cur_time = time.time()
-            progress.setValue((cur_time - start_time) * 100 // self.total_time)
-
-        for index, pid in enumerate(self.active_pids):
-            if pid['pid'] in error_pids:
-                pid['corrupted'] = True
-                self._ui.tableWidget.item(index, 0).setCheckState(Qt.Unchecked)
-
-        # drawing all data after collecting to detect corrupted pids
-        # and draw at the same time
-        self.generate_pid_colors(update_active_pids=True if not self.is_data_collected else False)
-        self.display_page_data()
-
-        progress.setValue(100)
-        QGuiApplication.restoreOverrideCursor()
-        progress.hide()
+                device_interaction.collect_pid_list_all()
+            except (CalledProcessError, EmptyDataError):
+                self.show_msg('Error', f'Pid list of {device} unavailable, it is not compared')
+                del self.compared_devices[device]  # so it isn't exported without data
+                continue
+            self.compared_pids[device] = device_interaction.match_pids([pid['title'] for pid in self.active_pids])
+            targets.append((device_interaction, [pid for pid in self.compared_pids[device] if pid is not None]))
+        return targets
 
-        # display first state after collecting data
-        self.active_state = 0
-        self.show_state(self.active_state)
-        self.set_buttons(data=True, refc=True, highlight=True)
-        self.set_buttons(prev=(self.active_state > 0),
-                         nxt=(self.active_state < self.device_interaction.iterations - 1),
-                         play=True)
-        self.is_data_collected = True
+    @pyqtSlot()
+    def stop_collection(self):
+        """Stops collecting data, iterations collected so far are kept
+
+        :return: None
+        """
+        if self.collector is not None:
+            self.collector.stop()
+            self.set_buttons(stop=False)
+
+    @pyqtSlot(int, list)
+    def add_iteration(self, iteration, error_pids):
+        """Shows iteration collected in background, if the previous last one is being shown
 
-    def plot_page_data(self, iteration):
-        """Plots graphics of memory state for given iteration using collected data
+        :param iteration: number of collected iteration
+        :param error_pids: list of pids, for which data couldn't be collected
+        :return: None
+        """
+        corrupted_pids = [index for index, pid in enumerate(self.active_pids)
+                          if pid['pid'] in error_pids and not pid['corrupted']]
+        for index in corrupted_pids:
+            self.active_pids[index]['corrupted'] = True
+            self._ui.tableWidget.item(index, 0).setCheckState(Qt.Unchecked)
+
+        if iteration == 0:
+            # colors are set after the first iteration to detect corrupted pids,
+            # graphics are rendered when they are shown
+            self.generate_pid_colors(update_active_pids=not self.is_data_collected)
+            self.palette_version += 1
+            self.set_buttons(refc=True, highlight=True)
+        elif corrupted_pids:
+            self.generate_pid_colors(update_active_pids=False)
+            self.palette_version += 1
+
+        if self.active_state == iteration - 1:
+            self.active_state = iteration  # the last iteration is followed while it's being shown
+            self.show_state(self.active_state)
+        elif corrupted_pids:
+            self.show_state(self.active_state)
+        else:
+            self.set_buttons(nxt=(self.active_state < self.device_interaction.iterations - 1))
+
+    @pyqtSlot(str)
+    def collection_failed(self, msg):
+        """Reports error stopping data collection
 
-        :param iteration: iteration of memory state to be shown
+        :param msg: text of error message
         :return: None
         """
-        color_list = []
-        highlighted_pid_list = []
-        for pid in list(filter(lambda el: el['corrupted'] is False, self.active_pids)):
-            if pid['highlighted'] is True:
-                highlighted_pid_list.append(pid['pid'])
-            color_list.append(pid['color'])
+        self.show_msg('Error', msg)
+
+    @pyqtSlot(str)
+    def device_failed(self, device):
+        """Reports device which couldn't be examined, the other devices are examined further
 
-        page_data = (self.device_interaction.get_page_data(iteration, present=True),
-                     self.device_interaction.get_page_data(iteration, swapped=True))
+        :param device: serial number of device
+        :return: None
+        """
+        self.show_msg('Error', f'Data of {device} couldn\'t be collected, its processes are marked '
+                               'as error ones at such iterations')
 
-        plot_pids_pagemap(page_data, color_list, iteration)
+    @pyqtSlot(int)
+    def collection_stopped(self, iterations):
+        """Reports number of iterations kept after collection was stopped
 
-        barplot_pids_pagemap(self.device_interaction.get_page_data(iteration),
-                             highlighted_pid_list,
-                             str(iteration))
+        :param iterations: number of collected iterations
+        :return: None
+        """
+        self._ui.statusBar.showMessage(f'Collection stopped, {iterations} iterations collected')
+
+    @pyqtSlot()
+    def finish_collection(self):
+        """Updates GUI state after data collection is over
+
+        :return: None
+        """
+        self.collector.deleteLater()
+        self.collector = None
+        self.progress.setValue(100)
+        self.progress.hide()
+
+        collected = self.device_interaction.iterations > 0
+        self.set_buttons(pid=True, data=True, cgr=True, stop=False, export=collected, play=collected)
+        if collected:
+            self.is_data_collected = True
+
+    @pyqtSlot()
+    def export_pictures(self):
+        """Saves memory state graphics of all iterations to chosen directory as .png
+
+        :return: None
+        """
+        directory = QFileDialog.getExistingDirectory(self, 'Export pictures')
+        if not directory:
+            return
+        for i in range(self.device_interaction.iterations):
+            frame = self.get_frame(i)
+            frame.pages.save(os.path.join(directory, f'p{i}.png'))
+            frame.barplot.save(os.path.join(directory, f'b{i}.png'))
+
+        # pictures of compared devices are put side by side into directories named after them,
+        # the same processes have the same colors on all devices
+        palette = make_palette(self.palette_version, self.active_pids)
+        for device, pids in self.compared_pids.items():
+            device_interaction = self.compared_devices[device]
+            device_palette = remap_palette(palette, pids)
+            os.makedirs(os.path.join(directory, device), exist_ok=True)
+            for i in range(device_interaction.iterations or 0):
+                frame = compose_frame(render_frame_data(device_interaction.get_page_data(i), device_palette.pids),
+                                      device_palette)
+                frame.pages.save(os.path.join(directory, device, f'p{i}.png'))
+                frame.barplot.save(os.path.join(directory, device, f'b{i}.png'))
 
     @pyqtSlot()
     def mem_dynamics(self):
@@ -411,13 +580,14 @@ class MainView(QMainWindow, Listener):
 
     @pyqtSlot(object)
     def set_collection_time(self, data):
-        """Sets iteration_time and total_time with a given data
+        """Sets iteration_time, total_time and max_concurrency with a given data
 
-        :param data: tuple(iteration_time, total_time)
+        :param data: tuple(iteration_time, total_time, max_concurrency)
         :return: None
         """
         self.iteration_time = data[0] if data is not None else -1
         self.total_time = data[1] if data is not None else -1
+        self.max_concurrency = data[2] if data is not None else None
 
     @pyqtSlot(object)
     def set_device_data(self, data):
@@ -431,7 +601,15 @@ class MainView(QMainWindow, Listener):
             self.device_interaction.set_device(self.devices_handler.current_device)
             self.set_buttons(pid=True, cgr=True)
 
-        self._ui.statusBar.showMessage(f'{data[0][0] if len(data) > 0 else "No"} device was connected')
+        # processes are chosen on the first device, the others are examined for comparison
+        self.compared_devices = {}
+        self.compared_pids = {}
+        for row in data[1:]:
+            self.compared_devices[str(row[0])] = DeviceInteraction()
+            self.compared_devices[str(row[0])].set_device(str(row[0]))
+
+        compared = f', compared with {", ".join(self.compared_devices)}' if self.compared_devices else ''
+        self._ui.statusBar.showMessage(f'{data[0][0] if len(data) > 0 else "No"} device was connected{compared}')
         self.react()
 
     @pyqtSlot()
@@ -445,6 +623,7 @@ class MainView(QMainWindow, Listener):
                                    has_select_all=True,
                                    parent=self)
         self.signals.pids_changed.connect(pids_dialog.update)
+        self.signals.pids_diff.connect(pids_dialog.apply_diff)
         pids_dialog.signals.send_data.connect(self.set_active_pids)
         pids_dialog.exec_()
 
@@ -474,8 +653,8 @@ class MainView(QMainWindow, Listener):
             self.show_msg('Message', 'No access to the process data')
             return
         try:
-            data_frame = self.device_interaction.get_page_data(self.active_state).get(pid)
-            table_dialog = TableDialog(pid, data_frame.values)
+            snapshot = self.device_interaction.get_page_data(self.active_state).get(pid)
+            table_dialog = TableDialog(pid, snapshot)
             table_dialog.exec_()
         except Exception:
             self.show_msg('Message', 'Data hasn\'t been collected yet')
@@ -493,7 +672,8 @@ class MainView(QMainWindow, Listener):
         tree_dialog.signals.cgroup_data_request.connect(transfer_data_facade.transfer_data)
         tree_dialog.exec_()
 
-    def set_buttons(self, pid=None, data=None, nxt=None, prev=None, play=None, cgr=None, refc=None, highlight=None):
+    def set_buttons(self, pid=None, data=None, nxt=None, prev=None, play=None, cgr=None, refc=None, highlight=None,
+                    export=None, stop=None):
         """Sets GUI buttons' state - enabled of disabled, according to given flags
 
         :return: None
@@ -509,6 +689,9 @@ class MainView(QMainWindow, Listener):
             refc if refc is not None else self._ui.refreshColorsButton.isEnabled())
         self._ui.highlightButton.setEnabled(
             highlight if highlight is not None else self._ui.highlightButton.isEnabled())
+        self._ui.actionExport_pictures.setEnabled(
+            export if export is not None else self._ui.actionExport_pictures.isEnabled())
+        self._ui.stopButton.setEnabled(stop if stop is not None else self._ui.stopButton.isEnabled())
 
     def change_pid_color(self):
         """Changes color of a pid in graphical representation
@@ -522,7 +705,7 @@ class MainView(QMainWindow, Listener):
                                                   QColorDialog.getColor()
         self.active_pids[index]['color'].setAlpha(alpha)
         self.set_table_color(index)
-        self.display_page_data()
+        self.palette_version += 1
         self.show_state(self.active_state)
 
     def edit_alpha(self, pid_table_index, alpha):
@@ -562,5 +745,5 @@ class MainView(QMainWindow, Listener):
             else:
                 self.active_pids[index]['highlighted'] = True
                 self.edit_alpha(index, 255)  # make highlighted
-        self.display_page_data()
+        self.palette_version += 1
         self.show_state(self.active_state)
@@ -6,8 +6,9 @@ from src.qt_ui.dynamics_dialog_ui import Ui_DynamicsDialog
 
 
 class DynamicsDialog(QDialog):
-    """Widget provides input of two values: total_time - limit of time that all data collection would take,
-    and iteration_time - time to wait between iterations of data collection
+    """Widget provides input of collection settings: total_time - limit of time that all data collection would take,
+    iteration_time - time to wait between iterations of data collection, and max_concurrency - max number
+    of processes scanned at once by separate scans, 0 if all processes are scanned by one scan
     """
     def __init__(self):
         super(DynamicsDialog, self).__init__()
@@ -35,7 +36,7 @@ class DynamicsDialog(QDialog):
         iteration_time = float(self._ui.iterationTimeEdit.text())
         total_time = float(self._ui.totalTimeEdit.text())
         if iteration_time <= total_time:
-            return iteration_time, total_time
+            return iteration_time, total_time, self._ui.concurrencySpinBox.value() or None
         else:
             return None
 
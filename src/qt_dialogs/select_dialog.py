@@ -1,21 +1,20 @@
-from PyQt5 import QtWidgets
-from PyQt5.QtCore import Qt, pyqtSlot
-from PyQt5.QtWidgets import QDialog, QTableWidgetItem, QAbstractItemView
+from PyQt5.QtCore import Qt, pyqtSlot, QSortFilterProxyModel
+from PyQt5.QtWidgets import QDialog, QAbstractItemView
 
 from src.custom_signals import CustomSignals
+from src.qt_models.select_model import SelectModel
 from src.qt_ui.select_dialog_ui import Ui_SelectDialog
 
 
 class SelectDialog(QDialog):
     """Widget for displaying data (represented as list) in table form
     rows can be selected using checkboxes and wrapped in list, which can be accessed
-    with get_checked() method
+    with get_checked() method, rows are filtered by text typed in search field
     """
     def __init__(self, data_list, label='', close_on_detach=True, has_select_all=False, parent=None):
         super(SelectDialog, self).__init__(parent)
-        self.data_list = []
-        self.rows = 0
-        self.cols = 0
+        self.table_model = None
+        self.table_proxy = None
         self.label = label
         self.signals = CustomSignals()
         self.close_on_detach = close_on_detach
@@ -27,13 +26,7 @@ class SelectDialog(QDialog):
         self._ui = Ui_SelectDialog()
         self._ui.setupUi(self)
         self._ui.label.setText(self.label)
-
-        self._ui.tableWidget.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self._ui.tableWidget.setSelectionMode(QAbstractItemView.SingleSelection)
-        self._ui.tableWidget.horizontalHeader().setStretchLastSection(True)
-        self._ui.tableWidget.horizontalHeader().hide()
-        self._ui.tableWidget.verticalHeader().hide()
-        self._ui.tableWidget.setEditTriggers(QtWidgets.QTableWidget.NoEditTriggers)
+        self.init_table()
 
         self._ui.buttonBox.clicked.connect(self.button_clicked)
         self._ui.checkBox.clicked.connect(self.select_all_button_clicked)
@@ -41,51 +34,47 @@ class SelectDialog(QDialog):
         if not has_select_all:
             self._ui.checkBox.hide()
 
-    def get_checked(self):
-        checked_data = []
-        for i in range(self.rows):
-            item = self._ui.tableWidget.item(i, 0)
-            if item is not None and item.checkState() == Qt.Checked:
-                checked_data.append(self.data_list[i])
+    # table view shows rows of model through proxy filtering them by any column
+    def init_table(self):
+        self.table_model = SelectModel(parent=self)
+        self.table_proxy = QSortFilterProxyModel(self)
+        self.table_proxy.setSourceModel(self.table_model)
+        self.table_proxy.setFilterKeyColumn(-1)
+        self.table_proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self._ui.searchEdit.textChanged.connect(self.table_proxy.setFilterFixedString)
+
+        self._ui.tableView.setModel(self.table_proxy)
+        self._ui.tableView.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self._ui.tableView.setSelectionMode(QAbstractItemView.SingleSelection)
+        self._ui.tableView.horizontalHeader().setStretchLastSection(True)
+        self._ui.tableView.horizontalHeader().hide()
+        self._ui.tableView.verticalHeader().hide()
+        self._ui.tableView.setEditTriggers(QAbstractItemView.NoEditTriggers)
+
+    @property
+    def data_list(self):
+        return self.table_model.rows
 
-        return checked_data
+    def get_checked(self):
+        return self.table_model.checked_rows()
 
     def button_clicked(self):
         self.signals.send_data.emit(self.get_checked())
 
+    # rows hidden by search aren't affected
     def select_all_button_clicked(self):
         check_all = self._ui.checkBox.checkState() == Qt.Checked
-        for i in range(self.rows):
-            self._ui.tableWidget.item(i, 0).setCheckState(Qt.Checked if check_all else Qt.Unchecked)
+        keys = [self.table_model.rows[self.table_proxy.mapToSource(self.table_proxy.index(i, 0)).row()][0]
+                for i in range(self.table_proxy.rowCount())]
+        self.table_model.set_checked(keys, check_all)
 
     def set_data(self, data_list):
-        if len(data_list) == 0:
-            self._ui.tableWidget.clear()
-            return
-
-        old_checked = self.get_checked()
-
-        # check if given data list in multi-dimensional
-        # if not make it multi-dimensional to fit in table widget
-        if not all(isinstance(el, list) for el in data_list):
-            data_list = tuple([el] for el in data_list)
-
-        self.data_list = data_list
-
-        self.rows = len(self.data_list)
-        self.cols = len(self.data_list[0])
-
-        self._ui.tableWidget.setRowCount(self.rows)
-        self._ui.tableWidget.setColumnCount(self.cols)
-
-        for i in range(self.rows):
-            for j in range(self.cols):
-                item = QTableWidgetItem()
-                if j == 0:
-                    item.setCheckState(Qt.Checked if self.data_list[i] in old_checked else Qt.Unchecked)
+        self.table_model.set_rows(data_list)
 
-                item.setText(str(self.data_list[i][j]))
-                self._ui.tableWidget.setItem(i, j, item)
+    # removes, inserts and renames changed rows only, rows of diff are lists like the ones of data list
+    @pyqtSlot(list, list, list)
+    def apply_diff(self, added, removed, renamed=()):
+        self.table_model.apply_diff(added, removed, renamed)
 
     @pyqtSlot(list)
     def update(self, new_data_list):
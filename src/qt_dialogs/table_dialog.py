@@ -1,22 +1,37 @@
-from PyQt5.QtWidgets import QDialog
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QDialog, QHeaderView
 
 from src.qt_models.pagemap_model import PagemapModel
 from src.qt_ui.table_dialog_ui import Ui_TableDialog
 
+# Values of a flag selected by items of filter combo boxes: any, set, unset
+FILTER_VALUES = [None, True, False]
+
 
 class TableDialog(QDialog):
-    """Widget for displaying data (represented as list) in table form
+    """Widget for displaying page by page data of a process (represented as PageSnapshot) in table form,
+    pages can be sorted by any column and filtered by their flags
     """
-    def __init__(self, pid, pages_list):
+    def __init__(self, pid, snapshot):
         super(TableDialog, self).__init__()
 
         self.pid = pid
-        self.pages_list = pages_list
+        self.snapshot = snapshot
         self._ui = Ui_TableDialog()
         self._ui.setupUi(self)
 
         self._ui.pidLineEdit.setText(str(pid))
 
-        self.pagemap_model = PagemapModel(self.pages_list)
+        # rows are of the same height, so views don't measure each of them
+        self._ui.pidTableView.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.pagemap_model = PagemapModel(self.snapshot)
         self._ui.pidTableView.setModel(self.pagemap_model)
         self._ui.pidTableView.horizontalHeader().setStretchLastSection(True)
+        # pages are shown in order of addresses in memory until a column is clicked
+        self._ui.pidTableView.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self._ui.pidTableView.setSortingEnabled(True)
+
+        for column, combo_box in [(1, self._ui.statusComboBox), (2, self._ui.dirtyComboBox),
+                                  (3, self._ui.anonComboBox)]:
+            combo_box.currentIndexChanged.connect(
+                lambda index, column=column: self.pagemap_model.set_filter(column, FILTER_VALUES[index]))
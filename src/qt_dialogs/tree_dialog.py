@@ -1,5 +1,3 @@
-from PyQt5.QtWidgets import QAbstractItemView, QTableWidget
-
 from src.custom_signals import CustomSignals
 from src.qt_dialogs.select_dialog import SelectDialog
 from src.qt_models.pid_tree_model import PidTreeModel
@@ -36,12 +34,7 @@ class TreeDialog(SelectDialog):
         self._ui.lineEdit.setText('Choose cgroup')
 
         self._ui.label.setText('Select PIDs')
-        self._ui.tableWidget.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self._ui.tableWidget.setSelectionMode(QAbstractItemView.SingleSelection)
-        self._ui.tableWidget.horizontalHeader().setStretchLastSection(True)
-        self._ui.tableWidget.horizontalHeader().hide()
-        self._ui.tableWidget.verticalHeader().hide()
-        self._ui.tableWidget.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.init_table()
 
         self._ui.showButton.clicked.connect(self.show_button_clicked)
         self._ui.buttonBox.clicked.connect(self.button_clicked)
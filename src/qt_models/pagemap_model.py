@@ -1,34 +1,118 @@
+from collections import OrderedDict
+
+import numpy as np
 from PyQt5.QtCore import QAbstractTableModel, Qt, QVariant
+from PyQt5.QtGui import QFont
 
 
 class PagemapModel(QAbstractTableModel):
     """Model for tableView containing pid's info data
+    reads pages straight from snapshot's columns, shown pages are selected and ordered by an array of indices,
+    the first row sums up shown pages
     """
-    def __init__(self, pages_list):
+    HEADER = ['Address', 'Status', 'Dirty', 'Anon']
+    BLOCK_SIZE = 256  # number of rows formatted at once
+    CACHED_BLOCKS = 64
+
+    def __init__(self, snapshot):
         super(PagemapModel, self).__init__()
-        self.pages_list = pages_list
-        self.header = ['Address', 'Status', 'Dirty', 'Anon']
-        self.visual_data = [lambda x: hex(self.pages_list[x][0]),
-                            lambda x: 'Present' if self.pages_list[x][1] == 1 else 'Swapped',
-                            lambda x: 'Yes' if self.pages_list[x][2] == 1 else 'No',
-                            lambda x: 'Yes' if self.pages_list[x][3] == 1 else 'No',
-                            ]
+        self.offsets = snapshot.offsets
+        self.flags = snapshot.flags
+        self.bits = [None, snapshot.PRESENT, snapshot.DIRTY, snapshot.ANON]
+        self.labels = [None, ('Swapped', 'Present'), ('No', 'Yes'), ('No', 'Yes')]
+
+        self.filters = {}
+        self.sort_column = None
+        self.sort_order = Qt.AscendingOrder
+        self.rows = np.arange(len(self.offsets))
+        self.summary = []
+        self.blocks = OrderedDict()
+        self.summarize()
 
     def rowCount(self, parent=None, *args, **kwargs):
-        return len(self.pages_list)
+        return len(self.rows) + 1
 
     def columnCount(self, parent=None, *args, **kwargs):
-        return 4
+        return len(self.HEADER)
 
     def headerData(self, section, orientation, role=Qt.DisplayRole):
         if orientation == Qt.Horizontal and role == Qt.DisplayRole:
-            return QVariant(self.header[section])
+            return QVariant(self.HEADER[section])
         if orientation == Qt.Vertical and role == Qt.DisplayRole:
-            return QVariant(str(section + 1))
+            return QVariant(str(section) if section > 0 else 'Total')
         return QVariant()
 
     def data(self, index, role=None):
-        if role == Qt.DisplayRole:
-            return self.visual_data[index.column()](index.row())
-        else:
+        row, column = index.row() - 1, index.column()
+        if role == Qt.FontRole and row < 0:
+            font = QFont()
+            font.setBold(True)
+            return font
+        if role != Qt.DisplayRole:
             return QVariant()
+        if row < 0:
+            return self.summary[column]
+        if column > 0:
+            return self.labels[column][bool(self.flags[self.rows[row]] & self.bits[column])]
+        return self.block(row // self.BLOCK_SIZE)[row % self.BLOCK_SIZE]
+
+    # formats addresses of a block of shown rows, recently used blocks are cached
+    def block(self, number):
+        block = self.blocks.get(number)
+        if block is not None:
+            self.blocks.move_to_end(number)
+            return block
+
+        begin = number * self.BLOCK_SIZE
+        block = [hex(offset) for offset in self.offsets[self.rows[begin:begin + self.BLOCK_SIZE]].tolist()]
+        self.blocks[number] = block
+        if len(self.blocks) > self.CACHED_BLOCKS:
+            self.blocks.popitem(last=False)
+        return block
+
+    def summarize(self):
+        flags = self.flags[self.rows]
+        present = np.count_nonzero(flags & self.bits[1])
+        self.summary = [f'{len(flags)} pages',
+                        f'{present} present, {len(flags) - present} swapped',
+                        f'{np.count_nonzero(flags & self.bits[2])} dirty',
+                        f'{np.count_nonzero(flags & self.bits[3])} anon']
+
+    # shows pages having given value of a flag, column is one of flag columns, value is None to show all pages
+    def set_filter(self, column, value):
+        if value is None:
+            self.filters.pop(column, None)
+        else:
+            self.filters[column] = bool(value)
+
+        self.beginResetModel()
+        mask = np.ones(len(self.flags), dtype=bool)
+        for filter_column, filter_value in self.filters.items():
+            mask &= (self.flags & self.bits[filter_column]).astype(bool) == filter_value
+        self.rows = np.flatnonzero(mask)
+        self.order_rows()
+        self.summarize()
+        self.endResetModel()
+
+    # model is reset rather than its layout changed, views don't have to remap indices of millions of rows then
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sort_column, self.sort_order = column, order
+        self.beginResetModel()
+        self.order_rows()
+        self.endResetModel()
+
+    # sorts shown rows by sort column, rows with equal values keep their order
+    def order_rows(self):
+        self.blocks.clear()
+        if self.sort_column is None or self.sort_column < 0:
+            if np.any(self.rows[1:] < self.rows[:-1]):
+                self.rows.sort()
+        else:
+            rows = self.rows if self.sort_order == Qt.AscendingOrder else self.rows[::-1]
+            if self.sort_column == 0:
+                rows = rows[np.argsort(self.offsets[rows], kind='stable')]
+            else:
+                # flag has two values, rows are split instead of being sorted
+                is_set = (self.flags[rows] & self.bits[self.sort_column]).astype(bool)
+                rows = np.concatenate([rows[~is_set], rows[is_set]])
+            self.rows = rows if self.sort_order == Qt.AscendingOrder else rows[::-1]
@@ -5,37 +5,128 @@ from src.qt_models.tree_model_node import PidNode
 
 class PidTreeModel(QAbstractItemModel):
     """Model for pid data representation in a QTreeView widget, contains processes' tree
+    nodes are found by pid in a dict, tree is updated by moving, inserting and removing subtrees,
+    processes whose parent isn't in the tree are attached to the root until their parent appears
     """
+    # views walk all expanded rows on every removal, model is reset at once if more subtrees change
+    MAX_INCREMENTAL_CHANGES = 8
 
     def __init__(self, parent=None):
         super(PidTreeModel, self).__init__(parent)
 
         self.treeView = parent
         self.headers = ['pid']
-        self.tasks = []
+        self.processes = {}
 
         self.columns = 1
         self.root = PidNode()
-        self.used = []
+        self.nodes = {}
+        self.orphans = {}  # ppid: pids of processes attached to the root while waiting for their parent
 
-    # fill tree model with nodes from data, data is list of [pid, ppid, name_of_pid]
-    def setData(self, data=[]):
-        self.root = PidNode()
-        node_dict = {}
-        self.tasks = []
-
-        if len(data) == 0:
-            return
-
-        for d in data:
-            node_dict[d[0]] = PidNode(str(d[0]) + ' - ' + d[2])
-            self.tasks.append([str(d[0]), str(d[2])])
+    # list of [pid, name_of_pid] for each process in tree
+    @property
+    def tasks(self):
+        return [[str(pid), str(name)] for pid, (_, name) in self.processes.items()]
 
-        for d in data:
-            if d[1] == 0:
-                node_dict[d[0]].set_parent(self.root)
+    # update tree model with nodes from data, data is list of [pid, ppid, name_of_pid],
+    # nodes of processes which are gone or changed are removed, nodes of new processes are inserted
+    def setData(self, data=[]):
+        processes = {d[0]: (d[1], d[2]) for d in data}
+        old_processes = self.processes
+        removed = {pid for pid, process in old_processes.items() if processes.get(pid) != process}
+        self.processes = processes
+
+        # children of removed processes are moved with their subtrees
+        detached = removed | {node.pid for pid in removed for node in self.nodes[pid].children
+                              if node.pid not in removed}
+        added = [pid for pid in processes if pid not in self.nodes or pid in removed]
+        adopted = sum(len(self.orphans.get(pid, ())) for pid in added)
+        incremental = len(detached) + len(added) + adopted <= self.MAX_INCREMENTAL_CHANGES
+        if not incremental:
+            self.beginResetModel()
+
+        for pid in detached:
+            node = self.nodes[pid]
+            self.discard_orphan(pid, old_processes[pid][0])
+            if node.parent is None:
+                continue
+            if incremental and self.is_shown(node):
+                self.beginRemoveRows(self.index_of_node(node.parent), node.row, node.row)
+                node.parent.remove_child(node.row)
+                self.endRemoveRows()
+            else:
+                node.parent.remove_child(node.row)  # subtree it belongs to is already removed
+        for pid in removed:
+            del self.nodes[pid]
+
+        attached = added + list(detached - removed)
+        for pid in attached:
+            if pid not in self.nodes:
+                self.nodes[pid] = PidNode(pid, f'{pid} - {processes[pid][1]}')
+        attached_pids = set(attached)
+
+        # subtrees are put together first, then each of them is inserted as a whole
+        inserted = {}
+        for pid in attached:
+            parent = self.parent_node(pid)
+            if parent is self.root and processes[pid][0] != pid:
+                self.orphans.setdefault(processes[pid][0], set()).add(pid)
+            if parent is self.root or parent.pid not in attached_pids:
+                inserted.setdefault(parent, []).append(self.nodes[pid])
             else:
-                node_dict[d[0]].set_parent(node_dict[d[1]])
+                parent.append_child(self.nodes[pid])
+        for parent, children in inserted.items():
+            if incremental:
+                self.beginInsertRows(self.index_of_node(parent), len(parent), len(parent) + len(children) - 1)
+            for child in children:
+                parent.append_child(child)
+            if incremental:
+                self.endInsertRows()
+
+        # processes waiting for the inserted ones are moved from the root under them
+        for pid in attached:
+            parent = self.nodes[pid]
+            for orphan_pid in self.orphans.pop(pid, ()):
+                node = self.nodes[orphan_pid]
+                if self.is_ancestor(node, parent):
+                    continue
+                if incremental:
+                    self.beginMoveRows(QModelIndex(), node.row, node.row, self.index_of_node(parent), len(parent))
+                self.root.remove_child(node.row)
+                parent.append_child(node)
+                if incremental:
+                    self.endMoveRows()
+
+        if not incremental:
+            self.endResetModel()
+
+    def parent_node(self, pid):
+        ppid = self.processes[pid][0]
+        return self.nodes.get(ppid, self.root) if ppid != pid else self.root
+
+    def discard_orphan(self, pid, ppid):
+        orphans = self.orphans.get(ppid)
+        if orphans is not None:
+            orphans.discard(pid)
+            if not orphans:
+                del self.orphans[ppid]
+
+    def is_ancestor(self, ancestor, node):
+        while node is not None:
+            if node is ancestor:
+                return True
+            node = node.parent
+        return False
+
+    def is_shown(self, node):
+        while node.parent is not None:
+            node = node.parent
+        return node is self.root
+
+    def index_of_node(self, node):
+        if node is self.root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
 
     def headerData(self, section, orientation, role):
         if orientation == Qt.Horizontal and role == Qt.DisplayRole:
@@ -43,6 +134,8 @@ class PidTreeModel(QAbstractItemModel):
         return QVariant()
 
     def index(self, row, column, parent):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
         node = self.node_from_index(parent)
         return self.createIndex(row, column, node.child_at_row(row))
 
@@ -59,7 +152,7 @@ class PidTreeModel(QAbstractItemModel):
         node = self.node_from_index(index)
 
         if index.column() == 0:
-            return QVariant(node.pid)
+            return QVariant(node.label)
         else:
             return QVariant()
 
@@ -76,22 +169,10 @@ class PidTreeModel(QAbstractItemModel):
         if not child.isValid():
             return QModelIndex()
 
-        node = self.node_from_index(child)
-
-        if node is None:
-            return QModelIndex()
-
-        parent = node.parent
-
-        if parent is None:
-            return QModelIndex()
-
-        grandparent = parent.parent
-        if grandparent is None:
+        parent = child.internalPointer().parent
+        if parent is None or parent is self.root:
             return QModelIndex()
-        row = grandparent.row_of_child(parent)
-
-        return self.createIndex(row, 0, parent)
+        return self.createIndex(parent.row, 0, parent)
 
     def node_from_index(self, index):
         return index.internalPointer() if index.isValid() else self.root
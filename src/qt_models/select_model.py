@@ -0,0 +1,112 @@
+import bisect
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, QVariant
+
+
+class SelectModel(QAbstractTableModel):
+    """Model for table of rows which can be checked, rows are kept sorted and changed one by one,
+    so selection and scroll position of views survive updates.
+    Check state is kept in a set of rows' keys (the first value of a row, e.g. pid)
+    """
+    def __init__(self, rows=(), parent=None):
+        super(SelectModel, self).__init__(parent)
+        self.rows = []
+        self.columns = 0
+        self.checked = set()
+        self.set_rows(rows)
+
+    def rowCount(self, parent=QModelIndex(), *args, **kwargs):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex(), *args, **kwargs):
+        return 0 if parent.isValid() else self.columns
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return QVariant()
+        row = self.rows[index.row()]
+        if role == Qt.DisplayRole:
+            return str(row[index.column()])
+        if role == Qt.CheckStateRole and index.column() == 0:
+            return Qt.Checked if row[0] in self.checked else Qt.Unchecked
+        return QVariant()
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.CheckStateRole or index.column() != 0:
+            return False
+        key = self.rows[index.row()][0]
+        if value == Qt.Checked:
+            self.checked.add(key)
+        else:
+            self.checked.discard(key)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+    def flags(self, index):
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == 0:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    # replaces rows, only rows which differ are removed and inserted unless number of columns changes,
+    # rows may be lists of values or single values
+    def set_rows(self, rows):
+        rows = [list(row) if isinstance(row, (list, tuple)) else [row] for row in rows]
+        if not self.rows or not rows or len(rows[0]) != self.columns:
+            self.beginResetModel()
+            self.rows = sorted(rows)
+            self.columns = len(rows[0]) if rows else 0
+            self.checked &= {row[0] for row in self.rows}
+            self.endResetModel()
+            return
+
+        current, new = set(map(tuple, self.rows)), set(map(tuple, rows))
+        self.apply_diff(sorted(map(list, new - current)), list(map(list, current - new)))
+
+    # removes and inserts given rows, removed rows are unchecked,
+    # renamed rows replace rows with the same key and stay checked
+    def apply_diff(self, added, removed, renamed=()):
+        for row in map(list, removed):
+            i = bisect.bisect_left(self.rows, row)
+            if i < len(self.rows) and self.rows[i] == row:
+                self.beginRemoveRows(QModelIndex(), i, i)
+                del self.rows[i]
+                self.endRemoveRows()
+                self.checked.discard(row[0])
+
+        if not self.rows:
+            self.set_rows(added)
+            return
+        for row in map(list, added):
+            i = bisect.bisect(self.rows, row)
+            self.beginInsertRows(QModelIndex(), i, i)
+            self.rows.insert(i, row)
+            self.endInsertRows()
+
+        for row in map(list, renamed):
+            i = bisect.bisect_left(self.rows, row[:1])
+            if i == len(self.rows) or self.rows[i][0] != row[0]:
+                continue
+            if (i == 0 or self.rows[i - 1] <= row) and (i + 1 == len(self.rows) or row <= self.rows[i + 1]):
+                self.rows[i] = row
+                self.dataChanged.emit(self.index(i, 0), self.index(i, self.columns - 1))
+                continue
+            self.beginRemoveRows(QModelIndex(), i, i)
+            del self.rows[i]
+            self.endRemoveRows()
+            i = bisect.bisect(self.rows, row)
+            self.beginInsertRows(QModelIndex(), i, i)
+            self.rows.insert(i, row)
+            self.endInsertRows()
+
+    # checks or unchecks rows with given keys
+    def set_checked(self, keys, checked=True):
+        if checked:
+            self.checked.update(keys)
+        else:
+            self.checked.difference_update(keys)
+        if self.rows:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.rows) - 1, 0), [Qt.CheckStateRole])
+
+    def checked_rows(self):
+        return [row for row in self.rows if row[0] in self.checked]
@@ -1,33 +1,40 @@
 # this class does not inherit from model, it is just a node to be in a tree
 class PidNode(object):
-    """Node element for PidTreeModel
+    """Node element for PidTreeModel, node knows its row among its parent's children
     """
+    __slots__ = ('pid', 'label', 'parent', 'children', 'row')
 
-    def __init__(self, pid=-1, parent=None):
+    def __init__(self, pid=-1, label='', parent=None):
         self.pid = pid
-        self.parent = parent
+        self.label = label
+        self.parent = None
         self.children = []
+        self.row = 0
         self.set_parent(parent)
 
     def set_parent(self, parent):
         if parent is not None:
-            self.parent = parent
-            self.parent.append_child(self)
+            parent.append_child(self)
         else:
             self.parent = None
 
     def append_child(self, child):
+        child.parent = self
+        child.row = len(self.children)
         self.children.append(child)
 
     def child_at_row(self, row):
         return self.children[row]
 
     def row_of_child(self, child):
-        return self.children.index(child)
+        return child.row
 
+    # rows of the following children are shifted
     def remove_child(self, row):
-        value = self.children[row]
-        self.children.remove(value)
+        child = self.children.pop(row)
+        child.parent = None
+        for i in range(row, len(self.children)):
+            self.children[i].row = i
         return True
 
     def __len__(self):
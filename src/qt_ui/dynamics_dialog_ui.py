@@ -11,7 +11,7 @@ from PyQt5 import QtCore, QtGui, QtWidgets
 class Ui_DynamicsDialog(object):
     def setupUi(self, DynamicsDialog):
         DynamicsDialog.setObjectName("DynamicsDialog")
-        DynamicsDialog.resize(253, 187)
+        DynamicsDialog.resize(253, 237)
         self.gridLayout = QtWidgets.QGridLayout(DynamicsDialog)
         self.gridLayout.setObjectName("gridLayout")
         self.totalTimeEdit = QtWidgets.QLineEdit(DynamicsDialog)
@@ -27,21 +27,30 @@ class Ui_DynamicsDialog(object):
         self.buttonBox.setOrientation(QtCore.Qt.Horizontal)
         self.buttonBox.setStandardButtons(QtWidgets.QDialogButtonBox.Ok)
         self.buttonBox.setObjectName("buttonBox")
-        self.gridLayout.addWidget(self.buttonBox, 5, 0, 1, 1)
+        self.gridLayout.addWidget(self.buttonBox, 7, 0, 1, 1)
         self.iterationTimeEdit = QtWidgets.QLineEdit(DynamicsDialog)
         self.iterationTimeEdit.setReadOnly(False)
         self.iterationTimeEdit.setObjectName("iterationTimeEdit")
         self.gridLayout.addWidget(self.iterationTimeEdit, 2, 0, 1, 1)
+        self.concurrencyLabel = QtWidgets.QLabel(DynamicsDialog)
+        self.concurrencyLabel.setObjectName("concurrencyLabel")
+        self.gridLayout.addWidget(self.concurrencyLabel, 5, 0, 1, 1)
+        self.concurrencySpinBox = QtWidgets.QSpinBox(DynamicsDialog)
+        self.concurrencySpinBox.setMaximum(64)
+        self.concurrencySpinBox.setObjectName("concurrencySpinBox")
+        self.gridLayout.addWidget(self.concurrencySpinBox, 6, 0, 1, 1)
 
         self.retranslateUi(DynamicsDialog)
         self.buttonBox.accepted.connect(DynamicsDialog.accept)
         self.buttonBox.rejected.connect(DynamicsDialog.reject)
         QtCore.QMetaObject.connectSlotsByName(DynamicsDialog)
         DynamicsDialog.setTabOrder(self.iterationTimeEdit, self.totalTimeEdit)
+        DynamicsDialog.setTabOrder(self.totalTimeEdit, self.concurrencySpinBox)
 
     def retranslateUi(self, DynamicsDialog):
         _translate = QtCore.QCoreApplication.translate
         DynamicsDialog.setWindowTitle(_translate("DynamicsDialog", "Collect Data Dialog"))
         self.iterationTimeLabel.setText(_translate("DynamicsDialog", "Total measurment time in sec."))
         self.totalTimeLabel.setText(_translate("DynamicsDialog", "Time between measurements in sec."))
+        self.concurrencyLabel.setText(_translate("DynamicsDialog", "Processes scanned at once (0 - all by one scan)"))
 
@@ -92,7 +92,15 @@ class Ui_MainWindow(object):
         sizePolicy.setHeightForWidth(self.dataButton.sizePolicy().hasHeightForWidth())
         self.dataButton.setSizePolicy(sizePolicy)
         self.dataButton.setObjectName("dataButton")
-        self.gridLayout_2.addWidget(self.dataButton, 2, 0, 1, 2)
+        self.gridLayout_2.addWidget(self.dataButton, 2, 0, 1, 1)
+        self.stopButton = QtWidgets.QPushButton(self.buttonsBox)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.stopButton.sizePolicy().hasHeightForWidth())
+        self.stopButton.setSizePolicy(sizePolicy)
+        self.stopButton.setObjectName("stopButton")
+        self.gridLayout_2.addWidget(self.stopButton, 2, 1, 1, 1)
         self.playButton = QtWidgets.QPushButton(self.buttonsBox)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Preferred)
         sizePolicy.setHorizontalStretch(0)
@@ -136,15 +144,21 @@ class Ui_MainWindow(object):
         self.menuBar = QtWidgets.QMenuBar(MainWindow)
         self.menuBar.setGeometry(QtCore.QRect(0, 0, 1043, 22))
         self.menuBar.setObjectName("menuBar")
+        self.menuFile = QtWidgets.QMenu(self.menuBar)
+        self.menuFile.setObjectName("menuFile")
         self.menuPIDs = QtWidgets.QMenu(self.menuBar)
         self.menuPIDs.setObjectName("menuPIDs")
         MainWindow.setMenuBar(self.menuBar)
         self.statusBar = QtWidgets.QStatusBar(MainWindow)
         self.statusBar.setObjectName("statusBar")
         MainWindow.setStatusBar(self.statusBar)
+        self.actionExport_pictures = QtWidgets.QAction(MainWindow)
+        self.actionExport_pictures.setObjectName("actionExport_pictures")
         self.actionShow_CGroup_tree = QtWidgets.QAction(MainWindow)
         self.actionShow_CGroup_tree.setObjectName("actionShow_CGroup_tree")
+        self.menuFile.addAction(self.actionExport_pictures)
         self.menuPIDs.addAction(self.actionShow_CGroup_tree)
+        self.menuBar.addAction(self.menuFile.menuAction())
         self.menuBar.addAction(self.menuPIDs.menuAction())
 
         self.retranslateUi(MainWindow)
@@ -159,9 +173,12 @@ class Ui_MainWindow(object):
         self.groupBox_2.setTitle(_translate("MainWindow", "Pages percentage"))
         self.pidsButton.setText(_translate("MainWindow", "Show pids"))
         self.dataButton.setText(_translate("MainWindow", "Collect Data"))
+        self.stopButton.setText(_translate("MainWindow", "Stop"))
         self.playButton.setText(_translate("MainWindow", "Play"))
         self.prevButton.setText(_translate("MainWindow", "Prev"))
         self.nextButton.setText(_translate("MainWindow", "Next"))
         self.devicesButton.setText(_translate("MainWindow", "Devices"))
+        self.menuFile.setTitle(_translate("MainWindow", "&File"))
         self.menuPIDs.setTitle(_translate("MainWindow", "&PIDs"))
+        self.actionExport_pictures.setText(_translate("MainWindow", "&Export pictures"))
         self.actionShow_CGroup_tree.setText(_translate("MainWindow", "&Show CGroup tree"))
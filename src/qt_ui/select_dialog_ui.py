@@ -20,11 +20,12 @@ class Ui_SelectDialog(object):
         self.label.setText("")
         self.label.setObjectName("label")
         self.gridLayout.addWidget(self.label, 0, 0, 1, 2)
-        self.tableWidget = QtWidgets.QTableWidget(SelectDialog)
-        self.tableWidget.setObjectName("tableWidget")
-        self.tableWidget.setColumnCount(0)
-        self.tableWidget.setRowCount(0)
-        self.gridLayout.addWidget(self.tableWidget, 1, 0, 1, 4)
+        self.searchEdit = QtWidgets.QLineEdit(SelectDialog)
+        self.searchEdit.setObjectName("searchEdit")
+        self.gridLayout.addWidget(self.searchEdit, 0, 2, 1, 1)
+        self.tableView = QtWidgets.QTableView(SelectDialog)
+        self.tableView.setObjectName("tableView")
+        self.gridLayout.addWidget(self.tableView, 1, 0, 1, 4)
         self.buttonBox = QtWidgets.QDialogButtonBox(SelectDialog)
         self.buttonBox.setOrientation(QtCore.Qt.Horizontal)
         self.buttonBox.setStandardButtons(QtWidgets.QDialogButtonBox.Ok)
@@ -42,4 +43,5 @@ class Ui_SelectDialog(object):
     def retranslateUi(self, SelectDialog):
         _translate = QtCore.QCoreApplication.translate
         SelectDialog.setWindowTitle(_translate("SelectDialog", "Dialog"))
+        self.searchEdit.setPlaceholderText(_translate("SelectDialog", "Search"))
         self.checkBox.setText(_translate("SelectDialog", "Select All"))
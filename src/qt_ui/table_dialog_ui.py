@@ -22,14 +22,32 @@ class Ui_TableDialog(object):
         self.pidLineEdit.setReadOnly(True)
         self.pidLineEdit.setObjectName("pidLineEdit")
         self.gridLayout.addWidget(self.pidLineEdit, 0, 1, 1, 1)
+        self.statusComboBox = QtWidgets.QComboBox(TableDialog)
+        self.statusComboBox.setObjectName("statusComboBox")
+        self.statusComboBox.addItem("")
+        self.statusComboBox.addItem("")
+        self.statusComboBox.addItem("")
+        self.gridLayout.addWidget(self.statusComboBox, 0, 2, 1, 1)
+        self.dirtyComboBox = QtWidgets.QComboBox(TableDialog)
+        self.dirtyComboBox.setObjectName("dirtyComboBox")
+        self.dirtyComboBox.addItem("")
+        self.dirtyComboBox.addItem("")
+        self.dirtyComboBox.addItem("")
+        self.gridLayout.addWidget(self.dirtyComboBox, 0, 3, 1, 1)
+        self.anonComboBox = QtWidgets.QComboBox(TableDialog)
+        self.anonComboBox.setObjectName("anonComboBox")
+        self.anonComboBox.addItem("")
+        self.anonComboBox.addItem("")
+        self.anonComboBox.addItem("")
+        self.gridLayout.addWidget(self.anonComboBox, 0, 4, 1, 1)
         self.pidTableView = QtWidgets.QTableView(TableDialog)
         self.pidTableView.setObjectName("pidTableView")
-        self.gridLayout.addWidget(self.pidTableView, 1, 0, 1, 2)
+        self.gridLayout.addWidget(self.pidTableView, 1, 0, 1, 5)
         self.buttonBox = QtWidgets.QDialogButtonBox(TableDialog)
         self.buttonBox.setOrientation(QtCore.Qt.Horizontal)
         self.buttonBox.setStandardButtons(QtWidgets.QDialogButtonBox.Ok)
         self.buttonBox.setObjectName("buttonBox")
-        self.gridLayout.addWidget(self.buttonBox, 2, 0, 1, 2)
+        self.gridLayout.addWidget(self.buttonBox, 2, 0, 1, 5)
         self.retranslateUi(TableDialog)
         self.buttonBox.accepted.connect(TableDialog.accept)
         self.buttonBox.rejected.connect(TableDialog.reject)
@@ -39,3 +57,12 @@ class Ui_TableDialog(object):
         _translate = QtCore.QCoreApplication.translate
         TableDialog.setWindowTitle(_translate("TableDialog", "Table Dialog"))
         self.pidLabel.setText(_translate("TableDialog", "PID"))
+        self.statusComboBox.setItemText(0, _translate("TableDialog", "Any status"))
+        self.statusComboBox.setItemText(1, _translate("TableDialog", "Present"))
+        self.statusComboBox.setItemText(2, _translate("TableDialog", "Swapped"))
+        self.dirtyComboBox.setItemText(0, _translate("TableDialog", "Dirty or clean"))
+        self.dirtyComboBox.setItemText(1, _translate("TableDialog", "Dirty"))
+        self.dirtyComboBox.setItemText(2, _translate("TableDialog", "Clean"))
+        self.anonComboBox.setItemText(0, _translate("TableDialog", "Anon or file"))
+        self.anonComboBox.setItemText(1, _translate("TableDialog", "Anon"))
+        self.anonComboBox.setItemText(2, _translate("TableDialog", "File"))
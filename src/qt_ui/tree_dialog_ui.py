@@ -32,11 +32,12 @@ class Ui_TreeDialog(object):
         self.treeView = QtWidgets.QTreeView(TreeDialog)
         self.treeView.setObjectName("treeView")
         self.gridLayout.addWidget(self.treeView, 1, 0, 1, 3)
-        self.tableWidget = QtWidgets.QTableWidget(TreeDialog)
-        self.tableWidget.setObjectName("tableWidget")
-        self.tableWidget.setColumnCount(0)
-        self.tableWidget.setRowCount(0)
-        self.gridLayout.addWidget(self.tableWidget, 1, 3, 1, 3)
+        self.searchEdit = QtWidgets.QLineEdit(TreeDialog)
+        self.searchEdit.setObjectName("searchEdit")
+        self.gridLayout.addWidget(self.searchEdit, 0, 4, 1, 1)
+        self.tableView = QtWidgets.QTableView(TreeDialog)
+        self.tableView.setObjectName("tableView")
+        self.gridLayout.addWidget(self.tableView, 1, 3, 1, 3)
         self.buttonBox = QtWidgets.QDialogButtonBox(TreeDialog)
         self.buttonBox.setOrientation(QtCore.Qt.Horizontal)
         self.buttonBox.setStandardButtons(QtWidgets.QDialogButtonBox.Ok)
@@ -55,4 +56,5 @@ class Ui_TreeDialog(object):
         _translate = QtCore.QCoreApplication.translate
         TreeDialog.setWindowTitle(_translate("TreeDialog", "Dialog"))
         self.showButton.setText(_translate("TreeDialog", "Show"))
+        self.searchEdit.setPlaceholderText(_translate("TreeDialog", "Search"))
         self.checkBox.setText(_translate("TreeDialog", "Select all"))
@@ -5,9 +5,8 @@ from subprocess import CalledProcessError
 
 from PyQt5.QtCore import QTimer, QEventLoop
 from PyQt5.QtGui import QColor
-from intervaltree import Interval, IntervalTree
 
-from src.device.interaction import exec_command
+from src.device.adb_client import get_client
 
 
 def list_difference(first, second):
@@ -53,13 +52,17 @@ def clean_tmp_data_from_device(device, remove_page_data=True, remove_pids_data=T
     :return: None
     """
     page_data_mask = '*_page_data'
+    scan_state_mask = '*_scan_state*'
     pids_file_mask = '*.csv'
+    pid_list_state_mask = 'pid_list_state*'
     # Remove binary data from telephone
     try:
         if remove_page_data:
-            exec_command(f'adb -s {device}', 'shell', 'rm', f'/data/local/testing/{page_data_mask}')
+            get_client().shell(device, 'rm', '-f', f'/data/local/testing/{page_data_mask}',
+                               f'/data/local/testing/{scan_state_mask}')
         if remove_pids_data:
-            exec_command(f'adb -s {device}', 'shell', 'rm', f'/data/local/testing/{pids_file_mask}')
+            get_client().shell(device, 'rm', '-f', f'/data/local/testing/{pids_file_mask}',
+                               f'/data/local/testing/{pid_list_state_mask}')
     except CalledProcessError:
         pass
 
@@ -94,25 +97,3 @@ def clean_tmp_data(remove_page_data=True, remove_pictures_data=True, remove_pids
         except Exception as ex:
             print(ex)
 
-
-def create_regions_map(page_data={}):
-    """Creates tree of processes memory regions
-
-    :param page_data: data about each page for each inspected process
-    :return: tree of regions represented as (start_pfn, end_pfn, pid)
-    :rtype: IntervalTree
-    """
-    regions = IntervalTree()
-    for pid, data in page_data.items():
-        pages_info = sorted(data.values, key=lambda el: el[0])  # sort by pfn
-
-        if len(pages_info) > 0:
-            bound = pages_info[0][0]
-        else:
-            break
-
-        for i in range(len(pages_info) - 1):
-            if pages_info[i][0] + 1 != pages_info[i + 1][0]:
-                regions.add(Interval(bound, pages_info[i][0] + 1, pid))
-                bound = pages_info[i + 1][0]
-    return regions
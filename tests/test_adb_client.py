@@ -0,0 +1,81 @@
+import pytest
+
+from benchmarks.fake_adb_server import SYNC_DATA_MAX, FakeAdbServer
+from src.device.adb_client import AdbClient, AdbError
+
+DEVICE = 'emulator-5554'
+PID_LIST = b'1,init\n2,kthreadd\n'
+BIG_FILE = bytes(range(256)) * (SYNC_DATA_MAX // 256 * 2 + 1)  # sent by 3 DATA chunks
+
+
+@pytest.fixture
+def server():
+    server = FakeAdbServer(devices=[DEVICE],
+                           files={'/data/local/testing/pid_list.csv': PID_LIST, '/data/local/testing/big': BIG_FILE},
+                           commands={'cat /proc/mounts': b'none /dev/cpuctl cgroup rw 0 0\n',
+                                     'echo \x00\x01': b'\x00\x01\r\n'})
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def client(server):
+    client = AdbClient(port=server.port, timeout=5)
+    yield client
+    client.close()
+
+
+def test_devices(client):
+    assert client.devices() == [(DEVICE, 'device')]
+
+
+def test_transport_failure(client):
+    with pytest.raises(AdbError) as error:
+        client.shell('missing', 'cat', '/proc/mounts')
+    assert error.value.message == "device 'missing' not found"
+    assert error.value.cmd == 'host:transport:missing'
+
+
+def test_shell_output(client):
+    assert client.shell(DEVICE, 'cat', '/proc/mounts') == b'none /dev/cpuctl cgroup rw 0 0\n'
+
+
+def test_exec_output(client):
+    assert client.exec_out(DEVICE, 'echo', '\x00\x01') == b'\x00\x01\r\n'
+
+
+def test_read_file(client):
+    assert client.read_file(DEVICE, '/data/local/testing/pid_list.csv') == PID_LIST
+
+
+def test_read_file_of_several_chunks(client):
+    assert client.read_file(DEVICE, '/data/local/testing/big') == BIG_FILE
+
+
+def test_read_missing_file(client):
+    with pytest.raises(AdbError) as error:
+        client.read_file(DEVICE, '/data/local/testing/missing')
+    assert error.value.message == '/data/local/testing/missing: No such file or directory'
+
+
+def test_pull(client, tmp_path):
+    path = client.pull(DEVICE, '/data/local/testing/pid_list.csv', str(tmp_path))
+    assert path == str(tmp_path / 'pid_list.csv')
+    assert (tmp_path / 'pid_list.csv').read_bytes() == PID_LIST
+
+
+def test_sync_connection_reused_after_failure(server, client):
+    client.read_file(DEVICE, '/data/local/testing/pid_list.csv')
+    requests = server.requests
+    with pytest.raises(AdbError):
+        client.read_file(DEVICE, '/data/local/testing/missing')
+    assert client.read_file(DEVICE, '/data/local/testing/big') == BIG_FILE
+    assert server.requests == requests
+
+
+def test_requests_after_transport_failure(client):
+    with pytest.raises(AdbError):
+        client.read_file('missing', '/data/local/testing/pid_list.csv')
+    assert client.read_file(DEVICE, '/data/local/testing/pid_list.csv') == PID_LIST
+    assert client.shell(DEVICE, 'cat', '/proc/mounts') == b'none /dev/cpuctl cgroup rw 0 0\n'